@@ -1,38 +1,117 @@
 # apps/app1/src/api/core/ledgers/dependencies.py
-from fastapi import HTTPException, Depends, Request
+import math
+from typing import Awaitable, Callable, List, Optional
+from fastapi import HTTPException, Depends, Request, Response
 from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.auth.service import get_current_user
+from core.cache.rate_limit import RateLimiter, RateLimitResult, rate_limiter
+from core.db.replicas import WriteTracker, get_write_tracker
+from core.db.shards import ShardRouter, get_shard_router
 from core.config import core_settings
 
 
-async def get_redis_pool():
-    redis = aioredis.from_url(core_settings.redis.redis_url, decode_responses=True)
-    try:
-        yield redis
-    finally:
-        await redis.aclose()
+def get_redis_pool(request: Request) -> aioredis.Redis:
+    return request.app.state.redis
+
+
+def get_rate_limiter() -> RateLimiter:
+    return rate_limiter
+
+
+def resolve_rate_limit(endpoint: str, username: str) -> int:
+    settings = core_settings.rate_limit
+    if username in settings.user_limits:
+        return settings.user_limits[username]
+    return settings.endpoint_limits.get(endpoint, settings.requests_per_minute)
+
+
+async def check_rate_limit(
+    limiter: RateLimiter, user, endpoint: str
+) -> RateLimitResult:
+    limit = resolve_rate_limit(endpoint, user.username)
+    return await limiter.acquire(
+        f"ratelimit:{user.id}:{endpoint}",
+        limit,
+        core_settings.rate_limit.window_seconds,
+    )
 
 
 async def rate_limit(
     request: Request,
+    response: Response,
     user=Depends(get_current_user),
-    redis: aioredis.Redis = Depends(get_redis_pool),
+    limiter: RateLimiter = Depends(get_rate_limiter),
 ):
-    client_host = request.client.host if request.client else "unknown"
-    endpoint_path = request.url.path
-    key = f"ratelimit:{client_host}:{endpoint_path}"
-    requests = await redis.get(key)
-
-    rate_limit_requests = core_settings.rate_limit.requests_per_minute
-    rate_limit_window = core_settings.rate_limit.window_seconds
+    # Bucket per user and route template, so /ledger/{owner_id} is one endpoint
+    # no matter which owner is requested.
+    route = request.scope.get("route")
+    endpoint = route.path if route is not None else request.url.path
+    result = await check_rate_limit(limiter, user, endpoint)
 
-    if requests and int(requests) >= rate_limit_requests:
+    headers = {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(math.ceil(result.reset_ms / 1000)),
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(math.ceil(result.retry_after_ms / 1000))
         raise HTTPException(
             status_code=429,
             detail="Too many requests",
+            headers=headers,
         )
+    response.headers.update(headers)
+
+
+class RequestContext:
+    # What a ledger route needs about its request: the authenticated user (its
+    # token verified and its rate limit taken once), the request id for logs,
+    # and Redis writes queued by the handler to go out in one pipeline.
+    def __init__(self, user, request_id: Optional[str], redis: aioredis.Redis):
+        self.user = user
+        self.request_id = request_id
+        self.redis = redis
+        self._queued: List[Callable[[Pipeline], Awaitable[None]]] = []
+
+    def queue(self, command: Callable[[Pipeline], Awaitable[None]]) -> None:
+        self._queued.append(command)
+
+    async def flush(self) -> None:
+        if not self._queued:
+            return
+        queued, self._queued = self._queued, []
+        pipe = self.redis.pipeline(transaction=False)
+        for command in queued:
+            await command(pipe)
+        await pipe.execute()
+
+
+async def request_context(
+    request: Request,
+    user=Depends(get_current_user),
+    _: None = Depends(rate_limit),
+    redis: aioredis.Redis = Depends(get_redis_pool),
+) -> RequestContext:
+    return RequestContext(user, getattr(request.state, "request_id", None), redis)
+
+
+async def read_your_writes(
+    user=Depends(get_current_user),
+    shards: ShardRouter = Depends(get_shard_router),
+    tracker: WriteTracker = Depends(get_write_tracker),
+) -> bool:
+    # True when the user's reads must go to the primary because they wrote
+    # moments ago. Redis is only asked when there are replicas at all.
+    return shards.has_replicas and await tracker.wrote_recently(user.id)
+
 
-    pipe = redis.pipeline()
-    pipe.incr(key)
-    pipe.expire(key, rate_limit_window)
-    await pipe.execute()
+async def get_owner_read_session(
+    owner_id: str,
+    shards: ShardRouter = Depends(get_shard_router),
+    primary: bool = Depends(read_your_writes),
+) -> AsyncSession:
+    session_factory = await shards.read_session_factory(owner_id, primary)
+    async with session_factory() as session:
+        yield session
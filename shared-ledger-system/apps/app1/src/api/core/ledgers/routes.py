@@ -1,15 +1,52 @@
 # apps/app1/src/api/core/ledgers/routes.py
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, status
+import asyncio
+import json
+from datetime import date, datetime
+from functools import partial
+from typing import AsyncIterator, Dict, List, Literal, Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    BackgroundTasks,
+    Query,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.ledgers import service, schemas
+from core.ledgers.export import EXPORT_MEDIA_TYPES, export_entries
+from core.ledgers.group_commit import GroupCommitWriter, group_commit_writers
+from core.ledgers.outbox import START_OFFSET, ChangeFeed, change_feed
+from core.ledgers.subscriptions import BalanceHub, balance_hub
 from core.cache.cache import cache
+from core.cache.rate_limit import RateLimiter
+from core.cache.tiered import tiered_cache
 from core.monitoring.prometheus import metrics
 from core.logging.logger import logger
-from core.auth import service as auth_service, models as auth_models
-from .dependencies import rate_limit, get_redis_pool
-from core.db.base import get_session
+from core.auth import service as auth_service
+from .dependencies import (
+    RequestContext,
+    request_context,
+    check_rate_limit,
+    get_rate_limiter,
+    get_redis_pool,
+    get_owner_read_session,
+    read_your_writes,
+)
+from core.db.replicas import WriteTracker, get_read_session, get_write_tracker
+from core.db.shards import ShardRouter, get_shard_router
 from core.config import core_settings
-from core.ledgers.exceptions import InsufficientBalanceError, DuplicateTransactionError
+from core.ledgers.exceptions import (
+    InsufficientBalanceError,
+    DuplicateTransactionError,
+    InvalidCursorError,
+    InvalidOffsetError,
+    CrossShardBatchError,
+    OwnerMovedError,
+)
 
 router = APIRouter(prefix="/ledger", tags=["ledger"])
 
@@ -19,7 +56,195 @@ def get_ledger_service() -> service.LedgerService:
 
 
 def get_ledger_cache():
-    return cache
+    return tiered_cache
+
+
+def get_change_feed() -> ChangeFeed:
+    return change_feed
+
+
+def get_balance_hub() -> BalanceHub:
+    return balance_hub
+
+
+def get_group_commit_writers() -> Optional[Dict[str, GroupCommitWriter]]:
+    if core_settings.ledger.group_commit_enabled:
+        return group_commit_writers
+    return None
+
+
+def queue_balance_update(
+    ctx: RequestContext,
+    ledger_cache: cache,
+    hub: BalanceHub,
+    background_tasks: BackgroundTasks,
+    owner_id: str,
+    new_balance: Optional[schemas.VersionedBalance],
+) -> None:
+    cache_key = f"balance:{owner_id}"
+    if new_balance is None or not core_settings.cache.balance_write_through:
+        background_tasks.add_task(ledger_cache.invalidate_key, cache_key)
+    else:
+        ctx.queue(
+            partial(
+                ledger_cache.queue_set_value_if_newer,
+                key=cache_key,
+                value=str(new_balance.balance),
+                version=new_balance.version,
+                ttl=core_settings.cache.default_ttl,
+            )
+        )
+    if new_balance is not None:
+        ctx.queue(partial(hub.queue_publish, balance=new_balance))
+
+
+async def flush_balance_updates(
+    ctx: RequestContext,
+    ledger_cache: cache,
+    background_tasks: BackgroundTasks,
+    owner_ids: List[str],
+) -> None:
+    # Cache writes, balance publishes and the read-your-writes mark of one
+    # request share a single round trip.
+    try:
+        await ctx.flush()
+    except RedisError as e:
+        logger.log_error(
+            error_type="balance_cache_write_error",
+            user_id=ctx.user.id,
+            error_details={"owner_ids": owner_ids, "error": str(e)},
+        )
+        for owner_id in owner_ids:
+            background_tasks.add_task(
+                ledger_cache.invalidate_key, f"balance:{owner_id}"
+            )
+
+
+@router.get(
+    "/export",
+    summary="Export Entries",
+    description=(
+        "Streams ledger entries for an owner and/or a UTC day as NDJSON or CSV."
+    ),
+)
+async def export_ledger_entries(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    owner_id: Optional[str] = None,
+    day: Optional[date] = None,
+    ctx: RequestContext = Depends(request_context),
+    shards: ShardRouter = Depends(get_shard_router),
+    primary: bool = Depends(read_your_writes),
+):
+    if owner_id is None and day is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="owner_id or day is required",
+        )
+
+    if owner_id is not None:
+        session_factories = [await shards.read_session_factory(owner_id, primary)]
+    else:
+        session_factories = await shards.read_session_factories(primary)
+
+    # The stream outlives the request's dependencies, so it owns its sessions.
+    # A day spans every shard; they are read one after the other.
+    async def stream() -> AsyncIterator[str]:
+        for index, session_factory in enumerate(session_factories):
+            async with session_factory() as session:
+                async for chunk in export_entries(
+                    session,
+                    export_format,
+                    owner_id=owner_id,
+                    day=day,
+                    batch_size=core_settings.ledger.export_batch_size,
+                    header=index == 0,
+                ):
+                    yield chunk
+
+    logger.log_operation(
+        operation_type="export_entries",
+        user_id=ctx.user.id,
+        details={
+            "owner_id": owner_id,
+            "day": day.isoformat() if day else None,
+            "format": export_format,
+            "request_id": ctx.request_id,
+        },
+    )
+    return StreamingResponse(stream(), media_type=EXPORT_MEDIA_TYPES[export_format])
+
+
+def change_feed_unavailable(error: RedisError) -> HTTPException:
+    # The feed lives in Redis only; consumers retry from their last offset.
+    metrics.api_error_counter.labels(
+        endpoint="ledger_changes", error_type=type(error).__name__
+    ).inc()
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="The change feed is unavailable; retry from the last offset.",
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=schemas.LedgerChangePage,
+    summary="Read Changes",
+    description=(
+        "Reads committed ledger entries in order from the change feed. Pass the "
+        "returned next_offset as `after` to continue, or name a `consumer` to "
+        "resume from its committed offset. With block_ms the request waits that "
+        "long for new changes."
+    ),
+)
+async def read_ledger_changes(
+    after: Optional[str] = None,
+    consumer: Optional[str] = None,
+    owner_id: Optional[str] = None,
+    limit: int = Query(
+        core_settings.ledger.changes_page_size,
+        ge=1,
+        le=core_settings.ledger.changes_max_page_size,
+    ),
+    block_ms: int = Query(0, ge=0, le=core_settings.ledger.changes_max_block_ms),
+    ctx: RequestContext = Depends(request_context),
+    feed: ChangeFeed = Depends(get_change_feed),
+):
+    try:
+        if after is None:
+            after = (
+                await feed.committed_offset(f"{ctx.user.id}:{consumer}")
+                if consumer
+                else START_OFFSET
+            )
+        changes, next_offset = await feed.read(
+            after, limit, block_ms=block_ms, owner_id=owner_id
+        )
+    except InvalidOffsetError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RedisError as e:
+        raise change_feed_unavailable(e)
+    return schemas.LedgerChangePage(items=changes, next_offset=next_offset)
+
+
+@router.post(
+    "/changes/offsets/{consumer}",
+    response_model=schemas.ChangeOffsetCommit,
+    summary="Commit Change Offset",
+    description="Stores the offset a consumer has processed up to.",
+)
+async def commit_ledger_change_offset(
+    consumer: str,
+    commit: schemas.ChangeOffsetCommit,
+    ctx: RequestContext = Depends(request_context),
+    feed: ChangeFeed = Depends(get_change_feed),
+):
+    try:
+        await feed.commit_offset(f"{ctx.user.id}:{consumer}", commit.offset)
+    except InvalidOffsetError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RedisError as e:
+        raise change_feed_unavailable(e)
+    return commit
 
 
 @router.get(
@@ -29,49 +254,76 @@ def get_ledger_cache():
     description="Retrieves the current balance for a given owner.",
 )
 async def get_balance(
-    request: Request,
     owner_id: str,
-    session: AsyncSession = Depends(get_session),
-    current_user: auth_models.User = Depends(auth_service.get_current_user),
-    _: None = Depends(rate_limit),
+    shards: ShardRouter = Depends(get_shard_router),
+    primary: bool = Depends(read_your_writes),
+    ctx: RequestContext = Depends(request_context),
     ledger_service: service.LedgerService = Depends(get_ledger_service),
     ledger_cache: cache = Depends(get_ledger_cache),
 ):
     cache_key = f"balance:{owner_id}"
-    cached_balance = await ledger_cache.get_value(cache_key)
-    if cached_balance is not None:
-        metrics.cache_hit_count.labels(endpoint="get_balance").inc()
-        return schemas.LedgerBalance(owner_id=owner_id, balance=int(cached_balance))
+    missed = False
 
-    metrics.cache_miss_count.labels(endpoint="get_balance").inc()
-    try:
+    def count_miss() -> None:
+        nonlocal missed
+        missed = True
+
+    async def load_balance() -> str:
+        # Concurrent misses share one load, which may outlive the request that
+        # started it, so it opens its own session.
         with metrics.operation_duration_histogram.labels(
             operation_type="get_balance"
         ).time():
-            balance = await ledger_service.get_balance(session, owner_id)
-            await ledger_cache.set_value(
-                cache_key, str(balance), ttl=core_settings.cache.default_ttl
-            )
+            session_factory = await shards.read_session_factory(owner_id, primary)
+            async with session_factory() as session:
+                versioned = await ledger_service.get_versioned_balance(
+                    session, owner_id
+                )
+            if core_settings.cache.balance_write_through:
+                await ledger_cache.set_value_if_newer(
+                    cache_key,
+                    str(versioned.balance),
+                    versioned.version,
+                    ttl=core_settings.cache.default_ttl,
+                )
+            else:
+                await ledger_cache.set_value(
+                    cache_key,
+                    str(versioned.balance),
+                    ttl=core_settings.cache.default_ttl,
+                )
             metrics.balance_queries_counter.inc()
+        return str(versioned.balance)
 
-            logger.log_operation(
-                operation_type="get_balance",
-                user_id=current_user.id if current_user else "anonymous",
-                details={
-                    "owner_id": owner_id,
-                    "balance": balance,
-                    "request_id": request.headers.get("X-Request-ID"),
-                },
+    try:
+        balance = int(
+            await ledger_cache.get_or_compute(
+                cache_key, load_balance, on_miss=count_miss
             )
+        )
+        if not missed:
+            metrics.cache_hit_count.labels(endpoint="get_balance").inc()
             return schemas.LedgerBalance(owner_id=owner_id, balance=balance)
+
+        metrics.cache_miss_count.labels(endpoint="get_balance").inc()
+        logger.log_operation(
+            operation_type="get_balance",
+            user_id=ctx.user.id,
+            details={
+                "owner_id": owner_id,
+                "balance": balance,
+                "request_id": ctx.request_id,
+            },
+        )
+        return schemas.LedgerBalance(owner_id=owner_id, balance=balance)
     except Exception as e:
         logger.log_error(
             error_type="get_balance_error",
-            user_id=current_user.id if current_user else "anonymous",
+            user_id=ctx.user.id,
             error_details={
                 "owner_id": owner_id,
                 "error": str(e),
-                "request_id": request.headers.get("X-Request-ID"),
+                "request_id": ctx.request_id,
             },
         )
         metrics.api_error_counter.labels(
@@ -82,6 +334,181 @@ async def get_balance(
         )
 
 
+@router.get(
+    "/{owner_id}/stream",
+    summary="Stream Balance",
+    description=(
+        "Server-sent events with the owner's balance: the current one on connect, "
+        "then each new one as entries are committed. Authentication and rate "
+        "limiting apply once, when the stream opens."
+    ),
+)
+async def stream_balance(
+    owner_id: str,
+    # The same session request_context authenticated with; see below.
+    session: AsyncSession = Depends(get_read_session),
+    shards: ShardRouter = Depends(get_shard_router),
+    ctx: RequestContext = Depends(request_context),
+    ledger_service: service.LedgerService = Depends(get_ledger_service),
+    hub: BalanceHub = Depends(get_balance_hub),
+):
+    # Authentication is done; hand its connection back rather than hold it
+    # for as long as the client listens.
+    await session.close()
+    if hub.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many balance streams",
+        )
+
+    async def load() -> schemas.VersionedBalance:
+        session_factory = await shards.read_session_factory(owner_id)
+        async with session_factory() as session:
+            return await ledger_service.get_versioned_balance(session, owner_id)
+
+    # Subscribing inside the stream ties the subscription to the response:
+    # it ends when the client disconnects and the stream is cancelled.
+    async def events() -> AsyncIterator[str]:
+        subscription = await hub.subscribe(owner_id)
+        try:
+            async for balance in subscription.updates(
+                load, core_settings.ledger.balance_stream_keepalive_seconds
+            ):
+                if balance is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield (
+                        f"event: balance\nid: {balance.version}\n"
+                        f"data: {balance.model_dump_json()}\n\n"
+                    )
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{owner_id}/ws")
+async def balance_websocket(
+    websocket: WebSocket,
+    owner_id: str,
+    token: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+    shards: ShardRouter = Depends(get_shard_router),
+    limiter: RateLimiter = Depends(get_rate_limiter),
+    ledger_service: service.LedgerService = Depends(get_ledger_service),
+    hub: BalanceHub = Depends(get_balance_hub),
+):
+    # Browsers cannot set headers on a WebSocket, so the token may also come
+    # as ?token=.
+    authorization = websocket.headers.get("Authorization", "")
+    if token is None and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    user = await auth_service.get_user_for_token(token, session) if token else None
+    await session.close()
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    result = await check_rate_limit(limiter, user, websocket.scope["route"].path)
+    if not result.allowed or hub.full:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    async def load() -> schemas.VersionedBalance:
+        session_factory = await shards.read_session_factory(owner_id)
+        async with session_factory() as session:
+            return await ledger_service.get_versioned_balance(session, owner_id)
+
+    async def push() -> None:
+        async for balance in subscription.updates(
+            load, core_settings.ledger.balance_stream_keepalive_seconds
+        ):
+            if balance is not None:
+                await websocket.send_text(balance.model_dump_json())
+
+    async def drain() -> None:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    await websocket.accept()
+    subscription = await hub.subscribe(owner_id)
+    tasks = [asyncio.create_task(push()), asyncio.create_task(drain())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        hub.unsubscribe(subscription)
+        for task in tasks:
+            task.cancel()
+    for task in done:
+        if not task.cancelled() and task.exception() is not None:
+            logger.log_error(
+                error_type="balance_websocket_error",
+                user_id=user.id,
+                error_details={"owner_id": owner_id, "error": str(task.exception())},
+            )
+
+
+@router.get(
+    "/{owner_id}/entries",
+    response_model=schemas.LedgerEntryPage,
+    summary="List Entries",
+    description=(
+        "Lists an owner's ledger entries, newest first. Pass the returned "
+        "next_cursor to fetch the following page."
+    ),
+)
+async def list_ledger_entries(
+    owner_id: str,
+    limit: int = Query(
+        core_settings.ledger.entries_page_size,
+        ge=1,
+        le=core_settings.ledger.entries_max_page_size,
+    ),
+    cursor: Optional[str] = None,
+    operation: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_owner_read_session),
+    ctx: RequestContext = Depends(request_context),
+    ledger_service: service.LedgerService = Depends(get_ledger_service),
+):
+    try:
+        with metrics.operation_duration_histogram.labels(
+            operation_type="list_entries"
+        ).time():
+            page = await ledger_service.list_entries(
+                session,
+                owner_id,
+                limit,
+                cursor=cursor,
+                operation=operation,
+                created_from=created_from,
+                created_to=created_to,
+            )
+        return page
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.log_error(
+            error_type="list_entries_error",
+            user_id=ctx.user.id,
+            error_details={
+                "owner_id": owner_id,
+                "error": str(e),
+                "request_id": ctx.request_id,
+            },
+        )
+        metrics.api_error_counter.labels(
+            endpoint="list_entries", error_type=type(e).__name__
+        ).inc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
 @router.post(
     "/",
     response_model=dict,
@@ -89,22 +516,42 @@ async def get_balance(
     description="Creates a new ledger entry for an owner.",
 )
 async def create_ledger_entry(
-    request: Request,
     entry: schemas.LedgerEntryCreate,
     background_tasks: BackgroundTasks,
-    session: AsyncSession = Depends(get_session),
-    current_user: auth_models.User = Depends(auth_service.get_current_user),
-    _: None = Depends(rate_limit),
+    shards: ShardRouter = Depends(get_shard_router),
+    tracker: WriteTracker = Depends(get_write_tracker),
+    ctx: RequestContext = Depends(request_context),
     ledger_service: service.LedgerService = Depends(get_ledger_service),
     ledger_cache: cache = Depends(get_ledger_cache),
+    writers: Optional[Dict[str, GroupCommitWriter]] = Depends(get_group_commit_writers),
+    hub: BalanceHub = Depends(get_balance_hub),
 ):
     try:
         with metrics.operation_duration_histogram.labels(
             operation_type="create_ledger_entry"
         ).time():
-            result = await ledger_service.create_entry(session, entry)
-            background_tasks.add_task(
-                ledger_cache.invalidate_key, f"balance:{entry.owner_id}"
+            if writers is not None:
+                writer = writers[shards.shard_for(entry.owner_id)]
+                result = await writer.submit(entry)
+                new_balance = None
+                if result.version is not None:
+                    new_balance = schemas.VersionedBalance(
+                        owner_id=entry.owner_id,
+                        balance=result.balance,
+                        version=result.version,
+                    )
+            else:
+                async with shards.session(entry.owner_id) as session:
+                    _, new_balance = await ledger_service.create_entry_with_balance(
+                        session, entry
+                    )
+            queue_balance_update(
+                ctx, ledger_cache, hub, background_tasks, entry.owner_id, new_balance
+            )
+            if shards.has_replicas:
+                ctx.queue(partial(tracker.queue_mark, client_id=ctx.user.id))
+            await flush_balance_updates(
+                ctx, ledger_cache, background_tasks, [entry.owner_id]
             )
             metrics.ledger_operations_counter.labels(
                 operation_type="create_entry"
@@ -112,10 +559,10 @@ async def create_ledger_entry(
 
             logger.log_operation(
                 operation_type="create_ledger_entry",
-                user_id=current_user.id if current_user else "anonymous",
+                user_id=ctx.user.id,
                 details={
                     "entry": entry.model_dump(),
-                    "request_id": request.headers.get("X-Request-ID"),
+                    "request_id": ctx.request_id,
                 },
             )
             return {"status": "success", "message": "Ledger entry created successfully"}
@@ -125,11 +572,11 @@ async def create_ledger_entry(
         ).inc()
         logger.log_error(
             error_type="insufficient_balance_error",
-            user_id=current_user.id if current_user else "anonymous",
+            user_id=ctx.user.id,
             error_details={
                 "entry": entry.model_dump(),
                 "error": str(e),
-                "request_id": request.headers.get("X-Request-ID"),
+                "request_id": ctx.request_id,
             },
         )
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -139,25 +586,32 @@ async def create_ledger_entry(
         ).inc()
         logger.log_error(
             error_type="duplicate_transaction_error",
-            user_id=current_user.id if current_user else "anonymous",
+            user_id=ctx.user.id,
             error_details={
                 "entry": entry.model_dump(),
                 "error": str(e),
-                "request_id": request.headers.get("X-Request-ID"),
+                "request_id": ctx.request_id,
             },
         )
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except OwnerMovedError as e:
+        metrics.api_error_counter.labels(
+            endpoint="create_ledger_entry", error_type="OwnerMovedError"
+        ).inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
     except ValueError as e:
         metrics.api_error_counter.labels(
             endpoint="create_ledger_entry", error_type="ValueError"
         ).inc()
         logger.log_error(
             error_type="value_error",
-            user_id=current_user.id if current_user else "anonymous",
+            user_id=ctx.user.id,
             error_details={
                 "entry": entry.model_dump(),
                 "error": str(e),
-                "request_id": request.headers.get("X-Request-ID"),
+                "request_id": ctx.request_id,
             },
         )
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -167,13 +621,210 @@ async def create_ledger_entry(
         ).inc()
         logger.log_error(
             error_type="server_error",
-            user_id=current_user.id if current_user else "anonymous",
+            user_id=ctx.user.id,
             error_details={
                 "entry": entry.model_dump(),
                 "error": str(e),
-                "request_id": request.headers.get("X-Request-ID"),
+                "request_id": ctx.request_id,
+            },
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.post(
+    "/batch",
+    response_model=schemas.LedgerBatchResult,
+    summary="Create Ledger Entries In Batch",
+    description=(
+        "Creates many ledger entries in one request. With atomic=true nothing is "
+        "written unless every entry succeeds; otherwise each entry is applied "
+        "independently. Returns a result per entry."
+    ),
+)
+async def create_ledger_entries_batch(
+    batch: schemas.LedgerBatchCreate,
+    background_tasks: BackgroundTasks,
+    shards: ShardRouter = Depends(get_shard_router),
+    tracker: WriteTracker = Depends(get_write_tracker),
+    ctx: RequestContext = Depends(request_context),
+    ledger_service: service.LedgerService = Depends(get_ledger_service),
+    ledger_cache: cache = Depends(get_ledger_cache),
+    hub: BalanceHub = Depends(get_balance_hub),
+):
+    try:
+        with metrics.operation_duration_histogram.labels(
+            operation_type="create_ledger_entries_batch"
+        ).time():
+            results = await ledger_service.create_entries_on_shards(
+                shards, batch.entries, atomic=batch.atomic
+            )
+            created = [result for result in results if result.status == "created"]
+            for result in created:
+                if result.version is not None:
+                    queue_balance_update(
+                        ctx,
+                        ledger_cache,
+                        hub,
+                        background_tasks,
+                        result.owner_id,
+                        schemas.VersionedBalance(
+                            owner_id=result.owner_id,
+                            balance=result.balance,
+                            version=result.version,
+                        ),
+                    )
+            if created:
+                metrics.ledger_operations_counter.labels(
+                    operation_type="create_entry"
+                ).inc(len(created))
+                if shards.has_replicas:
+                    ctx.queue(partial(tracker.queue_mark, client_id=ctx.user.id))
+                await flush_balance_updates(
+                    ctx,
+                    ledger_cache,
+                    background_tasks,
+                    [result.owner_id for result in created],
+                )
+
+            logger.log_operation(
+                operation_type="create_ledger_entries_batch",
+                user_id=ctx.user.id,
+                details={
+                    "atomic": batch.atomic,
+                    "submitted": len(batch.entries),
+                    "created": len(created),
+                    "request_id": ctx.request_id,
+                },
+            )
+            return schemas.LedgerBatchResult(
+                atomic=batch.atomic,
+                committed=bool(created),
+                created=len(created),
+                results=results,
+            )
+    except CrossShardBatchError as e:
+        metrics.api_error_counter.labels(
+            endpoint="create_ledger_entries_batch", error_type="CrossShardBatchError"
+        ).inc()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        metrics.api_error_counter.labels(
+            endpoint="create_ledger_entries_batch", error_type="ServerError"
+        ).inc()
+        logger.log_error(
+            error_type="server_error",
+            user_id=ctx.user.id,
+            error_details={
+                "submitted": len(batch.entries),
+                "error": str(e),
+                "request_id": ctx.request_id,
             },
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
+
+
+async def stream_balances(balances: List[schemas.LedgerBalance]) -> AsyncIterator[str]:
+    chunk_size = 500
+    yield "["
+    for start in range(0, len(balances), chunk_size):
+        chunk = balances[start : start + chunk_size]
+        prefix = "," if start else ""
+        yield prefix + ",".join(
+            json.dumps({"owner_id": item.owner_id, "balance": item.balance})
+            for item in chunk
+        )
+    yield "]"
+
+
+@router.post(
+    "/balances",
+    response_model=List[schemas.LedgerBalance],
+    summary="Get Balances",
+    description=(
+        "Retrieves the current balances for many owners in one request. Large "
+        "responses are streamed."
+    ),
+)
+async def get_balances(
+    query: schemas.LedgerBalancesQuery,
+    shards: ShardRouter = Depends(get_shard_router),
+    primary: bool = Depends(read_your_writes),
+    ctx: RequestContext = Depends(request_context),
+    ledger_service: service.LedgerService = Depends(get_ledger_service),
+    ledger_cache: cache = Depends(get_ledger_cache),
+):
+    owner_ids = list(dict.fromkeys(query.owner_ids))
+    try:
+        with metrics.operation_duration_histogram.labels(
+            operation_type="get_balances"
+        ).time():
+            cache_keys = [f"balance:{owner_id}" for owner_id in owner_ids]
+            cached = await ledger_cache.get_values(cache_keys)
+            balances = {
+                owner_id: int(value)
+                for owner_id, value in zip(owner_ids, cached)
+                if value is not None
+            }
+            missing = [owner_id for owner_id in owner_ids if owner_id not in balances]
+            if len(balances):
+                metrics.cache_hit_count.labels(endpoint="get_balances").inc(
+                    len(balances)
+                )
+            if missing:
+                metrics.cache_miss_count.labels(endpoint="get_balances").inc(
+                    len(missing)
+                )
+                loaded = await ledger_service.get_versioned_balances_on_shards(
+                    shards, missing, primary=primary
+                )
+                metrics.balance_queries_counter.inc()
+                await ledger_cache.set_values_if_newer(
+                    {
+                        f"balance:{owner_id}": (str(item.balance), item.version)
+                        for owner_id, item in loaded.items()
+                    },
+                    ttl=core_settings.cache.default_ttl,
+                )
+                balances.update(
+                    {owner_id: item.balance for owner_id, item in loaded.items()}
+                )
+
+            logger.log_operation(
+                operation_type="get_balances",
+                user_id=ctx.user.id,
+                details={
+                    "owners": len(owner_ids),
+                    "cache_misses": len(missing),
+                    "request_id": ctx.request_id,
+                },
+            )
+    except Exception as e:
+        logger.log_error(
+            error_type="get_balances_error",
+            user_id=ctx.user.id,
+            error_details={
+                "owners": len(owner_ids),
+                "error": str(e),
+                "request_id": ctx.request_id,
+            },
+        )
+        metrics.api_error_counter.labels(
+            endpoint="get_balances", error_type=type(e).__name__
+        ).inc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+    results = [
+        schemas.LedgerBalance(owner_id=owner_id, balance=balances[owner_id])
+        for owner_id in owner_ids
+    ]
+    if len(results) > core_settings.ledger.balances_stream_threshold:
+        return StreamingResponse(
+            stream_balances(results), media_type="application/json"
+        )
+    return results
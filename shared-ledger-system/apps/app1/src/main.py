@@ -1,17 +1,83 @@
 # apps/app1/src/main.py
-from fastapi import FastAPI, Request, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request, HTTPException
 from starlette.responses import JSONResponse
 from .api.core.ledgers.routes import router as ledger_router
 from core.monitoring.prometheus import metrics
+from core.monitoring.middleware import RequestLoggingMiddleware
 from core.logging.logger import logger
 from core.auth.routes import router as auth_router
+from core.ledgers.group_commit import group_commit_writers
+from core.ledgers.checkpoints import checkpoint_compactors
+from core.ledgers.outbox import change_feed, outbox_relays
+from core.ledgers.subscriptions import balance_hub
+from core.auth.hashing import password_hasher
+from core.auth.token_cache import token_cache
+from core.cache import (
+    cache,
+    create_blocking_redis_client,
+    create_redis_client,
+    rate_limiter,
+    tiered_cache,
+)
+from core.db.base import async_engine
+from core.db.pool import warm_up_pool
+from core.db.replicas import write_tracker
+from core.db.shards import shard_router
+from core.monitoring.health import HealthChecker, create_health_checker
 from core.config import core_settings
 from .config import app1_settings
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.exc import OperationalError
-import time
 
-app = FastAPI(title=core_settings.app_name, debug=core_settings.debug)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pool for the whole process: the cache, the auth cache (which is the
+    # same Cache instance) and the rate limiter all borrow from it.
+    redis = create_redis_client()
+    app.state.redis = redis
+    cache.use_client(redis)
+    rate_limiter.use_client(redis)
+    write_tracker.use_client(redis)
+    change_feed.use_client(redis)
+    blocking_redis = create_blocking_redis_client(
+        core_settings.ledger.changes_max_blocking_reads,
+        core_settings.ledger.changes_max_block_ms / 1000,
+    )
+    change_feed.use_blocking_client(blocking_redis)
+    balance_hub.use_client(redis)
+    token_cache.use_client(redis)
+    for relay in outbox_relays.values():
+        relay.use_client(redis)
+    if core_settings.database.database_pool_warmup:
+        await warm_up_pool(async_engine, core_settings.database.database_pool_size)
+    await tiered_cache.start()
+    await balance_hub.start()
+    await token_cache.start()
+    if core_settings.ledger.checkpoint_compaction_enabled:
+        for compactor in checkpoint_compactors.values():
+            await compactor.start()
+    if core_settings.ledger.outbox_relay_enabled:
+        for relay in outbox_relays.values():
+            await relay.start()
+    yield
+    for relay in outbox_relays.values():
+        await relay.close()
+    for compactor in checkpoint_compactors.values():
+        await compactor.close()
+    for writer in group_commit_writers.values():
+        await writer.close()
+    await token_cache.close()
+    await balance_hub.close()
+    await tiered_cache.close()
+    await blocking_redis.aclose()
+    await redis.aclose()
+    await shard_router.dispose()
+    password_hasher.close()
+
+
+app = FastAPI(
+    title=core_settings.app_name, debug=core_settings.debug, lifespan=lifespan
+)
 
 if core_settings.prometheus.prometheus_enabled:
     metrics.init_app(app)
@@ -19,40 +85,41 @@ else:
     logger.logger.info("Prometheus metrics are disabled.")
 
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    logger.logger.info(
-        f"Request: {request.method} {request.url} - Client: {request.client.host if request.client else 'N/A'}"
-    )
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    logger.logger.info(
-        f"Response status code: {response.status_code} - Endpoint: {request.url.path} - Time: {process_time:.4f}s"
-    )
-    return response
-
+app.add_middleware(
+    RequestLoggingMiddleware,
+    sample_rate=core_settings.logging.request_log_sample_rate,
+    header=core_settings.logging.request_id_header,
+)
 
 app.include_router(ledger_router)
 app.include_router(auth_router)
 
 
+health_checker = create_health_checker(async_engine)
+
+
+def get_health_checker() -> HealthChecker:
+    return health_checker
+
+
 @app.get("/healthz", tags=["health"])
-async def health_check():
-    try:
-        engine = create_async_engine(core_settings.database.database_url)
-        async with engine.connect() as conn:
-            await conn.execute("SELECT 1")
-        return {
-            "status": "healthy",
-            "app_name": core_settings.app_name,
-            "version": "0.1.0",
-        }
-    except OperationalError:
-        return JSONResponse(
-            status_code=503,
-            content={"status": "unhealthy", "error": "Database connection failed"},
-        )
+async def liveness_check():
+    # Liveness only says the worker can serve requests; dependencies are
+    # checked by /readyz so an outage does not get every pod restarted.
+    return {
+        "status": "healthy",
+        "app_name": core_settings.app_name,
+        "version": "0.1.0",
+    }
+
+
+@app.get("/readyz", tags=["health"])
+async def readiness_check(
+    request: Request, checker: HealthChecker = Depends(get_health_checker)
+):
+    result = await checker.readiness(request.app.state.redis)
+    status_code = 200 if result["status"] == "ready" else 503
+    return JSONResponse(status_code=status_code, content=result)
 
 
 @app.exception_handler(HTTPException)
@@ -60,7 +127,11 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     logger.logger.warning(
         f"HTTPException: {exc.status_code} - {exc.detail} - Endpoint: {request.url.path} - Method: {request.method}"
     )
-    return JSONResponse(status_code=exc.status_code, content={"message": exc.detail})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"message": exc.detail},
+        headers=exc.headers,
+    )
 
 
 @app.exception_handler(Exception)
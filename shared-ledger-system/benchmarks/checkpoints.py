@@ -0,0 +1,101 @@
+# benchmarks/checkpoints.py
+# Measures balance computation latency against the length of an owner's
+# history, summing every entry versus reading a checkpoint plus recent entries.
+#
+#   python -m benchmarks.checkpoints --sizes 10 1000 100000 1000000
+#
+# Runs against DATABASE_URL, which must already be migrated to head.
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from sqlalchemy import func, select, text
+from core.config import core_settings
+from core.db.base import AsyncSessionLocal, async_engine
+from core.ledgers.checkpoints import CheckpointCompactor
+from core.ledgers.models import LedgerEntry
+from core.ledgers.service import LedgerService
+
+INSERT_HISTORY = text("""
+    INSERT INTO ledger_entries (operation, amount, nonce, owner_id, created_on)
+    SELECT 'DAILY_REWARD', 1, :prefix || n, :owner_id,
+           (now() AT TIME ZONE 'utc') - interval '1 day'
+    FROM generate_series(1, :count) AS n
+    """)
+
+
+async def time_query(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            start = time.perf_counter()
+            await run(session)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def bench_size(
+    ledger_service: LedgerService, compactor: CheckpointCompactor, size: int, args
+):
+    owner_id = f"bench_{uuid.uuid4().hex[:8]}"
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            INSERT_HISTORY,
+            {"prefix": f"{owner_id}_", "owner_id": owner_id, "count": size},
+        )
+        await session.execute(text("ANALYZE ledger_entries"))
+        await session.commit()
+    await compactor.run_once()
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            INSERT_HISTORY,
+            {"prefix": f"{owner_id}_tail_", "owner_id": owner_id, "count": args.tail},
+        )
+        await session.commit()
+
+    async def full_sum(session):
+        query = select(func.sum(LedgerEntry.amount)).where(
+            LedgerEntry.owner_id == owner_id
+        )
+        return (await session.execute(query)).scalar()
+
+    async def checkpointed(session):
+        return await ledger_service.compute_balance(session, owner_id)
+
+    full = await time_query(full_sum, args.repeat)
+    checkpoint = await time_query(checkpointed, args.repeat)
+    return full, checkpoint
+
+
+async def main(args: argparse.Namespace) -> None:
+    ledger_service = LedgerService(core_settings.ledger.operation_config)
+    compactor = CheckpointCompactor(
+        ledger_service, AsyncSessionLocal, max_entries=1000000
+    )
+    results = []
+    try:
+        for size in args.sizes:
+            results.append(
+                (size, *await bench_size(ledger_service, compactor, size, args))
+            )
+    finally:
+        await async_engine.dispose()
+
+    print(f"tail={args.tail} repeat={args.repeat} (median latency)")
+    print(f"{'history':>10}{'full sum ms':>14}{'checkpoint ms':>16}")
+    for size, full, checkpoint in results:
+        print(f"{size:>10}{full:>14.2f}{checkpoint:>16.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 10000, 100000, 1000000],
+    )
+    parser.add_argument("--tail", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+# benchmarks/group_commit.py
+# Compares create_entry throughput with and without the group-commit writer.
+#
+#   python -m benchmarks.group_commit --writes 5000 --concurrency 200
+#
+# Runs against DATABASE_URL, which must already be migrated to head.
+import argparse
+import asyncio
+import time
+import uuid
+from core.config import core_settings
+from core.db.base import AsyncSessionLocal, async_engine
+from core.ledgers.group_commit import GroupCommitWriter
+from core.ledgers.schemas import LedgerEntryCreate
+from core.ledgers.service import LedgerService
+
+
+def make_entries(count: int, owners: int):
+    run_id = uuid.uuid4().hex[:8]
+    return [
+        LedgerEntryCreate(
+            operation="DAILY_REWARD",
+            amount=1,
+            owner_id=f"bench_{run_id}_{i % owners}",
+            nonce=f"bench_{run_id}_{i}",
+        )
+        for i in range(count)
+    ]
+
+
+async def run_concurrently(entries, concurrency: int, write) -> float:
+    queue = list(reversed(entries))
+
+    async def worker():
+        while queue:
+            await write(queue.pop())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def bench_direct(ledger_service: LedgerService, entries, concurrency: int):
+    async def write(entry):
+        async with AsyncSessionLocal() as session:
+            await ledger_service.create_entry(session, entry)
+
+    return await run_concurrently(entries, concurrency, write)
+
+
+async def bench_group_commit(
+    ledger_service: LedgerService, entries, concurrency: int, args
+):
+    writer = GroupCommitWriter(
+        ledger_service,
+        AsyncSessionLocal,
+        max_batch_size=args.max_batch_size,
+        max_delay_ms=args.max_delay_ms,
+    )
+    try:
+        return await run_concurrently(entries, concurrency, writer.submit)
+    finally:
+        await writer.close()
+
+
+async def main(args: argparse.Namespace) -> None:
+    ledger_service = LedgerService(core_settings.ledger.operation_config)
+    try:
+        direct = await bench_direct(
+            ledger_service, make_entries(args.writes, args.owners), args.concurrency
+        )
+        grouped = await bench_group_commit(
+            ledger_service,
+            make_entries(args.writes, args.owners),
+            args.concurrency,
+            args,
+        )
+    finally:
+        await async_engine.dispose()
+
+    print(f"writes={args.writes} concurrency={args.concurrency} owners={args.owners}")
+    print(f"{'mode':<14}{'seconds':>10}{'writes/sec':>14}")
+    for mode, elapsed in (("direct", direct), ("group_commit", grouped)):
+        print(f"{mode:<14}{elapsed:>10.2f}{args.writes / elapsed:>14.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writes", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--max-batch-size", type=int, default=500)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
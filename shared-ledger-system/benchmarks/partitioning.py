@@ -0,0 +1,185 @@
+# benchmarks/partitioning.py
+# Compares insert and lookup cost of a single ledger table with a unique nonce
+# against a monthly partitioned table whose nonces live in a dedupe table.
+#
+#   python -m benchmarks.partitioning --rows 1000000 --months 12
+#
+# Works on scratch tables in DATABASE_URL and drops them afterwards.
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date, datetime, time as dt_time
+from sqlalchemy import text
+from core.db.base import AsyncSessionLocal, async_engine
+from core.ledgers.partitions import add_months, month_start
+
+PLAIN_SCHEMA = [
+    """
+    CREATE TABLE bench_plain_entries (
+        id BIGSERIAL PRIMARY KEY,
+        operation VARCHAR NOT NULL,
+        amount INTEGER NOT NULL,
+        nonce VARCHAR NOT NULL UNIQUE,
+        owner_id VARCHAR NOT NULL,
+        created_on TIMESTAMP NOT NULL
+    )
+    """,
+    "CREATE INDEX ON bench_plain_entries (owner_id, created_on, id)",
+]
+PARTITIONED_SCHEMA = [
+    """
+    CREATE TABLE bench_part_entries (
+        id BIGSERIAL,
+        operation VARCHAR NOT NULL,
+        amount INTEGER NOT NULL,
+        nonce VARCHAR NOT NULL,
+        owner_id VARCHAR NOT NULL,
+        created_on TIMESTAMP NOT NULL,
+        PRIMARY KEY (id, created_on)
+    ) PARTITION BY RANGE (created_on)
+    """,
+    "CREATE INDEX ON bench_part_entries (owner_id, created_on, id)",
+    """
+    CREATE TABLE bench_part_nonces (
+        nonce VARCHAR PRIMARY KEY,
+        created_on TIMESTAMP NOT NULL
+    )
+    """,
+]
+DROP_SCHEMA = [
+    "DROP TABLE IF EXISTS bench_plain_entries",
+    "DROP TABLE IF EXISTS bench_part_entries",
+    "DROP TABLE IF EXISTS bench_part_nonces",
+]
+
+# Rows :start + 1 .. :start + :count, spread evenly over the benchmark months
+# and across :owners owners.
+ROWS = """
+    SELECT 'DAILY_REWARD', 1, :prefix || n, 'owner_' || (n % :owners),
+           CAST(:first AS timestamp)
+           + (n * :seconds / (:start + :count)) * interval '1 second'
+    FROM generate_series(:start + 1, :start + :count) AS n
+"""
+INSERT_PLAIN = text(
+    "INSERT INTO bench_plain_entries "
+    "(operation, amount, nonce, owner_id, created_on)" + ROWS
+)
+# Mirrors the service: nonces are claimed first and only claimed rows are
+# inserted into the partitioned table.
+INSERT_PARTITIONED = text(
+    "WITH rows (operation, amount, nonce, owner_id, created_on) AS ("
+    + ROWS
+    + "), claimed AS ("
+    "INSERT INTO bench_part_nonces (nonce, created_on) "
+    "SELECT nonce, created_on FROM rows ON CONFLICT DO NOTHING RETURNING nonce) "
+    "INSERT INTO bench_part_entries (operation, amount, nonce, owner_id, created_on) "
+    "SELECT rows.* FROM rows JOIN claimed USING (nonce)"
+)
+OWNER_LOOKUP = (
+    "SELECT sum(amount) FROM {table} "
+    "WHERE owner_id = :owner_id AND created_on >= :since"
+)
+NONCE_LOOKUP = {
+    "plain": text("SELECT 1 FROM bench_plain_entries WHERE nonce = :nonce"),
+    "partitioned": text("SELECT 1 FROM bench_part_nonces WHERE nonce = :nonce"),
+}
+
+
+async def execute_all(statements) -> None:
+    async with AsyncSessionLocal() as session:
+        for statement in statements:
+            await session.execute(text(statement))
+        await session.commit()
+
+
+async def time_inserts(statement, prefix: str, args, first: date) -> float:
+    seconds = (add_months(first, args.months) - first).days * 86400
+    start = time.perf_counter()
+    for offset in range(0, args.rows, args.batch_size):
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                statement,
+                {
+                    "prefix": prefix,
+                    "owners": args.owners,
+                    "first": datetime.combine(first, dt_time.min),
+                    "seconds": seconds,
+                    "start": offset,
+                    "count": min(args.batch_size, args.rows - offset),
+                },
+            )
+            await session.commit()
+    return (time.perf_counter() - start) * 1000
+
+
+async def time_lookup(statement, params, repeat: int) -> float:
+    timings = []
+    async with AsyncSessionLocal() as session:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await session.execute(statement, params)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def main(args: argparse.Namespace) -> None:
+    first = add_months(month_start(date.today()), -args.months + 1)
+    partitions = [
+        f"CREATE TABLE bench_part_entries_{month:%Y_%m} PARTITION OF "
+        f"bench_part_entries FOR VALUES FROM ('{month}') "
+        f"TO ('{add_months(month, 1)}')"
+        for month in (add_months(first, i) for i in range(args.months))
+    ]
+    prefix = f"n{uuid.uuid4().hex[:8]}_"
+    last_month = add_months(first, args.months - 1)
+    results = {}
+    try:
+        await execute_all(DROP_SCHEMA + PLAIN_SCHEMA + PARTITIONED_SCHEMA + partitions)
+        results["plain"] = [await time_inserts(INSERT_PLAIN, prefix, args, first)]
+        results["partitioned"] = [
+            await time_inserts(INSERT_PARTITIONED, prefix, args, first)
+        ]
+        await execute_all(["ANALYZE bench_plain_entries", "ANALYZE bench_part_entries"])
+
+        for name, table in (
+            ("plain", "bench_plain_entries"),
+            ("partitioned", "bench_part_entries"),
+        ):
+            results[name].append(
+                await time_lookup(
+                    text(OWNER_LOOKUP.format(table=table)),
+                    {
+                        "owner_id": "owner_1",
+                        "since": datetime.combine(last_month, dt_time.min),
+                    },
+                    args.repeat,
+                )
+            )
+            results[name].append(
+                await time_lookup(
+                    NONCE_LOOKUP[name], {"nonce": f"{prefix}{args.rows}"}, args.repeat
+                )
+            )
+    finally:
+        await execute_all(DROP_SCHEMA)
+        await async_engine.dispose()
+
+    print(
+        f"rows={args.rows} months={args.months} owners={args.owners} "
+        f"batch={args.batch_size} repeat={args.repeat} (median latency)"
+    )
+    print(f"{'table':>12}{'insert ms':>12}{'owner month ms':>17}{'nonce ms':>11}")
+    for name, (insert, owner, nonce) in results.items():
+        print(f"{name:>12}{insert:>12.0f}{owner:>17.2f}{nonce:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+# benchmarks/request_logging.py
+# Microbenchmark for the request logging middleware: per-request cost of the
+# old @app.middleware("http") logger and of RequestLoggingMiddleware, against
+# no middleware at all. Each app serves one trivial route, called directly
+# over ASGI, so the numbers are the middleware and routing alone. Log lines go
+# through the service formatter into memory.
+#
+#   python -m benchmarks.request_logging --requests 20000 --level INFO
+#   python -m benchmarks.request_logging --level WARNING --sample-rate 0.01
+import argparse
+import asyncio
+import io
+import logging
+import time
+from fastapi import FastAPI, Request
+from core.logging.logger import logger
+from core.monitoring.middleware import RequestLoggingMiddleware
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"item_id": item_id}
+
+    return app
+
+
+def base_http_app() -> FastAPI:
+    # What apps/app1/src/main.py used before RequestLoggingMiddleware.
+    app = make_app()
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = time.time()
+        logger.logger.info(
+            f"Request: {request.method} {request.url} - Client: {request.client.host if request.client else 'N/A'}"
+        )
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.logger.info(
+            f"Response status code: {response.status_code} - Endpoint: {request.url.path} - Time: {process_time:.4f}s"
+        )
+        return response
+
+    return app
+
+
+def asgi_app(sample_rate: float) -> FastAPI:
+    app = make_app()
+    app.add_middleware(RequestLoggingMiddleware, sample_rate=sample_rate)
+    return app
+
+
+async def measure(app, count: int, output: io.StringIO) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i: int) -> dict:
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("bench", 80),
+            "client": ("127.0.0.1", 50000),
+            "path": f"/items/{i}",
+            "raw_path": f"/items/{i}".encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "state": {},
+        }
+
+    for i in range(100):
+        await app(scope(i), receive, send)
+    output.seek(0)
+    output.truncate()
+    start = time.perf_counter()
+    for i in range(count):
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+async def main(args: argparse.Namespace) -> None:
+    output = io.StringIO()
+    handler = logging.StreamHandler(output)
+    handler.setFormatter(logger.logger.handlers[0].formatter)
+    logger.logger.handlers = [handler]
+    logger.logger.setLevel(args.level)
+
+    apps = [
+        ("none", make_app()),
+        ("base_http", base_http_app()),
+        ("asgi", asgi_app(args.sample_rate)),
+    ]
+    results = []
+    for name, app in apps:
+        micros = await measure(app, args.requests, output)
+        results.append((name, micros, output.getvalue().count("\n")))
+
+    baseline = results[0][1]
+    print(f"requests={args.requests} level={args.level} sample_rate={args.sample_rate}")
+    print(f"{'middleware':<12}{'us/request':>12}{'overhead':>10}{'log lines':>11}")
+    for name, micros, lines in results:
+        print(f"{name:<12}{micros:>12.1f}{micros - baseline:>10.1f}{lines:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--level", default="INFO")
+    parser.add_argument("--sample-rate", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
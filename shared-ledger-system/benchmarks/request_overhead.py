@@ -0,0 +1,106 @@
+# benchmarks/request_overhead.py
+# Measures what the ledger routes cost per request around the ledger work
+# itself: Redis round trips, Redis commands and microseconds, for a cached
+# balance read and for an entry write. Requests go through the ASGI app in
+# process, so no HTTP stack is involved.
+#
+#   python -m benchmarks.request_overhead --requests 2000
+#
+# Runs against DATABASE_URL (migrated to head) and REDIS_URL. Run it on two
+# revisions to compare them.
+import argparse
+import asyncio
+import time
+import uuid
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+from redis.asyncio.connection import AbstractConnection
+from apps.app1.src.main import app
+from core.auth.schemas import UserCreate
+from core.auth.service import create_access_token, create_user
+from core.config import core_settings
+from core.db.base import AsyncSessionLocal
+
+round_trips = 0
+send_packed_command = AbstractConnection.send_packed_command
+
+
+async def counting_send_packed_command(self, *args, **kwargs):
+    global round_trips
+    round_trips += 1
+    return await send_packed_command(self, *args, **kwargs)
+
+
+async def commands_processed() -> int:
+    info = await app.state.redis.info("stats")
+    return int(info["total_commands_processed"])
+
+
+async def measure(count: int, send) -> tuple:
+    global round_trips
+    # Warm up caches and connections first.
+    for i in range(10):
+        await send(-1 - i)
+    commands = await commands_processed()
+    round_trips = 0
+    start = time.perf_counter()
+    for i in range(count):
+        await send(i)
+    elapsed = time.perf_counter() - start
+    trips = round_trips
+    # The INFO call itself counts as one command.
+    commands = await commands_processed() - commands - 1
+    return elapsed / count * 1e6, trips / count, commands / count
+
+
+async def main(args: argparse.Namespace) -> None:
+    AbstractConnection.send_packed_command = counting_send_packed_command
+    username = f"bench_{uuid.uuid4().hex[:8]}"
+    core_settings.rate_limit.user_limits[username] = 10**9
+    owner_id = f"{username}_owner"
+
+    async with app.router.lifespan_context(app):
+        async with AsyncSessionLocal() as session:
+            user = await create_user(
+                session, UserCreate(username=username, password=uuid.uuid4().hex)
+            )
+        token = create_access_token({"sub": user.username, "user_id": user.id})
+        headers = {"Authorization": f"Bearer {token}"}
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench", headers=headers
+        ) as client:
+
+            async def health(_):
+                (await client.get("/healthz")).raise_for_status()
+
+            async def read(_):
+                (await client.get(f"/ledger/{owner_id}")).raise_for_status()
+
+            async def write(i):
+                response = await client.post(
+                    "/ledger/",
+                    json={
+                        "owner_id": owner_id,
+                        "operation": "DAILY_REWARD",
+                        "amount": 1,
+                        "nonce": f"{owner_id}_{i}_{uuid.uuid4().hex}",
+                    },
+                )
+                response.raise_for_status()
+
+            results = [
+                ("healthz", await measure(args.requests, health)),
+                ("get_balance", await measure(args.requests, read)),
+                ("create_entry", await measure(args.requests, write)),
+            ]
+
+    print(f"requests={args.requests}")
+    print(f"{'route':<14}{'us/request':>12}{'round trips':>13}{'commands':>10}")
+    for route, (micros, trips, commands) in results:
+        print(f"{route:<14}{micros:>12.0f}{trips:>13.2f}{commands:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+# benchmarks/subscriptions.py
+# Load test for the balance streams: opens many idle SSE subscribers against a
+# running server, then writes one entry per watched owner and measures how long
+# each update takes to reach its subscribers.
+#
+#   python -m benchmarks.subscriptions --url http://localhost:8000 \
+#       --token <access-token> --subscribers 5000 --owners 500
+#
+# Every subscriber takes a rate-limit token for /ledger/{owner_id}/stream, so
+# raise that endpoint's limit (RATE_LIMIT_ENDPOINT_LIMITS) or the user's limit
+# for the run, and raise `ulimit -n` on both sides.
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import Dict, List
+import httpx
+
+
+async def subscribe(
+    client: httpx.AsyncClient,
+    owner_id: str,
+    connected: asyncio.Event,
+    total: int,
+    sent_at: Dict[str, float],
+    latencies: List[float],
+    ready: List[str],
+) -> None:
+    async with client.stream("GET", f"/ledger/{owner_id}/stream") as response:
+        response.raise_for_status()
+        first = True
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            if first:
+                first = False
+                ready.append(owner_id)
+                if len(ready) == total:
+                    connected.set()
+                continue
+            balance = json.loads(line[len("data: ") :])
+            if balance["owner_id"] in sent_at:
+                latencies.append(time.perf_counter() - sent_at[balance["owner_id"]])
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def main(args: argparse.Namespace) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    owners = [f"bench_{run_id}_{i}" for i in range(args.owners)]
+    headers = {"Authorization": f"Bearer {args.token}"}
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(None, connect=30)
+    connected = asyncio.Event()
+    sent_at: Dict[str, float] = {}
+    latencies: List[float] = []
+    ready: List[str] = []
+
+    async with httpx.AsyncClient(
+        base_url=args.url, headers=headers, limits=limits, timeout=timeout
+    ) as client:
+        start = time.perf_counter()
+        subscribers = [
+            asyncio.create_task(
+                subscribe(
+                    client,
+                    owners[i % len(owners)],
+                    connected,
+                    args.subscribers,
+                    sent_at,
+                    latencies,
+                    ready,
+                )
+            )
+            for i in range(args.subscribers)
+        ]
+        await asyncio.wait_for(connected.wait(), args.connect_timeout)
+        connect_seconds = time.perf_counter() - start
+
+        # Idle phase: only keepalives flow.
+        await asyncio.sleep(args.idle_seconds)
+        gauges = [
+            line
+            for line in (await client.get("/metrics/")).text.splitlines()
+            if line.startswith("balance_subscribers")
+        ]
+
+        for owner_id in owners:
+            sent_at[owner_id] = time.perf_counter()
+            response = await client.post(
+                "/ledger/",
+                json={
+                    "owner_id": owner_id,
+                    "operation": "DAILY_REWARD",
+                    "amount": 1,
+                    "nonce": f"{owner_id}_{uuid.uuid4().hex}",
+                },
+            )
+            response.raise_for_status()
+
+        deadline = time.perf_counter() + args.delivery_timeout
+        while len(latencies) < args.subscribers and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+
+        for task in subscribers:
+            task.cancel()
+        await asyncio.gather(*subscribers, return_exceptions=True)
+
+    print(f"subscribers={args.subscribers} owners={args.owners}")
+    print(f"connected in {connect_seconds:.2f}s")
+    for line in gauges:
+        print(f"worker metric: {line}")
+    print(f"delivered {len(latencies)}/{args.subscribers} updates")
+    if latencies:
+        print(
+            f"latency ms: p50={statistics.median(latencies) * 1000:.1f} "
+            f"p99={percentile(latencies, 0.99) * 1000:.1f} "
+            f"max={max(latencies) * 1000:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--owners", type=int, default=500)
+    parser.add_argument("--idle-seconds", type=float, default=30.0)
+    parser.add_argument("--connect-timeout", type=float, default=120.0)
+    parser.add_argument("--delivery-timeout", type=float, default=30.0)
+    asyncio.run(main(parser.parse_args()))
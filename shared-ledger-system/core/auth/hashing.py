@@ -0,0 +1,132 @@
+# core/auth/hashing.py
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple
+from passlib.context import CryptContext
+from core.config import core_settings
+from core.monitoring.prometheus import metrics
+
+
+@lru_cache(maxsize=None)
+def crypt_context(rounds: int) -> CryptContext:
+    # Pinning the minimum and maximum cost to the configured one makes passlib
+    # flag hashes made with any other cost, so they are redone on login.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+# Module-level so they can be sent to a process pool.
+def hash_password(password: str, rounds: int) -> str:
+    return crypt_context(rounds).hash(password)
+
+
+def check_password(password: str, hashed_password: str, rounds: int) -> bool:
+    return crypt_context(rounds).verify(password, hashed_password)
+
+
+def check_and_update_password(
+    password: str, hashed_password: str, rounds: int
+) -> Tuple[bool, Optional[str]]:
+    return crypt_context(rounds).verify_and_update(password, hashed_password)
+
+
+def _timed(func: Callable, *args) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class PasswordHasherBusyError(Exception):
+    def __init__(self, pending: int):
+        super().__init__(f"Password hashing is busy: {pending} requests pending.")
+
+
+class PasswordHasher:
+    # A bcrypt hash takes hundreds of milliseconds, so it runs on a pool rather
+    # than on the event loop. At most `workers` run at once and up to max_queue
+    # more wait; beyond that callers get PasswordHasherBusyError instead of
+    # queueing without bound.
+    def __init__(
+        self,
+        rounds: int,
+        executor: str = "thread",
+        workers: int = 4,
+        max_queue: int = 100,
+    ):
+        self.rounds = rounds
+        self.executor_type = executor
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable, *args) -> Any:
+        if self._pending >= self.workers + self.max_queue:
+            raise PasswordHasherBusyError(self._pending)
+        self._pending += 1
+        metrics.password_hash_pending.inc()
+        start = time.perf_counter()
+        try:
+            result, run_seconds = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _timed, func, *args
+            )
+        finally:
+            self._pending -= 1
+            metrics.password_hash_pending.dec()
+        # The worker times its own run; the rest was spent waiting for it.
+        metrics.password_hash_seconds.labels(operation=operation).observe(run_seconds)
+        metrics.password_hash_queue_seconds.labels(operation=operation).observe(
+            max(0.0, time.perf_counter() - start - run_seconds)
+        )
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(
+            "verify", check_password, password, hashed_password, self.rounds
+        )
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        # Returns a new hash as well when the password is right but was hashed
+        # with a different cost.
+        return await self._run(
+            "verify",
+            check_and_update_password,
+            password,
+            hashed_password,
+            self.rounds,
+        )
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    core_settings.auth.bcrypt_rounds,
+    executor=core_settings.auth.password_hash_executor,
+    workers=core_settings.auth.password_hash_workers,
+    max_queue=core_settings.auth.password_hash_max_queue,
+)
@@ -4,19 +4,31 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.db.base import get_session
 from core.auth import service, models, schemas
+from core.auth.hashing import PasswordHasherBusyError
 from typing import Any
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def hashing_busy(e: PasswordHasherBusyError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/token", response_model=schemas.Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(get_session),
 ) -> Any:
-    user = await service.authenticate_user(
-        session, form_data.username, form_data.password
-    )
+    try:
+        user = await service.authenticate_user(
+            session, form_data.username, form_data.password
+        )
+    except PasswordHasherBusyError as e:
+        raise hashing_busy(e)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,7 +50,18 @@ async def register_user(
     db_user = await service.get_user_by_username(session, username=user_create.username)
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
-    return await service.create_user(session, user_create)
+    try:
+        return await service.create_user(session, user_create)
+    except PasswordHasherBusyError as e:
+        raise hashing_busy(e)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(service.oauth2_scheme),
+    current_user: models.User = Depends(service.get_current_user),
+) -> None:
+    await service.revoke_token(token)
 
 
 @router.get("/me", response_model=schemas.UserSchema)
@@ -2,28 +2,33 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+import uuid
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from core.db.base import get_session
+from core.db.base import AsyncSessionLocal
+from core.db.replicas import get_read_session
 from core.auth import models, schemas
+from core.auth.hashing import check_password, hash_password, password_hasher
+from core.auth.token_cache import token_cache
 from core.config import core_settings
 from core.cache import cache
 from typing import Optional
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 auth_cache = cache
 
 
+# Blocking; request handlers go through password_hasher instead.
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_password(password, core_settings.auth.bcrypt_rounds)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return check_password(
+        plain_password, hashed_password, core_settings.auth.bcrypt_rounds
+    )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -32,7 +37,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expires_delta
         or timedelta(minutes=core_settings.jwt.access_token_expire_minutes)
     )
-    to_encode.update({"exp": expire})
+    # jti keeps tokens issued in the same second distinct, so revoking one
+    # leaves the others alone.
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, core_settings.jwt.secret_key, algorithm=core_settings.jwt.algorithm
     )
@@ -54,19 +61,26 @@ async def authenticate_user(
     user = await get_user_by_username(session, username=username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await password_hasher.verify_and_update(
+        password, user.hashed_password
+    )
+    if not verified:
         return None
+    if new_hash is not None:
+        # The bcrypt cost changed since this hash was made.
+        user.hashed_password = new_hash
+        await session.commit()
     return user
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_session)
-) -> models.User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+async def get_user_for_token(
+    token: str, session: AsyncSession
+) -> Optional[models.User]:
+    token_hash = token_cache.key(token)
+    user = token_cache.get(token_hash)
+    if user is not None:
+        return user
+    generation = token_cache.generation
     try:
         payload = jwt.decode(
             token,
@@ -76,17 +90,47 @@ async def get_current_user(
         username: str = payload.get("sub")
         user_id_str: str = payload.get("user_id")
         if username is None or user_id_str is None:
-            raise credentials_exception
+            return None
         user_id = int(user_id_str)
-        token_data = schemas.TokenPayload(sub=username, user_id=user_id)
+        token_data = schemas.TokenPayload(
+            sub=username, user_id=user_id, exp=payload.get("exp")
+        )
     except JWTError:
-        raise credentials_exception
+        return None
+    if await token_cache.is_revoked(token_hash):
+        return None
 
     user = await get_user_from_cache_or_db(
         session, username=token_data.sub, user_id=token_data.user_id
     )
+    if user is None and session.bind is not AsyncSessionLocal.kw["bind"]:
+        # A user registered moments ago may not have reached the replica yet.
+        async with AsyncSessionLocal() as primary_session:
+            user = await get_user_from_cache_or_db(
+                primary_session, username=token_data.sub, user_id=token_data.user_id
+            )
+    if user is not None and token_data.exp is not None:
+        token_cache.set(token_hash, user, token_data.exp, generation)
+    return user
+
+
+async def revoke_token(token: str) -> None:
+    # Only for tokens already verified, e.g. by get_current_user.
+    claims = jwt.get_unverified_claims(token)
+    await token_cache.revoke(token_cache.key(token), claims["exp"])
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_read_session),
+) -> models.User:
+    user = await get_user_for_token(token, session)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -106,7 +150,7 @@ async def get_user_from_cache_or_db(
 async def create_user(
     session: AsyncSession, user_create: schemas.UserCreate
 ) -> models.User:
-    hashed_password = get_password_hash(user_create.password)
+    hashed_password = await password_hasher.hash(user_create.password)
     db_user = models.User(
         username=user_create.username,
         hashed_password=hashed_password,
@@ -0,0 +1,125 @@
+# core/auth/token_cache.py
+import asyncio
+import hashlib
+import math
+import time
+from typing import Optional
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from core.cache.cache import cache
+from core.cache.tiered import LocalCache
+from core.config import core_settings
+from core.logging.logger import logger
+from core.monitoring.prometheus import metrics
+from .models import User
+
+
+class TokenCache:
+    # Verified tokens and their users, kept in process so a token seen before
+    # skips the JWT decode and the user lookup in Redis. An entry lives until
+    # the token expires. Revoked tokens are published on a Redis channel, and
+    # every worker drops them; the revocation is also kept in Redis until the
+    # token expires, for workers that verify the token afresh. Entries are
+    # only used while the worker is subscribed, so none outlives a revocation.
+    #
+    # generation counts the revocations this worker has seen. A caller reads
+    # it before checking Redis for a revocation and hands it to set(), which
+    # skips caching if a revocation arrived in between; otherwise the
+    # revocation could be dropped here before the entry it targets was added.
+    def __init__(
+        self, redis: aioredis.Redis, max_size: int, max_ttl: float, channel: str
+    ):
+        self.redis = redis
+        self.local = LocalCache(max_size, max_ttl)
+        self.channel = channel
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = False
+        self.generation = 0
+
+    def use_client(self, redis: aioredis.Redis) -> None:
+        self.redis = redis
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token_hash: str) -> Optional[User]:
+        if not self._subscribed:
+            return None
+        user = self.local.get(token_hash)
+        metrics.token_cache_count.labels(result="hit" if user else "miss").inc()
+        return user
+
+    def set(
+        self,
+        token_hash: str,
+        user: User,
+        expires_at: float,
+        generation: Optional[int] = None,
+    ) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        ttl = expires_at - time.time()
+        if self._subscribed and ttl > 0 and self.local.max_size > 0:
+            self.local.set(token_hash, user, ttl=ttl)
+
+    def drop(self, token_hash: str) -> None:
+        self.generation += 1
+        self.local.pop(token_hash)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.local.clear()
+
+    async def is_revoked(self, token_hash: str) -> bool:
+        return bool(await self.redis.exists(f"{self.channel}:{token_hash}"))
+
+    async def revoke(self, token_hash: str, expires_at: float) -> None:
+        self.drop(token_hash)
+        ttl = math.ceil(expires_at - time.time())
+        if ttl <= 0:
+            return
+        await self.redis.set(f"{self.channel}:{token_hash}", 1, ex=ttl)
+        await self.redis.publish(self.channel, token_hash)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.clear()
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # A revocation may have been missed while we were not subscribed.
+                self.clear()
+                self._subscribed = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.drop(message["data"])
+            except RedisError as e:
+                logger.logger.warning(f"Token revocation listener error: {e}")
+                self._subscribed = False
+                self.clear()
+                await asyncio.sleep(1)
+            finally:
+                self._subscribed = False
+                await pubsub.aclose()
+
+
+token_cache = TokenCache(
+    cache.redis,
+    max_size=core_settings.auth.token_cache_max_size,
+    max_ttl=core_settings.jwt.access_token_expire_minutes * 60,
+    channel=core_settings.auth.revocation_channel,
+)
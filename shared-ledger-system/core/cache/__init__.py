@@ -1,4 +1,18 @@
 # core/cache/__init__.py
 from .cache import cache, Cache
+from .tiered import tiered_cache, TieredCache, LocalCache
+from .rate_limit import rate_limiter, RateLimiter, RateLimitResult
+from .pool import create_blocking_redis_client, create_redis_client
 
-__all__ = ["cache", "Cache"]
\ No newline at end of file
+__all__ = [
+    "cache",
+    "Cache",
+    "tiered_cache",
+    "TieredCache",
+    "LocalCache",
+    "rate_limiter",
+    "RateLimiter",
+    "RateLimitResult",
+    "create_blocking_redis_client",
+    "create_redis_client",
+]
@@ -1,13 +1,71 @@
 # core/cache/cache.py
-from typing import Optional, Any, Dict
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Any, Awaitable, Callable, Dict, List, Tuple
 from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
 from core.config import core_settings
+from .pool import create_redis_client
+
+# KEYS[1] holds the value and KEYS[2] its version. The value is only replaced
+# when ARGV[2] is at least the stored version, so an update that lost a race
+# can never overwrite a newer one.
+SET_IF_NEWER_SCRIPT = """
+local current = redis.call('GET', KEYS[2])
+if current and tonumber(current) > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+LOCK_POLL_INTERVAL = 0.025
+MAX_TRACKED_COMPUTE_DURATIONS = 10000
+
+
+class SingleFlight:
+    # Concurrent callers for the same key share one running computation. The
+    # computation runs as its own task, so a caller that is cancelled does not
+    # cancel it for the others.
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
 
 
 class Cache:
     def __init__(self, redis_url: str):
-        self.redis = aioredis.from_url(redis_url, decode_responses=True)
+        self.use_client(create_redis_client(redis_url))
         self.default_ttl = core_settings.cache.default_ttl
+        self.single_flight = SingleFlight()
+        self._compute_durations: "OrderedDict[str, float]" = OrderedDict()
+
+    def use_client(self, redis: aioredis.Redis) -> None:
+        self.redis = redis
+        self._set_if_newer = redis.register_script(SET_IF_NEWER_SCRIPT)
+        self._release_lock = redis.register_script(RELEASE_LOCK_SCRIPT)
 
     async def get_value(self, key: str) -> Optional[str]:
         return await self.redis.get(key)
@@ -16,6 +74,127 @@ class Cache:
         expiry = ttl if ttl is not None else self.default_ttl
         await self.redis.set(key, value, ex=expiry)
 
+    async def set_value_if_newer(
+        self, key: str, value: str, version: int, ttl: Optional[int] = None
+    ) -> bool:
+        expiry = ttl if ttl is not None else self.default_ttl
+        applied = await self._set_if_newer(
+            keys=[key, f"{key}:version"], args=[value, version, expiry]
+        )
+        return bool(applied)
+
+    async def queue_set_value_if_newer(
+        self,
+        pipe: Pipeline,
+        key: str,
+        value: str,
+        version: int,
+        ttl: Optional[int] = None,
+    ) -> None:
+        # set_value_if_newer as part of a caller's pipeline.
+        expiry = ttl if ttl is not None else self.default_ttl
+        await self._set_if_newer(
+            keys=[key, f"{key}:version"], args=[value, version, expiry], client=pipe
+        )
+
+    async def get_values(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        return await self.redis.mget(keys)
+
+    async def set_values_if_newer(
+        self, items: Dict[str, Tuple[str, int]], ttl: Optional[int] = None
+    ) -> None:
+        if not items:
+            return
+        expiry = ttl if ttl is not None else self.default_ttl
+        pipe = self.redis.pipeline(transaction=False)
+        for key, (value, version) in items.items():
+            await self._set_if_newer(
+                keys=[key, f"{key}:version"], args=[value, version, expiry], client=pipe
+            )
+        await pipe.execute()
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Optional[str]]],
+        distributed_lock: Optional[bool] = None,
+        on_miss: Optional[Callable[[], None]] = None,
+    ) -> Optional[str]:
+        # compute() loads the value and is responsible for writing it to the
+        # cache; this only decides who runs it and when. on_miss is called when
+        # the value is not served from the cache, whether this caller computes
+        # it or waits for a load already in flight.
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        value, ttl_ms = await pipe.execute()
+        if value is not None and not self._should_refresh_early(key, ttl_ms):
+            return value
+        if on_miss is not None:
+            on_miss()
+
+        if distributed_lock is None:
+            distributed_lock = core_settings.cache.single_flight_lock_enabled
+        return await self.single_flight.do(
+            key, lambda: self._compute(key, compute, distributed_lock)
+        )
+
+    def _should_refresh_early(self, key: str, ttl_ms: int) -> bool:
+        # Probabilistic early expiration (XFetch): the closer the key is to
+        # expiring, relative to how long it takes to recompute, the likelier a
+        # reader recomputes it while everybody else keeps the cached value.
+        beta = core_settings.cache.early_refresh_beta
+        delta = self._compute_durations.get(key)
+        if beta <= 0 or delta is None or ttl_ms < 0:
+            return False
+        return -delta * beta * math.log(1.0 - random.random()) >= ttl_ms / 1000
+
+    async def _compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Optional[str]]],
+        distributed_lock: bool,
+    ) -> Optional[str]:
+        if not distributed_lock:
+            return await self._timed_compute(key, compute)
+
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        timeout_ms = core_settings.cache.single_flight_lock_timeout_ms
+        if await self.redis.set(lock_key, token, nx=True, px=timeout_ms):
+            try:
+                return await self._timed_compute(key, compute)
+            finally:
+                await self._release_lock(keys=[lock_key], args=[token])
+
+        # Another process is computing the value; wait for it to show up, and
+        # compute it ourselves if the holder gives up or dies.
+        deadline = time.monotonic() + timeout_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            value = await self.redis.get(key)
+            if value is not None:
+                return value
+            if not await self.redis.exists(lock_key):
+                value = await self.redis.get(key)
+                if value is not None:
+                    return value
+                break
+        return await self._timed_compute(key, compute)
+
+    async def _timed_compute(
+        self, key: str, compute: Callable[[], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        start = time.monotonic()
+        value = await compute()
+        self._compute_durations[key] = time.monotonic() - start
+        self._compute_durations.move_to_end(key)
+        while len(self._compute_durations) > MAX_TRACKED_COMPUTE_DURATIONS:
+            self._compute_durations.popitem(last=False)
+        return value
+
     async def get_dict(self, key: str) -> Optional[Dict[str, Any]]:
         import json
 
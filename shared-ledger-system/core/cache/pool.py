@@ -0,0 +1,62 @@
+# core/cache/pool.py
+import time
+from typing import Optional
+from redis import asyncio as aioredis
+from redis.asyncio.connection import BlockingConnectionPool
+from core.config import core_settings
+from core.monitoring.prometheus import metrics
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    # Callers wait up to `timeout` seconds for a free connection once
+    # max_connections are checked out, instead of opening unbounded new ones.
+    connections_in_use = 0
+
+    async def get_connection(self, *args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        finally:
+            metrics.redis_pool_wait_seconds.observe(time.perf_counter() - start_time)
+        self.connections_in_use += 1
+        metrics.redis_pool_connections_in_use.inc()
+        return connection
+
+    async def release(self, connection) -> None:
+        await super().release(connection)
+        self.connections_in_use -= 1
+        metrics.redis_pool_connections_in_use.dec()
+
+
+def create_redis_client(redis_url: Optional[str] = None) -> aioredis.Redis:
+    settings = core_settings.redis
+    pool = InstrumentedConnectionPool.from_url(
+        redis_url or settings.redis_url,
+        max_connections=settings.max_connections,
+        timeout=settings.pool_timeout,
+        socket_timeout=settings.socket_timeout,
+        socket_connect_timeout=settings.socket_connect_timeout,
+        health_check_interval=settings.health_check_interval,
+        decode_responses=True,
+    )
+    metrics.redis_pool_max_connections.set(settings.max_connections)
+    return aioredis.Redis.from_pool(pool)
+
+
+def create_blocking_redis_client(
+    max_connections: int, max_block_seconds: float, redis_url: Optional[str] = None
+) -> aioredis.Redis:
+    # For commands that wait server side, such as XREAD BLOCK. A pool of their
+    # own keeps long polls from holding the shared one, and the socket timeout
+    # outlasts the longest wait.
+    settings = core_settings.redis
+    pool = BlockingConnectionPool.from_url(
+        redis_url or settings.redis_url,
+        max_connections=max_connections,
+        timeout=settings.pool_timeout,
+        socket_timeout=settings.socket_timeout + max_block_seconds,
+        socket_connect_timeout=settings.socket_connect_timeout,
+        health_check_interval=settings.health_check_interval,
+        decode_responses=True,
+    )
+    return aioredis.Redis.from_pool(pool)
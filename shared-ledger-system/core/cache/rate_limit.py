@@ -0,0 +1,74 @@
+# core/cache/rate_limit.py
+from typing import NamedTuple
+from redis import asyncio as aioredis
+from .cache import cache
+
+# Token bucket kept in a hash at KEYS[1]. ARGV[1] is the capacity and ARGV[2]
+# the refill rate in tokens per second. Redis' own clock is used so that every
+# worker agrees on elapsed time. Returns {allowed, remaining, retry_after_ms,
+# reset_ms} where reset_ms is the time until the bucket is full again.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+local reset = math.ceil((capacity - tokens) * 1000 / rate)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], reset + 1000)
+return {allowed, math.floor(tokens), retry_after, reset}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after_ms: int
+    reset_ms: int
+
+
+class RateLimiter:
+    def __init__(self, redis: aioredis.Redis):
+        self.use_client(redis)
+
+    def use_client(self, redis: aioredis.Redis) -> None:
+        self.redis = redis
+        self._token_bucket = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(
+        self, key: str, limit: int, window_seconds: int
+    ) -> RateLimitResult:
+        # `limit` requests may burst at once; the bucket then refills at
+        # limit / window_seconds tokens per second.
+        allowed, remaining, retry_after_ms, reset_ms = await self._token_bucket(
+            keys=[key], args=[limit, limit / window_seconds]
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=int(remaining),
+            retry_after_ms=int(retry_after_ms),
+            reset_ms=int(reset_ms),
+        )
+
+
+rate_limiter = RateLimiter(cache.redis)
@@ -0,0 +1,233 @@
+# core/cache/tiered.py
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
+from core.config import core_settings
+from core.logging.logger import logger
+from core.monitoring.prometheus import metrics
+from .cache import Cache, cache
+
+
+class LocalCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        expiry = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + expiry, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TieredCache:
+    # Reads go to the in-process tier first and fall back to Redis. A local
+    # entry lives at most local_ttl seconds, which bounds staleness even if an
+    # invalidation message published to the other workers is lost.
+    def __init__(
+        self,
+        backend: Cache,
+        max_size: int,
+        local_ttl: float,
+        channel: str,
+    ):
+        self.backend = backend
+        self.local = LocalCache(max_size, local_ttl)
+        self.channel = channel
+        self.default_ttl = backend.default_ttl
+        self.instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    async def get_value(self, key: str) -> Optional[str]:
+        value = self.local.get(key)
+        if value is not None:
+            metrics.cache_tier_hit_count.labels(tier="local").inc()
+            return value
+        metrics.cache_tier_miss_count.labels(tier="local").inc()
+
+        value = await self.backend.get_value(key)
+        if value is None:
+            metrics.cache_tier_miss_count.labels(tier="redis").inc()
+            return None
+        metrics.cache_tier_hit_count.labels(tier="redis").inc()
+        self.local.set(key, value)
+        return value
+
+    async def get_values(self, keys: List[str]) -> List[Optional[str]]:
+        values = [self.local.get(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        local_hits = len(keys) - len(missing)
+        if local_hits:
+            metrics.cache_tier_hit_count.labels(tier="local").inc(local_hits)
+        if not missing:
+            return values
+        metrics.cache_tier_miss_count.labels(tier="local").inc(len(missing))
+
+        fetched = await self.backend.get_values([keys[i] for i in missing])
+        redis_hits = 0
+        for i, value in zip(missing, fetched):
+            if value is not None:
+                redis_hits += 1
+                values[i] = value
+                self.local.set(keys[i], value)
+        if redis_hits:
+            metrics.cache_tier_hit_count.labels(tier="redis").inc(redis_hits)
+        if len(missing) - redis_hits:
+            metrics.cache_tier_miss_count.labels(tier="redis").inc(
+                len(missing) - redis_hits
+            )
+        return values
+
+    async def set_values_if_newer(
+        self, items: Dict[str, Tuple[str, int]], ttl: Optional[int] = None
+    ) -> None:
+        # Not copied into the local tier: Redis may reject some of these in
+        # favour of a newer version written concurrently.
+        await self.backend.set_values_if_newer(items, ttl=ttl)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Optional[str]]],
+        distributed_lock: Optional[bool] = None,
+        on_miss: Optional[Callable[[], None]] = None,
+    ) -> Optional[str]:
+        value = self.local.get(key)
+        if value is not None:
+            metrics.cache_tier_hit_count.labels(tier="local").inc()
+            return value
+        metrics.cache_tier_miss_count.labels(tier="local").inc()
+        missed = False
+
+        def record_miss() -> None:
+            nonlocal missed
+            missed = True
+            if on_miss is not None:
+                on_miss()
+
+        value = await self.backend.get_or_compute(
+            key, compute, distributed_lock=distributed_lock, on_miss=record_miss
+        )
+        # Only a value read from Redis is copied here. A computed one reaches
+        # the local tier through compute()'s own set_value_if_newer, and only
+        # if Redis did not keep a newer version instead.
+        if value is not None and not missed:
+            self.local.set(key, value)
+        return value
+
+    async def set_value(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self.backend.set_value(key, value, ttl=ttl)
+        self.local.set(key, value, ttl=ttl)
+
+    async def set_value_if_newer(
+        self, key: str, value: str, version: int, ttl: Optional[int] = None
+    ) -> bool:
+        applied = await self.backend.set_value_if_newer(key, value, version, ttl=ttl)
+        if applied:
+            self.local.set(key, value, ttl=ttl)
+        else:
+            self.local.pop(key)
+        await self._publish_invalidation(key)
+        return applied
+
+    async def queue_set_value_if_newer(
+        self,
+        pipe: Pipeline,
+        key: str,
+        value: str,
+        version: int,
+        ttl: Optional[int] = None,
+    ) -> None:
+        # The outcome is only known once the pipeline runs, so the local copy
+        # is dropped rather than updated.
+        self.local.pop(key)
+        await self.backend.queue_set_value_if_newer(pipe, key, value, version, ttl=ttl)
+        pipe.publish(self.channel, f"{self.instance_id} {key}")
+
+    async def get_dict(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self.get_value(key)
+        if value:
+            return json.loads(value)
+        return None
+
+    async def set_dict(
+        self, key: str, value: Dict[str, Any], ttl: Optional[int] = None
+    ) -> None:
+        await self.set_value(key, json.dumps(value), ttl=ttl)
+
+    async def invalidate_key(self, key: str) -> None:
+        self.local.pop(key)
+        await self.backend.invalidate_key(key)
+        await self._publish_invalidation(key)
+
+    async def _publish_invalidation(self, key: str) -> None:
+        await self.backend.redis.publish(self.channel, f"{self.instance_id} {key}")
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.local.clear()
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.backend.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything may have changed while we were not subscribed.
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    origin, _, key = message["data"].partition(" ")
+                    if origin != self.instance_id:
+                        self.local.pop(key)
+            except RedisError as e:
+                logger.logger.warning(f"Cache invalidation listener error: {e}")
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+tiered_cache = TieredCache(
+    cache,
+    max_size=core_settings.cache.local_cache_max_size,
+    local_ttl=core_settings.cache.local_cache_ttl_seconds,
+    channel=core_settings.cache.invalidation_channel,
+)
@@ -2,12 +2,32 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import Dict
+from typing import Dict, List, Literal, Optional
 
 
 class DatabaseSettings(BaseSettings):
     database_url: str = os.environ.get("DATABASE_URL")
     database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_pre_ping: bool = True
+    database_pool_recycle: int = 1800
+    database_statement_cache_size: int = 100
+    database_pool_warmup: bool = False
+    # Ledger shards by name, e.g. {"shard_a": "postgresql+asyncpg://..."}. Owners
+    # are placed on a hash ring by name, so keep names stable when adding one.
+    # Empty keeps every ledger table in database_url.
+    database_shards: Dict[str, str] = {}
+    database_shard_vnodes: int = 64
+    # Read replicas by shard name ("default" when unsharded). Reads fall back
+    # to the primary when every replica lags more than the bound, and for
+    # read_your_writes_seconds after the same user wrote.
+    database_replicas: Dict[str, List[str]] = {}
+    database_replica_strategy: Literal["round_robin", "least_latency"] = "round_robin"
+    database_replica_max_lag_seconds: float = 5.0
+    database_replica_check_interval: float = 1.0
+    database_replica_check_timeout: float = 0.5
+    database_read_your_writes_seconds: float = 5.0
 
     @field_validator("database_url")
     def validate_database_url(cls, v):
@@ -15,17 +35,46 @@ class DatabaseSettings(BaseSettings):
             raise ValueError("DATABASE_URL must start with 'postgresql+asyncpg://'")
         return v
 
+    @field_validator("database_shards")
+    def validate_database_shards(cls, v):
+        for name, url in v.items():
+            if not url.startswith("postgresql+asyncpg://"):
+                raise ValueError(
+                    f"Shard {name} URL must start with 'postgresql+asyncpg://'"
+                )
+        return v
+
+    @field_validator("database_replicas")
+    def validate_database_replicas(cls, v):
+        for name, urls in v.items():
+            for url in urls:
+                if not url.startswith("postgresql+asyncpg://"):
+                    raise ValueError(
+                        f"Replica URLs of {name} must start with "
+                        "'postgresql+asyncpg://'"
+                    )
+        return v
+
     model_config = SettingsConfigDict(env_prefix="DATABASE_")
 
 
 class RedisSettings(BaseSettings):
     redis_url: str = os.environ.get("REDIS_URL", "redis://redis:6379")
+    max_connections: int = 50
+    pool_timeout: float = 5.0
+    socket_timeout: float = 5.0
+    socket_connect_timeout: float = 2.0
+    health_check_interval: int = 30
     model_config = SettingsConfigDict(env_prefix="REDIS_")
 
 
 class LoggingSettings(BaseSettings):
     log_level: str = os.environ.get("LOGGING_LEVEL", "INFO").upper()
     log_file: str = "ledger_service.log"
+    # Share of requests logged by the request middleware; server errors are
+    # always logged. Every request is still timed.
+    request_log_sample_rate: float = 1.0
+    request_id_header: str = "X-Request-ID"
 
     @field_validator("log_level")
     def validate_log_level(cls, v):
@@ -34,6 +83,12 @@ class LoggingSettings(BaseSettings):
             raise ValueError(f"LOGGING_LEVEL must be one of {valid_levels}")
         return v
 
+    @field_validator("request_log_sample_rate")
+    def validate_request_log_sample_rate(cls, v):
+        if not 0 <= v <= 1:
+            raise ValueError("LOGGING_REQUEST_LOG_SAMPLE_RATE must be between 0 and 1")
+        return v
+
     model_config = SettingsConfigDict(env_prefix="LOGGING_")
 
 
@@ -51,16 +106,46 @@ class JWTSettings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="JWT_")
 
 
+class AuthSettings(BaseSettings):
+    bcrypt_rounds: int = 12
+    # bcrypt runs off the event loop: "thread" suits bcrypt, which releases
+    # the GIL; "process" isolates it entirely at the cost of pickling.
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 100
+    # Verified tokens cached per worker; 0 turns the cache off.
+    token_cache_max_size: int = 10000
+    revocation_channel: str = "auth:revoked"
+    model_config = SettingsConfigDict(env_prefix="AUTH_")
+
+    @field_validator("bcrypt_rounds")
+    def validate_bcrypt_rounds(cls, v):
+        if not 4 <= v <= 31:
+            raise ValueError("AUTH_BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+
+
 class RateLimitSettings(BaseSettings):
 
     requests_per_minute: int = 100
     window_seconds: int = 60
+    # Overrides of requests_per_minute keyed by route path (e.g. "/ledger/batch")
+    # or by username; a per-user limit wins over a per-endpoint one.
+    endpoint_limits: Dict[str, int] = {}
+    user_limits: Dict[str, int] = {}
     model_config = SettingsConfigDict(env_prefix="RATE_LIMIT_")
 
 
 class CacheSettings(BaseSettings):
     redis_url: str = os.environ.get("REDIS_URL", "redis://redis:6379")
     default_ttl: int = 360
+    local_cache_max_size: int = 10000
+    local_cache_ttl_seconds: float = 1.0
+    invalidation_channel: str = "cache:invalidate"
+    balance_write_through: bool = True
+    single_flight_lock_enabled: bool = False
+    single_flight_lock_timeout_ms: int = 2000
+    early_refresh_beta: float = 1.0
 
 
 class LedgerSettings(BaseSettings):
@@ -70,6 +155,41 @@ class LedgerSettings(BaseSettings):
         "CREDIT_SPEND": -1,
         "CREDIT_ADD": 10,
     }
+    batch_max_size: int = 5000
+    balances_max_owners: int = 10000
+    balances_stream_threshold: int = 1000
+    entries_page_size: int = 50
+    entries_max_page_size: int = 500
+    export_batch_size: int = 1000
+    checkpoint_compaction_enabled: bool = False
+    checkpoint_interval_seconds: float = 60.0
+    checkpoint_max_entries: int = 100000
+    partition_months_ahead: int = 3
+    partition_retain_months: Optional[int] = None
+    partition_archive_schema: Optional[str] = None
+    outbox_relay_enabled: bool = False
+    outbox_stream: str = "ledger:changes"
+    outbox_batch_size: int = 500
+    outbox_poll_interval_seconds: float = 0.5
+    outbox_stream_max_length: int = 1000000
+    changes_page_size: int = 100
+    changes_max_page_size: int = 1000
+    changes_max_block_ms: int = 5000
+    changes_max_blocking_reads: int = 20
+    balance_stream_channel: str = "balance:updates"
+    balance_stream_max_subscribers: int = 10000
+    balance_stream_queue_size: int = 16
+    balance_stream_keepalive_seconds: float = 15.0
+    group_commit_enabled: bool = False
+    group_commit_max_batch_size: int = 500
+    group_commit_max_delay_ms: float = 2.0
+
+
+class HealthSettings(BaseSettings):
+    check_timeout: float = 1.0
+    cache_seconds: float = 2.0
+    pool_saturation_threshold: float = 0.9
+    model_config = SettingsConfigDict(env_prefix="HEALTH_")
 
 
 class Settings(BaseSettings):
@@ -81,9 +201,11 @@ class Settings(BaseSettings):
     logging: LoggingSettings = LoggingSettings()
     prometheus: PrometheusSettings = PrometheusSettings()
     jwt: JWTSettings = JWTSettings()
+    auth: AuthSettings = AuthSettings()
     rate_limit: RateLimitSettings = RateLimitSettings()
     cache: CacheSettings = CacheSettings()
     ledger: LedgerSettings = LedgerSettings()
+    health: HealthSettings = HealthSettings()
 
     model_config = SettingsConfigDict(
         env_file=".env" if os.environ.get("ENVIRONMENT") != "test" else ".env.test",
@@ -1,9 +1,10 @@
 # core/db/base.py
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from core.config import core_settings
+from .pool import InstrumentedAsyncQueuePool, instrument_pool
 
 load_dotenv()
 
@@ -11,7 +12,36 @@ Base = declarative_base()
 
 DATABASE_URL = core_settings.database.database_url
 
-async_engine = create_async_engine(DATABASE_URL, echo=False)
+
+DEFAULT_DATABASE = "default"
+
+
+def build_engine(url: str, database: str) -> AsyncEngine:
+    # database labels the engine's pool metrics: the shard or replica name.
+    engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=core_settings.database.database_pool_size,
+        max_overflow=core_settings.database.database_max_overflow,
+        pool_timeout=core_settings.database.database_pool_timeout,
+        pool_pre_ping=core_settings.database.database_pool_pre_ping,
+        pool_recycle=core_settings.database.database_pool_recycle,
+        connect_args={
+            # Both caches must be off (0) behind PgBouncer in transaction mode.
+            "statement_cache_size": (
+                core_settings.database.database_statement_cache_size
+            ),
+            "prepared_statement_cache_size": (
+                core_settings.database.database_statement_cache_size
+            ),
+        },
+    )
+    instrument_pool(engine, database)
+    return engine
+
+
+async_engine = build_engine(DATABASE_URL, DEFAULT_DATABASE)
 
 AsyncSessionLocal = sessionmaker(
     bind=async_engine, expire_on_commit=False, class_=AsyncSession
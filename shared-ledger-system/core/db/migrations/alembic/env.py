@@ -32,7 +32,7 @@ if not db_url:
 context.configure(url=db_url, target_metadata=target_metadata)
 
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 import psycopg2
 from sqlalchemy.engine.url import make_url
@@ -0,0 +1,123 @@
+"""partition ledger entries by month
+
+Revision ID: a8b6c7d9e0f1
+Revises: f7a5b6c8d9e0
+Create Date: 2026-10-18 16:20:54.117603
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b6c7d9e0f1'
+down_revision: Union[str, None] = 'f7a5b6c8d9e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rebuild ledger_entries as a table partitioned by month on created_on. The
+    # id sequence is detached first so that dropping the old table keeps it.
+    op.execute("ALTER SEQUENCE ledger_entries_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE ledger_entries RENAME TO ledger_entries_legacy")
+    op.execute("ALTER TABLE ledger_entries_legacy RENAME CONSTRAINT ledger_entries_pkey TO ledger_entries_legacy_pkey")
+    op.drop_index('idx_owner_id_created_on_id', table_name='ledger_entries_legacy')
+    op.drop_index('idx_owner_id_id', table_name='ledger_entries_legacy')
+    op.execute(
+        """
+        CREATE TABLE ledger_entries (
+            id INTEGER NOT NULL DEFAULT nextval('ledger_entries_id_seq'),
+            operation VARCHAR NOT NULL,
+            amount INTEGER NOT NULL,
+            nonce VARCHAR NOT NULL,
+            owner_id VARCHAR NOT NULL,
+            created_on TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT ledger_entries_pkey PRIMARY KEY (id, created_on)
+        ) PARTITION BY RANGE (created_on)
+        """
+    )
+    op.execute("ALTER SEQUENCE ledger_entries_id_seq OWNED BY ledger_entries.id")
+    op.execute("CREATE TABLE ledger_entries_default PARTITION OF ledger_entries DEFAULT")
+    # One partition per month from the oldest entry through three months ahead.
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            m DATE;
+        BEGIN
+            FOR m IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE(
+                        (SELECT MIN(created_on) FROM ledger_entries_legacy),
+                        now() AT TIME ZONE 'utc')),
+                    date_trunc('month', now() AT TIME ZONE 'utc') + interval '3 months',
+                    interval '1 month')::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF ledger_entries FOR VALUES FROM (%L) TO (%L)',
+                    'ledger_entries_' || to_char(m, 'YYYY_MM'),
+                    m,
+                    (m + interval '1 month')::date);
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO ledger_entries (id, operation, amount, nonce, owner_id, created_on)
+        SELECT id, operation, amount, nonce, owner_id, created_on
+        FROM ledger_entries_legacy
+        """
+    )
+    op.create_table('ledger_nonces',
+    sa.Column('nonce', sa.String(), nullable=False),
+    sa.Column('created_on', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('nonce')
+    )
+    op.execute(
+        """
+        INSERT INTO ledger_nonces (nonce, created_on)
+        SELECT nonce, created_on FROM ledger_entries_legacy
+        """
+    )
+    op.drop_table('ledger_entries_legacy')
+    op.create_index('idx_owner_id_created_on_id', 'ledger_entries', ['owner_id', 'created_on', 'id'], unique=False, postgresql_include=['operation', 'amount', 'nonce'])
+    op.create_index('idx_owner_id_id', 'ledger_entries', ['owner_id', 'id'], unique=False, postgresql_include=['amount'])
+
+
+def downgrade() -> None:
+    # Partitions that were detached for archiving are not brought back.
+    op.execute("ALTER SEQUENCE ledger_entries_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE ledger_entries RENAME TO ledger_entries_partitioned")
+    op.execute("ALTER TABLE ledger_entries_partitioned RENAME CONSTRAINT ledger_entries_pkey TO ledger_entries_partitioned_pkey")
+    op.drop_index('idx_owner_id_created_on_id', table_name='ledger_entries_partitioned')
+    op.drop_index('idx_owner_id_id', table_name='ledger_entries_partitioned')
+    op.execute(
+        """
+        CREATE TABLE ledger_entries (
+            id INTEGER NOT NULL DEFAULT nextval('ledger_entries_id_seq'),
+            operation VARCHAR NOT NULL,
+            amount INTEGER NOT NULL,
+            nonce VARCHAR NOT NULL,
+            owner_id VARCHAR NOT NULL,
+            created_on TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT ledger_entries_pkey PRIMARY KEY (id),
+            CONSTRAINT ledger_entries_nonce_key UNIQUE (nonce)
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE ledger_entries_id_seq OWNED BY ledger_entries.id")
+    op.execute(
+        """
+        INSERT INTO ledger_entries (id, operation, amount, nonce, owner_id, created_on)
+        SELECT id, operation, amount, nonce, owner_id, created_on
+        FROM ledger_entries_partitioned
+        """
+    )
+    op.drop_table('ledger_entries_partitioned')
+    op.drop_table('ledger_nonces')
+    op.create_index('idx_owner_id_created_on_id', 'ledger_entries', ['owner_id', 'created_on', 'id'], unique=False, postgresql_include=['operation', 'amount', 'nonce'])
+    op.create_index('idx_owner_id_id', 'ledger_entries', ['owner_id', 'id'], unique=False, postgresql_include=['amount'])
@@ -0,0 +1,40 @@
+"""create ledger balances table
+
+Revision ID: b3f1c2d4e5a6
+Revises: 697a7b30c8b3
+Create Date: 2026-10-18 09:12:41.530117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c2d4e5a6'
+down_revision: Union[str, None] = '697a7b30c8b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ledger_balances',
+    sa.Column('owner_id', sa.String(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=False),
+    sa.Column('updated_on', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    # Backfill from the existing history so reads are correct right after upgrade.
+    op.execute(
+        """
+        INSERT INTO ledger_balances (owner_id, balance, updated_on)
+        SELECT owner_id, SUM(amount), (now() AT TIME ZONE 'utc')
+        FROM ledger_entries
+        GROUP BY owner_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ledger_balances')
@@ -0,0 +1,79 @@
+"""track entry transaction ids for checkpoints
+
+Revision ID: c0d8e9f1a2b3
+Revises: b9c7d8e0f1a2
+Create Date: 2026-10-19 09:12:40.553127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0d8e9f1a2b3'
+down_revision: Union[str, None] = 'b9c7d8e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Checkpoints move from id order to transaction order. Existing entries
+    # get txid 0 when their owner's checkpoint covers them and 1 otherwise,
+    # and the checkpoints and watermark are set to 1, below any real
+    # transaction id.
+    op.add_column('ledger_entries', sa.Column('txid', sa.BigInteger(), nullable=True))
+    op.execute(
+        """
+        UPDATE ledger_entries e SET txid = CASE
+            WHEN e.id <= COALESCE(
+                (SELECT c.up_to_id FROM ledger_checkpoints c WHERE c.owner_id = e.owner_id), 0)
+            THEN 0 ELSE 1 END
+        """
+    )
+    op.alter_column('ledger_entries', 'txid', nullable=False, server_default=sa.text('pg_current_xact_id()::text::bigint'))
+    op.drop_index('idx_owner_id_id', table_name='ledger_entries')
+    op.create_index('idx_owner_id_txid', 'ledger_entries', ['owner_id', 'txid'], unique=False, postgresql_include=['amount'])
+    op.create_index('idx_txid', 'ledger_entries', ['txid'], unique=False)
+
+    op.add_column('ledger_checkpoints', sa.Column('up_to_txid', sa.BigInteger(), nullable=True))
+    op.execute("UPDATE ledger_checkpoints SET up_to_txid = 1")
+    op.alter_column('ledger_checkpoints', 'up_to_txid', nullable=False)
+    op.drop_index('idx_up_to_id', table_name='ledger_checkpoints')
+    op.drop_column('ledger_checkpoints', 'up_to_id')
+
+    op.create_table('ledger_checkpoint_watermark',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('up_to_txid', sa.BigInteger(), nullable=False),
+    sa.Column('updated_on', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        """
+        INSERT INTO ledger_checkpoint_watermark (id, up_to_txid, updated_on)
+        SELECT 1, 1, now() AT TIME ZONE 'utc'
+        WHERE EXISTS (SELECT 1 FROM ledger_checkpoints)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ledger_checkpoint_watermark')
+
+    op.add_column('ledger_checkpoints', sa.Column('up_to_id', sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE ledger_checkpoints c SET up_to_id = COALESCE(
+            (SELECT MAX(e.id) FROM ledger_entries e
+             WHERE e.owner_id = c.owner_id AND e.txid < c.up_to_txid), 0)
+        """
+    )
+    op.alter_column('ledger_checkpoints', 'up_to_id', nullable=False)
+    op.create_index('idx_up_to_id', 'ledger_checkpoints', ['up_to_id'], unique=False)
+    op.drop_column('ledger_checkpoints', 'up_to_txid')
+
+    op.drop_index('idx_txid', table_name='ledger_entries')
+    op.drop_index('idx_owner_id_txid', table_name='ledger_entries')
+    op.create_index('idx_owner_id_id', 'ledger_entries', ['owner_id', 'id'], unique=False, postgresql_include=['amount'])
+    op.drop_column('ledger_entries', 'txid')
@@ -0,0 +1,27 @@
+"""drop redundant nonce index
+
+Revision ID: c4d2e3f5a6b7
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-18 10:04:17.882410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e3f5a6b7'
+down_revision: Union[str, None] = 'b3f1c2d4e5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The unique constraint on nonce already provides an index.
+    op.drop_index('idx_nonce', table_name='ledger_entries')
+
+
+def downgrade() -> None:
+    op.create_index('idx_nonce', 'ledger_entries', ['nonce'], unique=False)
@@ -0,0 +1,46 @@
+"""scope nonces to owner
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d8e9f1a2b3
+Create Date: 2026-10-19 14:27:05.318642
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e2f3a4b5c6'
+down_revision: Union[str, None] = 'c0d8e9f1a2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nonces whose entries were archived with their partition have no owner
+    # left to find; they get an empty owner_id and no longer block anything.
+    op.add_column('ledger_nonces', sa.Column('owner_id', sa.String(), nullable=True))
+    op.execute(
+        """
+        UPDATE ledger_nonces n SET owner_id = e.owner_id
+        FROM ledger_entries e WHERE e.nonce = n.nonce
+        """
+    )
+    op.execute("UPDATE ledger_nonces SET owner_id = '' WHERE owner_id IS NULL")
+    op.alter_column('ledger_nonces', 'owner_id', nullable=False)
+    op.drop_constraint('ledger_nonces_pkey', 'ledger_nonces', type_='primary')
+    op.create_primary_key('ledger_nonces_pkey', 'ledger_nonces', ['owner_id', 'nonce'])
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM ledger_nonces a USING ledger_nonces b
+        WHERE a.nonce = b.nonce AND a.owner_id > b.owner_id
+        """
+    )
+    op.drop_constraint('ledger_nonces_pkey', 'ledger_nonces', type_='primary')
+    op.create_primary_key('ledger_nonces_pkey', 'ledger_nonces', ['nonce'])
+    op.drop_column('ledger_nonces', 'owner_id')
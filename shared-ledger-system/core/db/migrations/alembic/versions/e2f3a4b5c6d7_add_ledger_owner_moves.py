@@ -0,0 +1,31 @@
+"""add ledger owner moves
+
+Revision ID: e2f3a4b5c6d7
+Revises: d1e2f3a4b5c6
+Create Date: 2026-10-19 16:03:51.902417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f3a4b5c6d7'
+down_revision: Union[str, None] = 'd1e2f3a4b5c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ledger_owner_moves',
+    sa.Column('owner_id', sa.String(), nullable=False),
+    sa.Column('shard', sa.String(), nullable=False),
+    sa.Column('moved_on', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ledger_owner_moves')
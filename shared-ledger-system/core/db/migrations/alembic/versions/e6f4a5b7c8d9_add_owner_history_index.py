@@ -0,0 +1,29 @@
+"""add owner history index
+
+Revision ID: e6f4a5b7c8d9
+Revises: d5e3f4a6b7c8
+Create Date: 2026-10-18 14:12:41.508317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f4a5b7c8d9'
+down_revision: Union[str, None] = 'd5e3f4a6b7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_owner_id_created_on_id', 'ledger_entries', ['owner_id', 'created_on', 'id'], unique=False, postgresql_include=['operation', 'amount', 'nonce'])
+    # owner_id is the leading column of the new index.
+    op.drop_index('idx_owner_id', table_name='ledger_entries')
+
+
+def downgrade() -> None:
+    op.create_index('idx_owner_id', 'ledger_entries', ['owner_id'], unique=False)
+    op.drop_index('idx_owner_id_created_on_id', table_name='ledger_entries')
@@ -0,0 +1,36 @@
+"""create ledger checkpoints table
+
+Revision ID: f7a5b6c8d9e0
+Revises: e6f4a5b7c8d9
+Create Date: 2026-10-18 15:03:27.941208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a5b6c8d9e0'
+down_revision: Union[str, None] = 'e6f4a5b7c8d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ledger_checkpoints',
+    sa.Column('owner_id', sa.String(), nullable=False),
+    sa.Column('up_to_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=False),
+    sa.Column('updated_on', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    op.create_index('idx_up_to_id', 'ledger_checkpoints', ['up_to_id'], unique=False)
+    op.create_index('idx_owner_id_id', 'ledger_entries', ['owner_id', 'id'], unique=False, postgresql_include=['amount'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_owner_id_id', table_name='ledger_entries')
+    op.drop_index('idx_up_to_id', table_name='ledger_checkpoints')
+    op.drop_table('ledger_checkpoints')
@@ -27,7 +27,7 @@ config = context.config
 
 
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 import psycopg2
 from sqlalchemy.engine.url import make_url
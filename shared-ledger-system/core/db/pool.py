@@ -0,0 +1,59 @@
+# core/db/pool.py
+import asyncio
+import time
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from core.monitoring.prometheus import metrics
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    # Reports under its database label. Usage is recorded by the pool itself
+    # rather than by event listeners holding on to it, since engine.dispose()
+    # swaps in a new pool through recreate().
+    database = "default"
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        pool.database = self.database
+        return pool
+
+    # _do_get is where QueuePool waits for a free connection (or opens an
+    # overflow one), so timing it gives the checkout latency callers see.
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.db_pool_checkout_seconds.labels(database=self.database).observe(
+                time.perf_counter() - start_time
+            )
+            self._record_usage()
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._record_usage()
+
+    def _record_usage(self) -> None:
+        metrics.db_pool_connections_in_use.labels(database=self.database).set(
+            self.checkedout()
+        )
+        metrics.db_pool_overflow.labels(database=self.database).set(
+            max(self.overflow(), 0)
+        )
+
+
+def instrument_pool(engine: AsyncEngine, database: str) -> None:
+    pool = engine.sync_engine.pool
+    pool.database = database
+    metrics.db_pool_size.labels(database=database).set(pool.size())
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    # Hold all connections at once; opening them one after another would just
+    # reuse the first.
+    opened = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in opened))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in opened))
@@ -0,0 +1,174 @@
+# core/db/replicas.py
+import asyncio
+import itertools
+import math
+import time
+from typing import Dict, List
+from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from core.cache.cache import cache
+from core.config import core_settings
+from core.logging.logger import logger
+from core.monitoring.prometheus import metrics
+from .base import DEFAULT_DATABASE, AsyncSessionLocal, build_engine
+
+# Seconds behind the primary. A replica that has replayed all WAL it received
+# reports 0, since an idle primary sends nothing new and the last replay time
+# would otherwise keep growing. NULL when the server is not a standby.
+REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaSet:
+    # Chooses where a read goes. Lag and latency of every replica are measured
+    # at most once per check_interval, by the first read that finds them stale;
+    # replicas lagging more than max_lag_seconds or failing the check are
+    # skipped, and reads go to the primary when none is left.
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replicas: Dict[str, sessionmaker],
+        strategy: str = "round_robin",
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 1.0,
+        check_timeout: float = 0.5,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.lag: Dict[str, float] = {}
+        self.latency: Dict[str, float] = {}
+        self._checked_at = -math.inf
+        self._lock = asyncio.Lock()
+        self._turn = itertools.count()
+
+    async def session_factory(self, primary: bool = False) -> sessionmaker:
+        if primary or not self.replicas:
+            metrics.db_read_count.labels(target="primary").inc()
+            return self.primary
+        await self._refresh()
+        healthy = [
+            name
+            for name in self.replicas
+            if self.lag.get(name, math.inf) <= self.max_lag_seconds
+        ]
+        if not healthy:
+            metrics.db_read_count.labels(target="primary").inc()
+            return self.primary
+        if self.strategy == "least_latency":
+            name = min(healthy, key=lambda replica: self.latency[replica])
+        else:
+            name = healthy[next(self._turn) % len(healthy)]
+        metrics.db_read_count.labels(target="replica").inc()
+        return self.replicas[name]
+
+    async def _refresh(self) -> None:
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        async with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return
+            await asyncio.gather(
+                *(self._check(name, factory) for name, factory in self.replicas.items())
+            )
+            self._checked_at = time.monotonic()
+
+    async def _check(self, name: str, factory: sessionmaker) -> None:
+        start_time = time.perf_counter()
+        try:
+            async with factory() as session:
+                lag = await asyncio.wait_for(
+                    session.scalar(REPLICA_LAG), self.check_timeout
+                )
+        except Exception as e:
+            logger.logger.warning(f"Replica {name} failed its lag check: {e!r}")
+            self.lag[name] = math.inf
+            return
+        latency = time.perf_counter() - start_time
+        self.lag[name] = float(lag or 0)
+        # Smoothed, so a single slow probe does not flip the choice.
+        previous = self.latency.get(name, latency)
+        self.latency[name] = 0.8 * previous + 0.2 * latency
+        metrics.db_replica_lag_seconds.labels(replica=name).set(self.lag[name])
+
+    async def dispose(self) -> None:
+        for factory in self.replicas.values():
+            await factory.kw["bind"].dispose()
+
+
+def create_replica_set(primary: sessionmaker, name: str, urls: List[str]) -> ReplicaSet:
+    settings = core_settings.database
+    return ReplicaSet(
+        primary,
+        {
+            f"{name}_{index}": sessionmaker(
+                bind=build_engine(url, f"{name}_{index}"),
+                expire_on_commit=False,
+                class_=AsyncSession,
+            )
+            for index, url in enumerate(urls)
+        },
+        strategy=settings.database_replica_strategy,
+        max_lag_seconds=settings.database_replica_max_lag_seconds,
+        check_interval=settings.database_replica_check_interval,
+        check_timeout=settings.database_replica_check_timeout,
+    )
+
+
+class WriteTracker:
+    # Read-your-writes: remembers in Redis who wrote within the last
+    # window_seconds, so their reads skip replicas that may not have the
+    # write yet. Shared through Redis because the next request of a client
+    # may reach another worker.
+    def __init__(self, redis: aioredis.Redis, window_seconds: float):
+        self.redis = redis
+        self.window_seconds = window_seconds
+
+    def use_client(self, redis: aioredis.Redis) -> None:
+        self.redis = redis
+
+    async def mark(self, client_id) -> None:
+        if self.window_seconds > 0:
+            await self.redis.set(
+                f"wrote:{client_id}", 1, px=int(self.window_seconds * 1000)
+            )
+
+    async def queue_mark(self, pipe: Pipeline, client_id) -> None:
+        if self.window_seconds > 0:
+            pipe.set(f"wrote:{client_id}", 1, px=int(self.window_seconds * 1000))
+
+    async def wrote_recently(self, client_id) -> bool:
+        if self.window_seconds <= 0:
+            return False
+        return bool(await self.redis.exists(f"wrote:{client_id}"))
+
+
+# Replicas of DATABASE_URL, which holds the users (and the ledger when there
+# are no shards) and is named "default" in DATABASE_REPLICAS.
+database_replica_set = create_replica_set(
+    AsyncSessionLocal,
+    DEFAULT_DATABASE,
+    core_settings.database.database_replicas.get(DEFAULT_DATABASE, []),
+)
+write_tracker = WriteTracker(
+    cache.redis, core_settings.database.database_read_your_writes_seconds
+)
+
+
+async def get_read_session() -> AsyncSession:
+    # Like get_session, for requests that only read.
+    session_factory = await database_replica_set.session_factory()
+    async with session_factory() as session:
+        yield session
+
+
+def get_write_tracker() -> WriteTracker:
+    return write_tracker
@@ -0,0 +1,180 @@
+# core/db/shards.py
+import asyncio
+import bisect
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from core.config import core_settings
+from .base import AsyncSessionLocal, build_engine
+from .replicas import (
+    DEFAULT_DATABASE,
+    ReplicaSet,
+    create_replica_set,
+    database_replica_set,
+)
+
+DEFAULT_SHARD = DEFAULT_DATABASE
+
+
+def ring_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    # Each node owns `vnodes` points on the ring and a key belongs to the first
+    # point at or after its hash, so adding a node only moves about 1/N of keys.
+    def __init__(self, nodes: Iterable[str], vnodes: int = 64):
+        points = sorted(
+            (ring_hash(f"{node}#{i}"), node) for node in nodes for i in range(vnodes)
+        )
+        if not points:
+            raise ValueError("A hash ring needs at least one node")
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        index = bisect.bisect_left(self._hashes, ring_hash(key))
+        return self._nodes[index % len(self._nodes)]
+
+
+class ShardRouter:
+    def __init__(
+        self,
+        session_factories: Dict[str, sessionmaker],
+        vnodes: int = 64,
+        replica_sets: Optional[Dict[str, ReplicaSet]] = None,
+    ):
+        self.session_factories = session_factories
+        self.ring = HashRing(session_factories, vnodes)
+        self.replica_sets = {
+            shard: ReplicaSet(session_factory, {})
+            for shard, session_factory in session_factories.items()
+        }
+        self.replica_sets.update(replica_sets or {})
+
+    @property
+    def has_replicas(self) -> bool:
+        return any(replicas.replicas for replicas in self.replica_sets.values())
+
+    @property
+    def shards(self) -> List[str]:
+        return list(self.session_factories)
+
+    def shard_for(self, owner_id: str) -> str:
+        return self.ring.node_for(owner_id)
+
+    def session_factory(self, owner_id: str) -> sessionmaker:
+        return self.session_factories[self.shard_for(owner_id)]
+
+    def session(self, owner_id: str) -> AsyncSession:
+        return self.session_factory(owner_id)()
+
+    async def read_session_factory(
+        self, owner_id: str, primary: bool = False
+    ) -> sessionmaker:
+        # A replica of the owner's shard, or the shard itself with primary=True.
+        return await self.replica_sets[self.shard_for(owner_id)].session_factory(
+            primary
+        )
+
+    async def read_session_factories(self, primary: bool = False) -> List[sessionmaker]:
+        return [
+            await self.replica_sets[shard].session_factory(primary)
+            for shard in self.session_factories
+        ]
+
+    def group_by_shard(self, owner_ids: Iterable[str]) -> Dict[str, List[str]]:
+        groups: Dict[str, List[str]] = {}
+        for owner_id in owner_ids:
+            groups.setdefault(self.shard_for(owner_id), []).append(owner_id)
+        return groups
+
+    async def fan_out(
+        self,
+        owner_ids: Iterable[str],
+        call: Callable[[AsyncSession, List[str]], Awaitable[Dict[str, Any]]],
+        read_only: bool = False,
+        primary: bool = False,
+    ) -> Dict[str, Any]:
+        # Runs call(session, owner_ids_on_that_shard) on every shard concurrently,
+        # each in its own session, and merges the per-owner results. Read-only
+        # calls may run on replicas.
+        async def run(shard: str, shard_owner_ids: List[str]) -> Dict[str, Any]:
+            if read_only:
+                session_factory = await self.replica_sets[shard].session_factory(
+                    primary
+                )
+            else:
+                session_factory = self.session_factories[shard]
+            async with session_factory() as session:
+                return await call(session, shard_owner_ids)
+
+        results = await asyncio.gather(
+            *(
+                run(shard, shard_owner_ids)
+                for shard, shard_owner_ids in self.group_by_shard(owner_ids).items()
+            )
+        )
+        merged: Dict[str, Any] = {}
+        for result in results:
+            merged.update(result)
+        return merged
+
+    async def dispose(self) -> None:
+        for factory in self.session_factories.values():
+            await factory.kw["bind"].dispose()
+        for replicas in self.replica_sets.values():
+            await replicas.dispose()
+
+
+def create_session_factories(shard_urls: Dict[str, str]) -> Dict[str, sessionmaker]:
+    if not shard_urls:
+        return {DEFAULT_SHARD: AsyncSessionLocal}
+    return {
+        name: sessionmaker(
+            bind=build_engine(url, name), expire_on_commit=False, class_=AsyncSession
+        )
+        for name, url in shard_urls.items()
+    }
+
+
+def create_replica_sets(
+    session_factories: Dict[str, sessionmaker], replica_urls: Dict[str, List[str]]
+) -> Dict[str, ReplicaSet]:
+    replica_sets = {}
+    for shard, session_factory in session_factories.items():
+        if session_factory is AsyncSessionLocal:
+            replica_sets[shard] = database_replica_set
+        elif replica_urls.get(shard):
+            replica_sets[shard] = create_replica_set(
+                session_factory, shard, replica_urls[shard]
+            )
+    return replica_sets
+
+
+def create_shard_router() -> ShardRouter:
+    settings = core_settings.database
+    session_factories = create_session_factories(settings.database_shards)
+    return ShardRouter(
+        session_factories,
+        vnodes=settings.database_shard_vnodes,
+        replica_sets=create_replica_sets(session_factories, settings.database_replicas),
+    )
+
+
+shard_router = create_shard_router()
+
+
+def get_shard_router() -> ShardRouter:
+    return shard_router
+
+
+async def get_owner_session(
+    owner_id: str, router: ShardRouter = Depends(get_shard_router)
+) -> AsyncSession:
+    # Like get_session, but on the shard holding owner_id, which FastAPI takes
+    # from the path of the route using it.
+    async with router.session(owner_id) as session:
+        yield session
@@ -0,0 +1,75 @@
+# core/ledgers/checkpoints.py
+import asyncio
+from typing import Callable, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db.shards import shard_router
+from core.config import core_settings
+from core.logging.logger import logger
+from .service import LedgerService
+
+
+# Advances ledger_checkpoints every interval_seconds. Each worker may run one;
+# an advisory lock in compact_checkpoints lets only one of them do the work.
+class CheckpointCompactor:
+    def __init__(
+        self,
+        ledger_service: LedgerService,
+        session_factory: Callable[[], AsyncSession],
+        interval_seconds: float = 60.0,
+        max_entries: int = 100000,
+    ):
+        self.ledger_service = ledger_service
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.max_entries = max_entries
+        self._worker: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        # Repeats until caught up, about max_entries entries per transaction,
+        # and returns how many entries were folded. A short chunk means the
+        # watermark reached the oldest running transaction.
+        total = 0
+        while True:
+            async with self.session_factory() as session:
+                folded = await self.ledger_service.compact_checkpoints(
+                    session, self.max_entries
+                )
+            total += folded
+            if folded < self.max_entries:
+                return total
+
+    async def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                folded = await self.run_once()
+                if folded:
+                    logger.logger.info(
+                        f"Folded {folded} ledger entries into checkpoints"
+                    )
+            except Exception as e:
+                logger.logger.warning(f"Checkpoint compaction failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+checkpoint_compactors: Dict[str, CheckpointCompactor] = {
+    shard: CheckpointCompactor(
+        LedgerService(core_settings.ledger.operation_config),
+        session_factory,
+        interval_seconds=core_settings.ledger.checkpoint_interval_seconds,
+        max_entries=core_settings.ledger.checkpoint_max_entries,
+    )
+    for shard, session_factory in shard_router.session_factories.items()
+}
@@ -0,0 +1,232 @@
+# core/ledgers/cli.py
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+from core.db.base import async_engine
+from core.db.shards import ShardRouter, create_session_factories, shard_router
+from core.cache.cache import cache
+from core.config import core_settings
+from .service import LedgerService
+from .export import EXPORT_FORMATS, export_entries
+from .checkpoints import CheckpointCompactor
+from .outbox import outbox_relays
+from .partitions import detach_partitions, ensure_partitions
+from .resharding import reshard
+
+
+def shard_label(shard: str) -> str:
+    return f"[{shard}] " if len(shard_router.shards) > 1 else ""
+
+
+async def verify_balances(repair: bool = False) -> int:
+    ledger_service = LedgerService(core_settings.ledger.operation_config)
+    drift = []
+    for session_factory in shard_router.session_factories.values():
+        async with session_factory() as session:
+            if repair:
+                drift.extend(await ledger_service.repair_balances(session))
+            else:
+                drift.extend(await ledger_service.find_balance_drift(session))
+
+    for item in drift:
+        print(
+            f"{item.owner_id}: stored={item.stored_balance} "
+            f"computed={item.computed_balance} "
+            f"drift={item.stored_balance - item.computed_balance}"
+        )
+    status = "repaired" if repair else "found"
+    print(f"{len(drift)} drifted balance(s) {status}.")
+    return 1 if drift and not repair else 0
+
+
+async def export_ledger_entries(args: argparse.Namespace) -> int:
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    if args.owner_id is not None:
+        session_factories = [shard_router.session_factory(args.owner_id)]
+    else:
+        session_factories = list(shard_router.session_factories.values())
+    try:
+        for index, session_factory in enumerate(session_factories):
+            async with session_factory() as session:
+                async for chunk in export_entries(
+                    session,
+                    args.format,
+                    owner_id=args.owner_id,
+                    day=args.day,
+                    batch_size=core_settings.ledger.export_batch_size,
+                    header=index == 0,
+                ):
+                    output.write(chunk)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+async def compact_checkpoints() -> int:
+    for shard, session_factory in shard_router.session_factories.items():
+        compactor = CheckpointCompactor(
+            LedgerService(core_settings.ledger.operation_config),
+            session_factory,
+            max_entries=core_settings.ledger.checkpoint_max_entries,
+        )
+        folded = await compactor.run_once()
+        if folded:
+            print(f"{shard_label(shard)}Folded {folded} entries into checkpoints.")
+        else:
+            print(f"{shard_label(shard)}Checkpoints are up to date.")
+    return 0
+
+
+async def maintain_partitions(args: argparse.Namespace) -> int:
+    for shard, session_factory in shard_router.session_factories.items():
+        async with session_factory() as session:
+            for name in await ensure_partitions(session, args.months_ahead):
+                print(f"{shard_label(shard)}Created partition {name}.")
+            if args.retain_months is not None:
+                for name in await detach_partitions(
+                    session, args.retain_months, args.archive_schema
+                ):
+                    print(f"{shard_label(shard)}Detached partition {name}.")
+    return 0
+
+
+async def relay_outbox(args: argparse.Namespace) -> int:
+    try:
+        while True:
+            for shard, relay in outbox_relays.items():
+                published = await relay.run_once()
+                if args.once or published:
+                    print(f"{shard_label(shard)}Published {published} change(s).")
+            if args.once:
+                return 0
+            await asyncio.sleep(core_settings.ledger.outbox_poll_interval_seconds)
+    finally:
+        await cache.redis.aclose()
+
+
+async def reshard_owners(args: argparse.Namespace) -> int:
+    target = ShardRouter(
+        create_session_factories(json.loads(args.shards)),
+        vnodes=core_settings.database.database_shard_vnodes,
+    )
+    try:
+        moves = await reshard(shard_router, target, dry_run=args.dry_run)
+    finally:
+        await target.dispose()
+    for owner_id, move in moves.items():
+        print(f"{owner_id}: {move}")
+    status = "to move" if args.dry_run else "moved"
+    print(f"{len(moves)} owner(s) {status}.")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m core.ledgers.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    verify_parser = subparsers.add_parser(
+        "verify-balances",
+        help="Recompute balances from ledger_entries and report drift.",
+    )
+    verify_parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Overwrite drifted rows in ledger_balances with the recomputed sums.",
+    )
+
+    export_parser = subparsers.add_parser(
+        "export-entries",
+        help="Stream ledger entries as NDJSON or CSV.",
+    )
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    export_parser.add_argument("--owner-id", help="Only export this owner's entries.")
+    export_parser.add_argument(
+        "--day",
+        type=date.fromisoformat,
+        help="Only export entries created on this UTC day (YYYY-MM-DD).",
+    )
+    export_parser.add_argument("--output", help="Write to this file, not stdout.")
+
+    subparsers.add_parser(
+        "compact-checkpoints",
+        help="Fold committed ledger entries into ledger_checkpoints.",
+    )
+
+    partitions_parser = subparsers.add_parser(
+        "maintain-partitions",
+        help="Create upcoming monthly partitions and detach expired ones.",
+    )
+    partitions_parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=core_settings.ledger.partition_months_ahead,
+    )
+    partitions_parser.add_argument(
+        "--retain-months",
+        type=int,
+        default=core_settings.ledger.partition_retain_months,
+        help="Detach partitions that ended more than this many months ago.",
+    )
+    partitions_parser.add_argument(
+        "--archive-schema",
+        default=core_settings.ledger.partition_archive_schema,
+        help="Move detached partitions into this schema.",
+    )
+
+    relay_parser = subparsers.add_parser(
+        "relay-outbox",
+        help="Publish ledger_outbox rows to the change feed stream.",
+    )
+    relay_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Drain the outbox once and exit instead of polling.",
+    )
+
+    reshard_parser = subparsers.add_parser(
+        "reshard",
+        help="Move owners from the configured shards to a new shard layout.",
+    )
+    reshard_parser.add_argument(
+        "--shards",
+        required=True,
+        help="New layout as a JSON object of shard name to database URL.",
+    )
+    reshard_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only list the owners that would move.",
+    )
+    return parser
+
+
+async def run(args: argparse.Namespace) -> int:
+    try:
+        if args.command == "verify-balances":
+            return await verify_balances(repair=args.repair)
+        if args.command == "export-entries":
+            return await export_ledger_entries(args)
+        if args.command == "compact-checkpoints":
+            return await compact_checkpoints()
+        if args.command == "maintain-partitions":
+            return await maintain_partitions(args)
+        if args.command == "relay-outbox":
+            return await relay_outbox(args)
+        if args.command == "reshard":
+            return await reshard_owners(args)
+        return 2
+    finally:
+        await shard_router.dispose()
+        await async_engine.dispose()
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 # core/ledgers/exceptions.py
+from typing import Optional
+
+
 class LedgerError(Exception):
     def __init__(self, message: str = "A ledger error occurred."):
         super().__init__(message)
@@ -17,3 +20,31 @@ class DuplicateTransactionError(LedgerError):
     def __init__(self, nonce: str):
         message = f"Transaction with nonce '{nonce}' already exists."
         super().__init__(message)
+
+
+class InvalidCursorError(LedgerError):
+    def __init__(self, cursor: str):
+        message = f"Invalid pagination cursor '{cursor}'."
+        super().__init__(message)
+
+
+class CrossShardBatchError(LedgerError):
+    def __init__(self, shards: list):
+        message = f"An atomic batch must only touch owners on one shard, got {shards}."
+        super().__init__(message)
+
+
+class InvalidOffsetError(LedgerError):
+    def __init__(self, offset: str):
+        message = f"Invalid change feed offset '{offset}'."
+        super().__init__(message)
+
+
+class OwnerMovedError(LedgerError):
+    def __init__(self, owner_id: str, shard: Optional[str] = None):
+        target = f"shard '{shard}'" if shard else "another shard"
+        message = (
+            f"Owner '{owner_id}' has moved to {target}; "
+            "retry once the new shard layout is deployed."
+        )
+        super().__init__(message)
@@ -0,0 +1,92 @@
+# core/ledgers/export.py
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import LedgerEntry
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_COLUMNS = (
+    LedgerEntry.id,
+    LedgerEntry.operation,
+    LedgerEntry.amount,
+    LedgerEntry.owner_id,
+    LedgerEntry.nonce,
+    LedgerEntry.created_on,
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+
+async def stream_entry_rows(
+    session: AsyncSession,
+    owner_id: Optional[str] = None,
+    day: Optional[date] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence[tuple]]:
+    # session.stream runs the query on a server-side cursor and yield_per caps
+    # how many rows are buffered, so only one batch is in memory at a time.
+    # Plain columns are selected to get tuples instead of ORM objects.
+    query = select(*EXPORT_COLUMNS).order_by(LedgerEntry.id)
+    if owner_id is not None:
+        query = query.where(LedgerEntry.owner_id == owner_id)
+    if day is not None:
+        start = datetime.combine(day, time.min)
+        query = query.where(
+            LedgerEntry.created_on >= start,
+            LedgerEntry.created_on < start + timedelta(days=1),
+        )
+
+    result = await session.stream(query.execution_options(yield_per=batch_size))
+    async for rows in result.partitions(batch_size):
+        yield rows
+
+
+def to_ndjson(rows: Sequence[tuple]) -> str:
+    return "".join(
+        json.dumps(
+            {
+                "id": entry_id,
+                "operation": operation,
+                "amount": amount,
+                "owner_id": owner_id,
+                "nonce": nonce,
+                "created_on": created_on.isoformat(),
+            }
+        )
+        + "\n"
+        for entry_id, operation, amount, owner_id, nonce, created_on in rows
+    )
+
+
+def to_csv(rows: Sequence[tuple], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(
+        (entry_id, operation, amount, owner_id, nonce, created_on.isoformat())
+        for entry_id, operation, amount, owner_id, nonce, created_on in rows
+    )
+    return buffer.getvalue()
+
+
+async def export_entries(
+    session: AsyncSession,
+    export_format: str,
+    owner_id: Optional[str] = None,
+    day: Optional[date] = None,
+    batch_size: int = 1000,
+    header: bool = True,
+) -> AsyncIterator[str]:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {export_format}")
+    if export_format == "csv" and header:
+        # The header goes out even when nothing matches.
+        yield to_csv([], header=True)
+
+    async for rows in stream_entry_rows(session, owner_id, day, batch_size):
+        yield to_ndjson(rows) if export_format == "ndjson" else to_csv(rows)
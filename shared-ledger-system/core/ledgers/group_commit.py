@@ -0,0 +1,142 @@
+# core/ledgers/group_commit.py
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db.shards import shard_router
+from core.config import core_settings
+from .service import LedgerService
+from .schemas import LedgerEntryCreate, LedgerBatchItemResult
+from .exceptions import (
+    InsufficientBalanceError,
+    DuplicateTransactionError,
+    OwnerMovedError,
+)
+
+PendingWrite = Tuple[LedgerEntryCreate, asyncio.Future]
+
+
+# Entries submitted within max_delay_ms of the first pending one (or until
+# max_batch_size are waiting) are written in one transaction through
+# LedgerService.create_entries; each caller still gets its own outcome.
+class GroupCommitWriter:
+    def __init__(
+        self,
+        ledger_service: LedgerService,
+        session_factory: Callable[[], AsyncSession],
+        max_batch_size: int = 500,
+        max_delay_ms: float = 2.0,
+    ):
+        self.ledger_service = ledger_service
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[PendingWrite] = []
+        self._has_pending: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def submit(self, entry: LedgerEntryCreate) -> LedgerBatchItemResult:
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((entry, future))
+        self._has_pending.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is None:
+            return
+        self._closing = True
+        self._has_pending.set()
+        self._batch_full.set()
+        await self._worker
+        self._worker = None
+        self._closing = False
+
+    def _ensure_started(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            return
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        if self._pending:
+            self._has_pending.set()
+        self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            if not self._pending:
+                return
+            if (
+                len(self._pending) < self.max_batch_size
+                and self.max_delay > 0
+                and not self._closing
+            ):
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            await self._flush(self._take_batch())
+            if self._closing and not self._pending:
+                return
+
+    def _take_batch(self) -> List[PendingWrite]:
+        batch = self._pending[: self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size :]
+        if not self._pending:
+            self._has_pending.clear()
+        if len(self._pending) < self.max_batch_size:
+            self._batch_full.clear()
+        return batch
+
+    async def _flush(self, batch: List[PendingWrite]) -> None:
+        # Callers that gave up still hold a slot in the batch; their entries are
+        # written anyway, exactly as if the request had been cancelled mid-commit.
+        try:
+            async with self.session_factory() as session:
+                results = await self.ledger_service.create_entries(
+                    session, [entry for entry, _ in batch], atomic=False
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (entry, future), result in zip(batch, results):
+            if future.done():
+                continue
+            error = self._to_exception(entry, result)
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _to_exception(
+        self, entry: LedgerEntryCreate, result: LedgerBatchItemResult
+    ) -> Optional[Exception]:
+        if result.status == "duplicate":
+            return DuplicateTransactionError(entry.nonce)
+        if result.status == "insufficient_balance":
+            return InsufficientBalanceError(
+                result.balance, self.ledger_service.operation_config[entry.operation]
+            )
+        if result.status == "moved":
+            return OwnerMovedError(entry.owner_id)
+        if result.status == "invalid_operation":
+            return ValueError(f"Invalid operation {entry.operation}")
+        return None
+
+
+# A batch is one transaction, so each shard gets its own writer.
+group_commit_writers: Dict[str, GroupCommitWriter] = {
+    shard: GroupCommitWriter(
+        LedgerService(core_settings.ledger.operation_config),
+        session_factory,
+        max_batch_size=core_settings.ledger.group_commit_max_batch_size,
+        max_delay_ms=core_settings.ledger.group_commit_max_delay_ms,
+    )
+    for shard, session_factory in shard_router.session_factories.items()
+}
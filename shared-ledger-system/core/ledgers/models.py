@@ -1,21 +1,140 @@
 # core/ledgers/models.py
 from datetime import datetime
 import sqlalchemy
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLAlchemyEnum
+from sqlalchemy import (
+    DDL,
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    DateTime,
+    Enum as SQLAlchemyEnum,
+    event,
+    text,
+)
+from sqlalchemy.orm import deferred
 from core.db.base import Base
 
+# Id of the transaction writing a row, as a bigint. Ids increase over the life
+# of the cluster, and a transaction has none until it writes, so a row written
+# later never gets an id below the oldest transaction still running.
+CURRENT_XACT_ID = text("pg_current_xact_id()::text::bigint")
+
 
 class LedgerEntry(Base):
+    # Range-partitioned by month on created_on (see core/ledgers/partitions.py).
+    # Postgres cannot enforce a unique nonce across partitions, so uniqueness is
+    # kept by LedgerNonce instead, per owner.
     __tablename__ = "ledger_entries"
 
-    id = Column(Integer, primary_key=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     operation = Column(String, nullable=False)
     amount = Column(Integer, nullable=False)
-    nonce = Column(String, nullable=False, unique=True)
+    nonce = Column(String, nullable=False)
     owner_id = Column(String, nullable=False)
-    created_on = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_on = Column(
+        DateTime, primary_key=True, nullable=False, default=datetime.utcnow
+    )
+    # Deferred so that history queries stay index-only scans.
+    txid = deferred(Column(BigInteger, nullable=False, server_default=CURRENT_XACT_ID))
 
+    # Serves per-owner lookups and keyset pagination over an owner's history;
+    # the included columns let the history query run as an index-only scan.
     __table_args__ = (
-        sqlalchemy.Index("idx_owner_id", "owner_id"),
-        sqlalchemy.Index("idx_nonce", "nonce"),
+        sqlalchemy.Index(
+            "idx_owner_id_created_on_id",
+            "owner_id",
+            "created_on",
+            "id",
+            postgresql_include=["operation", "amount", "nonce"],
+        ),
+        # Sums an owner's entries after a checkpoint without touching older ones.
+        sqlalchemy.Index(
+            "idx_owner_id_txid", "owner_id", "txid", postgresql_include=["amount"]
+        ),
+        # Lets compaction walk entries in transaction order.
+        sqlalchemy.Index("idx_txid", "txid"),
+        {"postgresql_partition_by": "RANGE (created_on)"},
+    )
+
+
+# Rows outside every monthly partition land here instead of failing the insert.
+event.listen(
+    LedgerEntry.__table__,
+    "after_create",
+    DDL("CREATE TABLE ledger_entries_default PARTITION OF ledger_entries DEFAULT"),
+)
+
+
+class LedgerNonce(Base):
+    # Scoped to the owner, so the claim always lives on the owner's shard and
+    # commits together with the entry.
+    __tablename__ = "ledger_nonces"
+
+    owner_id = Column(String, primary_key=True)
+    nonce = Column(String, primary_key=True)
+    created_on = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class LedgerBalance(Base):
+    __tablename__ = "ledger_balances"
+
+    owner_id = Column(String, primary_key=True)
+    balance = Column(Integer, nullable=False, default=0)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_on = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+
+
+class LedgerOwnerMove(Base):
+    # Left on the source shard by resharding (core/ledgers/resharding.py) in
+    # the transaction that deletes the owner's rows. Writes for the owner are
+    # refused here from then on instead of starting it over on the old shard.
+    __tablename__ = "ledger_owner_moves"
+
+    owner_id = Column(String, primary_key=True)
+    shard = Column(String, nullable=False)
+    moved_on = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class LedgerCheckpoint(Base):
+    # Sum of the owner's entries with txid < up_to_txid. Entries are
+    # append-only, so a checkpoint never has to be revisited once written.
+    __tablename__ = "ledger_checkpoints"
+
+    owner_id = Column(String, primary_key=True)
+    up_to_txid = Column(BigInteger, nullable=False)
+    balance = Column(Integer, nullable=False)
+    updated_on = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class LedgerCheckpointWatermark(Base):
+    # Single row: every entry with txid < up_to_txid is folded into
+    # ledger_checkpoints. Kept apart from the checkpoints so that it also
+    # advances over stretches without entries.
+    __tablename__ = "ledger_checkpoint_watermark"
+
+    id = Column(Integer, primary_key=True, default=1)
+    up_to_txid = Column(BigInteger, nullable=False)
+    updated_on = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class LedgerOutbox(Base):
+    # Written in the same transaction as its entry and deleted by the relay
+    # once published (core/ledgers/outbox.py), so it only holds the backlog.
+    __tablename__ = "ledger_outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    entry_id = Column(Integer, nullable=False)
+    owner_id = Column(String, nullable=False)
+    operation = Column(String, nullable=False)
+    amount = Column(Integer, nullable=False)
+    nonce = Column(String, nullable=False)
+    balance = Column(Integer, nullable=False)
+    version = Column(BigInteger, nullable=True)
+    created_on = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,194 @@
+# core/ledgers/outbox.py
+import asyncio
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from redis import asyncio as aioredis
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache.cache import cache
+from core.config import core_settings
+from core.db.shards import shard_router
+from core.logging.logger import logger
+from .models import LedgerOutbox
+from .schemas import LedgerChange
+from .exceptions import InvalidOffsetError
+
+OUTBOX_LOCK_KEY = 7216340916
+STREAM_ID = re.compile(r"^\d+(-\d+)?$")
+START_OFFSET = "0-0"
+
+
+def to_message(row) -> Dict[str, str]:
+    return {
+        "outbox_id": str(row.id),
+        "entry_id": str(row.entry_id),
+        "owner_id": row.owner_id,
+        "operation": row.operation,
+        "amount": str(row.amount),
+        "nonce": row.nonce,
+        "balance": str(row.balance),
+        "version": "" if row.version is None else str(row.version),
+        "created_on": row.created_on.isoformat(),
+    }
+
+
+def to_change(offset: str, fields: Dict[str, str]) -> LedgerChange:
+    return LedgerChange(
+        offset=offset, **{**fields, "version": fields["version"] or None}
+    )
+
+
+# Moves outbox rows to a Redis Stream. Each batch is deleted and published in
+# one transaction, oldest first; if the commit fails after XADD the rows go out
+# again next time, so delivery is at least once and consumers dedupe on nonce.
+# An advisory lock keeps a single relay per database busy at a time. Changes of
+# one owner are published in the order they were committed, since their writes
+# serialize on the owner's balance row.
+class OutboxRelay:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        redis: aioredis.Redis,
+        stream: str,
+        batch_size: int = 500,
+        interval_seconds: float = 0.5,
+        max_length: int = 1000000,
+    ):
+        self.session_factory = session_factory
+        self.redis = redis
+        self.stream = stream
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_length = max_length
+        self._worker: Optional[asyncio.Task] = None
+
+    def use_client(self, redis: aioredis.Redis) -> None:
+        self.redis = redis
+
+    async def run_once(self) -> int:
+        published = 0
+        while True:
+            count = await self._publish_batch()
+            published += count
+            if count < self.batch_size:
+                return published
+
+    async def _publish_batch(self) -> int:
+        async with self.session_factory() as session:
+            locked = await session.scalar(
+                select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_KEY))
+            )
+            if not locked:
+                await session.rollback()
+                return 0
+            oldest = (
+                select(LedgerOutbox.id)
+                .order_by(LedgerOutbox.id)
+                .limit(self.batch_size)
+                .scalar_subquery()
+            )
+            result = await session.execute(
+                delete(LedgerOutbox)
+                .where(LedgerOutbox.id.in_(oldest))
+                .returning(*LedgerOutbox.__table__.c)
+                .execution_options(synchronize_session=False)
+            )
+            rows = sorted(result.all(), key=lambda row: row.id)
+            if not rows:
+                await session.rollback()
+                return 0
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for row in rows:
+                    pipe.xadd(
+                        self.stream,
+                        to_message(row),
+                        maxlen=self.max_length,
+                        approximate=True,
+                    )
+                await pipe.execute()
+            await session.commit()
+            return len(rows)
+
+    async def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.logger.warning(f"Outbox relay failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+class ChangeFeed:
+    # Reads the stream the relay writes. Offsets are stream ids: pass the
+    # next_offset of one page to get the following one. Consumers may also
+    # store their offset here and resume from it. Reads that block go through
+    # blocking_redis when one is set.
+    def __init__(self, redis: aioredis.Redis, stream: str):
+        self.redis = redis
+        self.blocking_redis: Optional[aioredis.Redis] = None
+        self.stream = stream
+
+    def use_client(self, redis: aioredis.Redis) -> None:
+        self.redis = redis
+
+    def use_blocking_client(self, redis: aioredis.Redis) -> None:
+        self.blocking_redis = redis
+
+    async def read(
+        self,
+        after: str,
+        count: int,
+        block_ms: int = 0,
+        owner_id: Optional[str] = None,
+    ) -> Tuple[List[LedgerChange], str]:
+        if not STREAM_ID.match(after):
+            raise InvalidOffsetError(after)
+        client = self.redis
+        if block_ms and self.blocking_redis is not None:
+            client = self.blocking_redis
+        response = await client.xread(
+            {self.stream: after}, count=count, block=block_ms or None
+        )
+        changes = []
+        next_offset = after
+        for _, messages in response or []:
+            for offset, fields in messages:
+                next_offset = offset
+                if owner_id is None or fields["owner_id"] == owner_id:
+                    changes.append(to_change(offset, fields))
+        return changes, next_offset
+
+    async def committed_offset(self, consumer: str) -> str:
+        return await self.redis.get(f"changes:offset:{consumer}") or START_OFFSET
+
+    async def commit_offset(self, consumer: str, offset: str) -> None:
+        if not STREAM_ID.match(offset):
+            raise InvalidOffsetError(offset)
+        await self.redis.set(f"changes:offset:{consumer}", offset)
+
+
+outbox_relays: Dict[str, OutboxRelay] = {
+    shard: OutboxRelay(
+        session_factory,
+        cache.redis,
+        core_settings.ledger.outbox_stream,
+        batch_size=core_settings.ledger.outbox_batch_size,
+        interval_seconds=core_settings.ledger.outbox_poll_interval_seconds,
+        max_length=core_settings.ledger.outbox_stream_max_length,
+    )
+    for shard, session_factory in shard_router.session_factories.items()
+}
+change_feed = ChangeFeed(cache.redis, core_settings.ledger.outbox_stream)
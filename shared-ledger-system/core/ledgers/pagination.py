@@ -0,0 +1,31 @@
+# core/ledgers/pagination.py
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from .exceptions import InvalidCursorError
+
+# A cursor is the (created_on, id) key of the last entry on a page, so the next
+# page starts right after it whatever was inserted in the meantime.
+
+
+def encode_cursor(created_on: datetime, entry_id: int) -> str:
+    raw = f"{created_on.isoformat()}|{entry_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_on, entry_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_on), int(entry_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(cursor)
+
+
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # created_on is stored as naive UTC; aware bounds from the query string
+    # must be converted before they are compared with it.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
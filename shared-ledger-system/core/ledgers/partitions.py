@@ -0,0 +1,117 @@
+# core/ledgers/partitions.py
+import re
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.logging.logger import logger
+from .models import LedgerCheckpointWatermark, LedgerEntry
+
+PARENT_TABLE = "ledger_entries"
+PARTITION_NAME = re.compile(r"^ledger_entries_(\d{4})_(\d{2})$")
+LIST_PARTITIONS = text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE parent.relname = :parent"
+)
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+async def list_partitions(session: AsyncSession) -> List[date]:
+    result = await session.execute(LIST_PARTITIONS, {"parent": PARENT_TABLE})
+    months = []
+    for name in result.scalars():
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+async def ensure_partitions(
+    session: AsyncSession, months_ahead: int, since: Optional[date] = None
+) -> List[str]:
+    # Creates the monthly partitions from `since` (default: this month) through
+    # months_ahead months from now, so inserts never fall back to the default
+    # partition. Returns the names of the partitions it created.
+    current = month_start(datetime.utcnow().date())
+    month = month_start(since) if since else current
+    last = add_months(current, months_ahead)
+    existing = set(await list_partitions(session))
+    created = []
+    while month <= last:
+        if month not in existing:
+            name = partition_name(month)
+            try:
+                await session.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') "
+                        f"TO ('{add_months(month, 1).isoformat()}')"
+                    )
+                )
+                await session.commit()
+                created.append(name)
+            except DBAPIError as e:
+                # Typically rows for that month already sit in the default
+                # partition; they have to be moved by hand first.
+                await session.rollback()
+                logger.logger.warning(f"Could not create partition {name}: {e}")
+        month = add_months(month, 1)
+    return created
+
+
+async def detach_partitions(
+    session: AsyncSession, retain_months: int, archive_schema: Optional[str] = None
+) -> List[str]:
+    # Detaches monthly partitions that end before the retention window. The
+    # tables are kept (moved to archive_schema if given) for backup and removal
+    # by hand. A partition is only detached once every entry in it is below the
+    # compaction watermark, i.e. folded into ledger_checkpoints, so balances
+    # computed from the ledger stay right. An entry committed late into an old
+    # month holds its partition back until compaction has reached it.
+    cutoff = add_months(month_start(datetime.utcnow().date()), -retain_months)
+    watermark = await session.scalar(select(LedgerCheckpointWatermark.up_to_txid)) or 0
+    detached = []
+    for month in await list_partitions(session):
+        if add_months(month, 1) > cutoff:
+            continue
+        max_txid = await session.scalar(
+            select(func.max(LedgerEntry.txid)).where(
+                LedgerEntry.created_on >= month,
+                LedgerEntry.created_on < add_months(month, 1),
+            )
+        )
+        if max_txid is not None and max_txid >= watermark:
+            logger.logger.warning(
+                f"Partition {partition_name(month)} is not fully checkpointed yet"
+            )
+            continue
+
+        name = partition_name(month)
+        await session.execute(
+            text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+        )
+        if archive_schema:
+            await session.execute(
+                text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"')
+            )
+            await session.execute(
+                text(f'ALTER TABLE {name} SET SCHEMA "{archive_schema}"')
+            )
+        await session.commit()
+        detached.append(name)
+    return detached
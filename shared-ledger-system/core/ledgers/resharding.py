@@ -0,0 +1,181 @@
+# core/ledgers/resharding.py
+import uuid
+from typing import Dict, List
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import sessionmaker
+from core.db.shards import ShardRouter
+from core.logging.logger import logger
+from .models import (
+    LedgerBalance,
+    LedgerCheckpoint,
+    LedgerEntry,
+    LedgerNonce,
+    LedgerOwnerMove,
+)
+from .exceptions import LedgerError
+
+CARRY_OPERATION = "CHECKPOINT_CARRY"
+OWNER_MODELS = (LedgerNonce, LedgerEntry, LedgerCheckpoint, LedgerBalance)
+
+
+async def list_owners(session_factory: sessionmaker) -> List[str]:
+    # Every write path upserts the owner's ledger_balances row.
+    async with session_factory() as session:
+        result = await session.execute(
+            select(LedgerBalance.owner_id).order_by(LedgerBalance.owner_id)
+        )
+        return list(result.scalars())
+
+
+async def move_owner(
+    owner_id: str,
+    source: sessionmaker,
+    target: sessionmaker,
+    target_shard: str,
+    batch_size: int = 1000,
+) -> int:
+    # Copies the owner's entries, nonces and balance to target, commits there,
+    # then deletes them from source and leaves a LedgerOwnerMove in their
+    # place. Entries get new ids from the target's sequence. Nonces are copied
+    # from ledger_nonces, so those of archived entries keep rejecting retries.
+    # Entries already folded into a checkpoint and archived with their
+    # partition are gone, so their sum is carried over as one CHECKPOINT_CARRY
+    # entry.
+    #
+    # The source balance row stays locked throughout. Writers lock it too and
+    # then check for a LedgerOwnerMove, so a write either lands before the
+    # copy or is refused. Until the source commits it is the owner's only
+    # copy: anything the target holds for the owner is left from an
+    # interrupted run and is replaced, so a failed move can just be rerun.
+    async with source() as src, target() as dst:
+        balance = (
+            await src.execute(
+                select(LedgerBalance)
+                .where(LedgerBalance.owner_id == owner_id)
+                .with_for_update()
+            )
+        ).scalar_one_or_none()
+        if balance is None:
+            # Never written to on this shard, or already moved away.
+            return 0
+        for model in (*OWNER_MODELS, LedgerOwnerMove):
+            await dst.execute(delete(model).where(model.owner_id == owner_id))
+        checkpoint = await src.get(LedgerCheckpoint, owner_id)
+
+        moved = 0
+        covered = 0
+        result = await src.stream(
+            select(
+                LedgerEntry.txid,
+                LedgerEntry.operation,
+                LedgerEntry.amount,
+                LedgerEntry.nonce,
+                LedgerEntry.created_on,
+            )
+            .where(LedgerEntry.owner_id == owner_id)
+            .order_by(LedgerEntry.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions(batch_size):
+            if checkpoint is not None:
+                covered += sum(
+                    row.amount for row in rows if row.txid < checkpoint.up_to_txid
+                )
+            await dst.execute(
+                insert(LedgerEntry).values(
+                    [
+                        {
+                            "operation": row.operation,
+                            "amount": row.amount,
+                            "nonce": row.nonce,
+                            "owner_id": owner_id,
+                            "created_on": row.created_on,
+                        }
+                        for row in rows
+                    ]
+                )
+            )
+            moved += len(rows)
+
+        nonces = await src.stream(
+            select(LedgerNonce.nonce, LedgerNonce.created_on)
+            .where(LedgerNonce.owner_id == owner_id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in nonces.partitions(batch_size):
+            await _claim_nonces(dst, owner_id, [row._asdict() for row in rows])
+
+        if checkpoint is not None and checkpoint.balance != covered:
+            carry = {
+                "operation": CARRY_OPERATION,
+                "amount": checkpoint.balance - covered,
+                "nonce": f"carry:{owner_id}:{uuid.uuid4()}",
+                "owner_id": owner_id,
+                "created_on": checkpoint.updated_on,
+            }
+            await _claim_nonces(dst, owner_id, [carry])
+            await dst.execute(insert(LedgerEntry).values(carry))
+        # A higher version keeps caches from holding on to the source's.
+        dst.add(
+            LedgerBalance(
+                owner_id=owner_id,
+                balance=balance.balance,
+                version=balance.version + 1,
+            )
+        )
+        await dst.commit()
+
+        for model in OWNER_MODELS:
+            await src.execute(delete(model).where(model.owner_id == owner_id))
+        src.add(LedgerOwnerMove(owner_id=owner_id, shard=target_shard))
+        await src.commit()
+    return moved
+
+
+async def _claim_nonces(session, owner_id: str, nonces: List[dict]) -> None:
+    claimed = await session.execute(
+        insert(LedgerNonce)
+        .values(
+            [
+                {
+                    "owner_id": owner_id,
+                    "nonce": nonce["nonce"],
+                    "created_on": nonce["created_on"],
+                }
+                for nonce in nonces
+            ]
+        )
+        .on_conflict_do_nothing(
+            index_elements=[LedgerNonce.owner_id, LedgerNonce.nonce]
+        )
+        .returning(LedgerNonce.nonce)
+    )
+    if len(claimed.all()) != len(nonces):
+        raise LedgerError(f"A nonce of owner {owner_id} is taken on the target shard.")
+
+
+async def reshard(
+    current: ShardRouter, target: ShardRouter, dry_run: bool = False
+) -> Dict[str, str]:
+    # Moves every owner whose shard differs between the two layouts and
+    # returns {owner_id: "source -> target"}. Shards are matched by name.
+    moves = {}
+    for shard, session_factory in current.session_factories.items():
+        for owner_id in await list_owners(session_factory):
+            destination = target.shard_for(owner_id)
+            if destination == shard:
+                continue
+            moves[owner_id] = f"{shard} -> {destination}"
+            if dry_run:
+                continue
+            moved = await move_owner(
+                owner_id,
+                session_factory,
+                target.session_factories[destination],
+                destination,
+            )
+            logger.logger.info(
+                f"Moved {moved} entries of {owner_id} from {shard} to {destination}"
+            )
+    return moves
@@ -1,7 +1,8 @@
 # core/ledgers/schemas.py
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
-from typing import TypeVar
+from typing import TypeVar, List, Literal, Optional
+from core.config import core_settings
 
 T = TypeVar("T")
 
@@ -24,6 +25,98 @@ class LedgerEntry(LedgerEntryBase):
     model_config = ConfigDict(from_attributes=True)  # class Config -> ConfigDict
 
 
+class LedgerEntryPage(BaseModel):
+    items: List[LedgerEntry]
+    next_cursor: Optional[str] = None
+
+
 class LedgerBalance(BaseModel):
     owner_id: str
     balance: int
+
+
+class VersionedBalance(BaseModel):
+    owner_id: str
+    balance: int
+    version: int
+
+
+class BalanceDrift(BaseModel):
+    owner_id: str
+    stored_balance: int
+    computed_balance: int
+
+
+class LedgerBalancesQuery(BaseModel):
+    owner_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=core_settings.ledger.balances_max_owners,
+        description="Owner IDs to fetch balances for",
+    )
+
+
+class LedgerBatchCreate(BaseModel):
+    entries: List[LedgerEntryCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=core_settings.ledger.batch_max_size,
+        description="Ledger entries to create",
+    )
+    atomic: bool = Field(
+        True,
+        description="If true, no entry is written unless every entry succeeds",
+    )
+
+
+LedgerBatchItemStatus = Literal[
+    "created",
+    "duplicate",
+    "insufficient_balance",
+    "invalid_operation",
+    "moved",
+    "not_applied",
+]
+
+
+class LedgerBatchItemResult(BaseModel):
+    nonce: str
+    owner_id: str
+    status: LedgerBatchItemStatus
+    detail: Optional[str] = None
+    balance: Optional[int] = Field(
+        None, description="Owner balance after this entry, or when it was rejected"
+    )
+    version: Optional[int] = Field(
+        None,
+        description="Balance version, set on the owner's last created entry only",
+    )
+
+
+class LedgerBatchResult(BaseModel):
+    atomic: bool
+    committed: bool
+    created: int
+    results: List[LedgerBatchItemResult]
+
+
+class LedgerChange(BaseModel):
+    offset: str
+    outbox_id: int
+    entry_id: int
+    owner_id: str
+    operation: str
+    amount: int
+    nonce: str
+    balance: int
+    version: Optional[int] = None
+    created_on: datetime
+
+
+class LedgerChangePage(BaseModel):
+    items: List[LedgerChange]
+    next_offset: str
+
+
+class ChangeOffsetCommit(BaseModel):
+    offset: str
@@ -1,10 +1,40 @@
 # core/ledgers/service.py
-from typing import Dict
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from .models import LedgerEntry
-from .schemas import LedgerEntryCreate
-from .exceptions import InsufficientBalanceError, DuplicateTransactionError
+from sqlalchemy import BigInteger, literal, select, func, text, update, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from core.db.shards import ShardRouter
+from .models import (
+    LedgerEntry,
+    LedgerBalance,
+    LedgerCheckpoint,
+    LedgerCheckpointWatermark,
+    LedgerNonce,
+    LedgerOutbox,
+    LedgerOwnerMove,
+)
+from .schemas import (
+    LedgerEntryCreate,
+    LedgerEntryPage,
+    BalanceDrift,
+    LedgerBatchItemResult,
+    VersionedBalance,
+)
+from .pagination import encode_cursor, decode_cursor, as_naive_utc
+from .exceptions import (
+    LedgerError,
+    InsufficientBalanceError,
+    DuplicateTransactionError,
+    CrossShardBatchError,
+    OwnerMovedError,
+)
+
+BATCH_INSERT_ATTEMPTS = 3
+CHECKPOINT_LOCK_KEY = 7216340915
+# Oldest transaction still running; see CURRENT_XACT_ID in models.py.
+SNAPSHOT_XMIN = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
 
 
 class LedgerService:
@@ -12,40 +42,663 @@ class LedgerService:
         self.operation_config = operation_config
 
     async def get_balance(self, session: AsyncSession, owner_id: str) -> int:
-        query = select(func.sum(LedgerEntry.amount)).where(
-            LedgerEntry.owner_id == owner_id
+        query = select(LedgerBalance.balance).where(LedgerBalance.owner_id == owner_id)
+        result = await session.execute(query)
+        balance = result.scalar() or 0
+        return balance
+
+    async def get_versioned_balance(
+        self, session: AsyncSession, owner_id: str
+    ) -> VersionedBalance:
+        query = select(LedgerBalance.balance, LedgerBalance.version).where(
+            LedgerBalance.owner_id == owner_id
+        )
+        row = (await session.execute(query)).one_or_none()
+        if row is None:
+            return VersionedBalance(owner_id=owner_id, balance=0, version=0)
+        return VersionedBalance(
+            owner_id=owner_id, balance=row.balance, version=row.version
         )
+
+    async def get_versioned_balances(
+        self, session: AsyncSession, owner_ids: List[str]
+    ) -> Dict[str, VersionedBalance]:
+        query = select(
+            LedgerBalance.owner_id, LedgerBalance.balance, LedgerBalance.version
+        ).where(LedgerBalance.owner_id.in_(owner_ids))
+        result = await session.execute(query)
+        balances = {
+            owner_id: VersionedBalance(owner_id=owner_id, balance=0, version=0)
+            for owner_id in owner_ids
+        }
+        for row in result:
+            balances[row.owner_id] = VersionedBalance.model_validate(row._mapping)
+        return balances
+
+    async def get_versioned_balances_on_shards(
+        self, shards: ShardRouter, owner_ids: List[str], primary: bool = False
+    ) -> Dict[str, VersionedBalance]:
+        return await shards.fan_out(
+            owner_ids, self.get_versioned_balances, read_only=True, primary=primary
+        )
+
+    async def compute_balance(self, session: AsyncSession, owner_id: str) -> int:
+        # The owner's checkpoint plus the entries written after it, so the cost
+        # depends on recent activity rather than on the length of the history.
+        checkpoint_balance = (
+            select(LedgerCheckpoint.balance)
+            .where(LedgerCheckpoint.owner_id == owner_id)
+            .scalar_subquery()
+        )
+        checkpoint_up_to_txid = (
+            select(LedgerCheckpoint.up_to_txid)
+            .where(LedgerCheckpoint.owner_id == owner_id)
+            .scalar_subquery()
+        )
+        tail = (
+            select(func.sum(LedgerEntry.amount))
+            .where(
+                LedgerEntry.owner_id == owner_id,
+                LedgerEntry.txid >= func.coalesce(checkpoint_up_to_txid, 0),
+            )
+            .scalar_subquery()
+        )
+        query = select(func.coalesce(checkpoint_balance, 0) + func.coalesce(tail, 0))
         result = await session.execute(query)
         balance = result.scalar() or 0
         return balance
 
+    async def compact_checkpoints(self, session: AsyncSession, max_entries: int) -> int:
+        # Folds entries with txid in [watermark, boundary) into their owners'
+        # checkpoints, moves the watermark to the boundary and returns how many
+        # entries it folded. Entries are taken in transaction order, not id
+        # order: an id is drawn before its transaction commits, so a lower id
+        # may become visible after a higher one, but every transaction older
+        # than the snapshot's xmin has ended and any later write gets a higher
+        # txid. The boundary is therefore at most xmin, and lower when more
+        # than max_entries entries are waiting.
+        locked = await session.scalar(
+            select(func.pg_try_advisory_xact_lock(CHECKPOINT_LOCK_KEY))
+        )
+        if not locked:
+            await session.rollback()
+            return 0
+
+        watermark = (
+            await session.scalar(select(LedgerCheckpointWatermark.up_to_txid)) or 0
+        )
+        xmin = await session.scalar(SNAPSHOT_XMIN)
+        last = await session.scalar(
+            select(LedgerEntry.txid)
+            .where(LedgerEntry.txid >= watermark, LedgerEntry.txid < xmin)
+            .order_by(LedgerEntry.txid)
+            .offset(max_entries - 1)
+            .limit(1)
+        )
+        boundary = xmin if last is None else last + 1
+        if boundary <= watermark:
+            await session.rollback()
+            return 0
+
+        in_range = (LedgerEntry.txid >= watermark, LedgerEntry.txid < boundary)
+        folded = await session.scalar(
+            select(func.count()).select_from(LedgerEntry).where(*in_range)
+        )
+        if folded:
+            new_entries = (
+                select(
+                    LedgerEntry.owner_id,
+                    literal(boundary, BigInteger),
+                    func.coalesce(LedgerCheckpoint.balance, 0)
+                    + func.sum(LedgerEntry.amount),
+                    func.timezone("utc", func.now()),
+                )
+                .select_from(LedgerEntry)
+                .outerjoin(
+                    LedgerCheckpoint,
+                    LedgerCheckpoint.owner_id == LedgerEntry.owner_id,
+                )
+                .where(
+                    *in_range,
+                    LedgerEntry.txid >= func.coalesce(LedgerCheckpoint.up_to_txid, 0),
+                )
+                .group_by(LedgerEntry.owner_id, LedgerCheckpoint.balance)
+            )
+            stmt = insert(LedgerCheckpoint).from_select(
+                ["owner_id", "up_to_txid", "balance", "updated_on"], new_entries
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LedgerCheckpoint.owner_id],
+                set_={
+                    "up_to_txid": stmt.excluded.up_to_txid,
+                    "balance": stmt.excluded.balance,
+                    "updated_on": stmt.excluded.updated_on,
+                },
+                where=LedgerCheckpoint.up_to_txid < stmt.excluded.up_to_txid,
+            )
+            await session.execute(stmt)
+
+        stmt = insert(LedgerCheckpointWatermark).values(
+            id=1, up_to_txid=boundary, updated_on=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LedgerCheckpointWatermark.id],
+            set_={
+                "up_to_txid": stmt.excluded.up_to_txid,
+                "updated_on": stmt.excluded.updated_on,
+            },
+        )
+        await session.execute(stmt)
+        await session.commit()
+        return folded
+
+    async def list_entries(
+        self,
+        session: AsyncSession,
+        owner_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        operation: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> LedgerEntryPage:
+        # Newest first. The keyset condition seeks straight to the cursor in the
+        # (owner_id, created_on, id) index, so deep pages cost the same as the
+        # first one.
+        query = select(LedgerEntry).where(LedgerEntry.owner_id == owner_id)
+        if operation is not None:
+            query = query.where(LedgerEntry.operation == operation)
+        if created_from is not None:
+            query = query.where(LedgerEntry.created_on >= as_naive_utc(created_from))
+        if created_to is not None:
+            query = query.where(LedgerEntry.created_on < as_naive_utc(created_to))
+        if cursor is not None:
+            query = query.where(
+                tuple_(LedgerEntry.created_on, LedgerEntry.id) < decode_cursor(cursor)
+            )
+        query = query.order_by(
+            LedgerEntry.created_on.desc(), LedgerEntry.id.desc()
+        ).limit(limit + 1)
+
+        entries = list((await session.execute(query)).scalars())
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = encode_cursor(entries[-1].created_on, entries[-1].id)
+        return LedgerEntryPage(items=entries, next_cursor=next_cursor)
+
     async def create_entry(
         self, session: AsyncSession, entry: LedgerEntryCreate
     ) -> LedgerEntry:
-        existing = await session.execute(
-            select(LedgerEntry).where(LedgerEntry.nonce == entry.nonce)
-        )
-        if existing.scalar_one_or_none():
-            raise DuplicateTransactionError(
-                f"Transaction with nonce {entry.nonce} already exists"
-            )
+        db_entry, _ = await self.create_entry_with_balance(session, entry)
+        return db_entry
 
+    async def create_entry_with_balance(
+        self, session: AsyncSession, entry: LedgerEntryCreate
+    ) -> Tuple[LedgerEntry, VersionedBalance]:
         amount = self.operation_config.get(entry.operation)
         if amount is None:
             raise ValueError(f"Invalid operation {entry.operation}")
 
+        created_on = datetime.utcnow()
+        if not await self._claim_nonces(session, [entry], created_on):
+            await session.rollback()
+            raise DuplicateTransactionError(entry.nonce)
+        stmt = (
+            insert(LedgerEntry)
+            .values(
+                operation=entry.operation,
+                amount=amount,
+                nonce=entry.nonce,
+                owner_id=entry.owner_id,
+                created_on=created_on,
+            )
+            .returning(LedgerEntry)
+        )
+        result = await session.execute(stmt)
+        db_entry = result.scalar_one()
+
         if amount < 0:
+            new_balance = await self._debit_balance(session, entry.owner_id, amount)
+        else:
+            new_balance = await self._apply_balance_delta(
+                session, entry.owner_id, amount
+            )
+        moved = await self._moved_owners(session, [entry.owner_id])
+        if moved:
+            await session.rollback()
+            raise OwnerMovedError(entry.owner_id, moved[entry.owner_id])
+        if new_balance is None:
+            await session.rollback()
             current_balance = await self.get_balance(session, entry.owner_id)
-            if current_balance + amount < 0:
-                raise InsufficientBalanceError(current_balance, amount)
+            raise InsufficientBalanceError(current_balance, amount)
+
+        await self._write_outbox(
+            session,
+            [
+                self._outbox_row(
+                    db_entry.id,
+                    entry,
+                    amount,
+                    new_balance.balance,
+                    new_balance.version,
+                    created_on,
+                )
+            ],
+        )
+        await session.commit()
+        return db_entry, new_balance
 
-        db_entry = LedgerEntry(
-            operation=entry.operation,
-            amount=amount,
+    async def create_entries(
+        self,
+        session: AsyncSession,
+        entries: List[LedgerEntryCreate],
+        atomic: bool = True,
+    ) -> List[LedgerBatchItemResult]:
+        for _ in range(BATCH_INSERT_ATTEMPTS):
+            results = await self._try_create_entries(session, entries, atomic)
+            if results is not None:
+                return results
+        raise LedgerError("Batch kept conflicting with concurrent writes; retry it.")
+
+    async def create_entries_on_shards(
+        self,
+        shards: ShardRouter,
+        entries: List[LedgerEntryCreate],
+        atomic: bool = True,
+    ) -> List[LedgerBatchItemResult]:
+        # Each shard's share of the batch is its own transaction and the shards
+        # are written concurrently. A transaction cannot span databases, so an
+        # atomic batch has to stay on one shard, where it goes whole: a failed
+        # item, a repeated nonce included, rolls the entire batch back. Nonces
+        # are scoped to the owner, so every repeat is caught by its own shard.
+        if not entries:
+            return []
+        if atomic:
+            shard_names = sorted(
+                {shards.shard_for(entry.owner_id) for entry in entries}
+            )
+            if len(shard_names) > 1:
+                raise CrossShardBatchError(shard_names)
+            async with shards.session_factories[shard_names[0]]() as session:
+                return await self.create_entries(session, entries, atomic)
+
+        results: List[Optional[LedgerBatchItemResult]] = [None] * len(entries)
+        placement: Dict[str, List[int]] = {}
+        for index, entry in enumerate(entries):
+            placement.setdefault(shards.shard_for(entry.owner_id), []).append(index)
+
+        async def create_on_shard(
+            shard: str, indices: List[int]
+        ) -> List[LedgerBatchItemResult]:
+            async with shards.session_factories[shard]() as session:
+                return await self.create_entries(
+                    session, [entries[i] for i in indices], atomic
+                )
+
+        shard_results = await asyncio.gather(
+            *(create_on_shard(shard, indices) for shard, indices in placement.items())
+        )
+        for indices, items in zip(placement.values(), shard_results):
+            for index, item in zip(indices, items):
+                results[index] = item
+        return results
+
+    async def _try_create_entries(
+        self,
+        session: AsyncSession,
+        entries: List[LedgerEntryCreate],
+        atomic: bool,
+    ) -> Optional[List[LedgerBatchItemResult]]:
+        results: List[Optional[LedgerBatchItemResult]] = [None] * len(entries)
+
+        seen_nonces = set()
+        for index, entry in enumerate(entries):
+            if entry.operation not in self.operation_config:
+                results[index] = self._batch_result(
+                    entry, "invalid_operation", f"Invalid operation {entry.operation}"
+                )
+            elif (entry.owner_id, entry.nonce) in seen_nonces:
+                results[index] = self._batch_result(
+                    entry, "duplicate", str(DuplicateTransactionError(entry.nonce))
+                )
+            seen_nonces.add((entry.owner_id, entry.nonce))
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            existing = await session.execute(
+                select(LedgerNonce.owner_id, LedgerNonce.nonce).where(
+                    tuple_(LedgerNonce.owner_id, LedgerNonce.nonce).in_(
+                        [(entries[i].owner_id, entries[i].nonce) for i in pending]
+                    )
+                )
+            )
+            existing_nonces = set(existing.tuples())
+            for i in pending:
+                if (entries[i].owner_id, entries[i].nonce) in existing_nonces:
+                    results[i] = self._batch_result(
+                        entries[i],
+                        "duplicate",
+                        str(DuplicateTransactionError(entries[i].nonce)),
+                    )
+            pending = [i for i in pending if results[i] is None]
+
+        if pending:
+            # Lock every touched balance row up front, in a stable order so
+            # concurrent batches cannot deadlock, then replay the batch in order.
+            owner_ids = sorted({entries[i].owner_id for i in pending})
+            locked = await session.execute(
+                select(LedgerBalance.owner_id, LedgerBalance.balance)
+                .where(LedgerBalance.owner_id.in_(owner_ids))
+                .order_by(LedgerBalance.owner_id)
+                .with_for_update()
+            )
+            balances = {owner_id: 0 for owner_id in owner_ids}
+            balances.update({row.owner_id: row.balance for row in locked})
+            moved = await self._moved_owners(session, owner_ids)
+            deltas: Dict[str, int] = {}
+            new_balances: Dict[int, int] = {}
+            for i in pending:
+                entry = entries[i]
+                amount = self.operation_config[entry.operation]
+                if entry.owner_id in moved:
+                    results[i] = self._batch_result(
+                        entry,
+                        "moved",
+                        str(OwnerMovedError(entry.owner_id, moved[entry.owner_id])),
+                    )
+                    continue
+                if balances[entry.owner_id] + amount < 0:
+                    results[i] = self._batch_result(
+                        entry,
+                        "insufficient_balance",
+                        str(InsufficientBalanceError(balances[entry.owner_id], amount)),
+                        balance=balances[entry.owner_id],
+                    )
+                    continue
+                balances[entry.owner_id] += amount
+                new_balances[i] = balances[entry.owner_id]
+                deltas[entry.owner_id] = deltas.get(entry.owner_id, 0) + amount
+            pending = [i for i in pending if results[i] is None]
+
+        failed = len(pending) != len(entries)
+        if atomic and failed:
+            await session.rollback()
+            return [
+                result or self._batch_result(entries[i], "not_applied")
+                for i, result in enumerate(results)
+            ]
+
+        if pending:
+            created_on = datetime.utcnow()
+            claimed = await self._claim_nonces(
+                session, [entries[i] for i in pending], created_on
+            )
+            if len(claimed) != len(pending):
+                # A concurrent writer committed one of our nonces after the
+                # duplicate check; start over so it is reported as a duplicate.
+                await session.rollback()
+                return None
+            inserted = await session.execute(
+                insert(LedgerEntry)
+                .values(
+                    [
+                        {
+                            "operation": entries[i].operation,
+                            "amount": self.operation_config[entries[i].operation],
+                            "nonce": entries[i].nonce,
+                            "owner_id": entries[i].owner_id,
+                            "created_on": created_on,
+                        }
+                        for i in pending
+                    ]
+                )
+                .returning(LedgerEntry.owner_id, LedgerEntry.nonce, LedgerEntry.id)
+            )
+            entry_ids = {
+                (owner_id, nonce): entry_id for owner_id, nonce, entry_id in inserted
+            }
+
+            final_balances = await self._apply_balance_deltas(session, deltas)
+            for i in pending:
+                results[i] = self._batch_result(
+                    entries[i], "created", balance=new_balances[i]
+                )
+            # Only the owner's last entry in the batch carries the final balance,
+            # so only it gets a version that may be published to caches.
+            for i in reversed(pending):
+                final_balance = final_balances.pop(entries[i].owner_id, None)
+                if final_balance is not None:
+                    results[i].version = final_balance.version
+            await self._write_outbox(
+                session,
+                [
+                    self._outbox_row(
+                        entry_ids[(entries[i].owner_id, entries[i].nonce)],
+                        entries[i],
+                        self.operation_config[entries[i].operation],
+                        new_balances[i],
+                        results[i].version,
+                        created_on,
+                    )
+                    for i in pending
+                ],
+            )
+
+        await session.commit()
+        return results
+
+    @staticmethod
+    def _batch_result(
+        entry: LedgerEntryCreate,
+        status: str,
+        detail: Optional[str] = None,
+        balance: Optional[int] = None,
+    ) -> LedgerBatchItemResult:
+        return LedgerBatchItemResult(
             nonce=entry.nonce,
             owner_id=entry.owner_id,
+            status=status,
+            detail=detail,
+            balance=balance,
+        )
+
+    @staticmethod
+    def _outbox_row(
+        entry_id: int,
+        entry: LedgerEntryCreate,
+        amount: int,
+        balance: int,
+        version: Optional[int],
+        created_on: datetime,
+    ) -> dict:
+        return {
+            "entry_id": entry_id,
+            "owner_id": entry.owner_id,
+            "operation": entry.operation,
+            "amount": amount,
+            "nonce": entry.nonce,
+            "balance": balance,
+            "version": version,
+            "created_on": created_on,
+        }
+
+    async def _write_outbox(self, session: AsyncSession, rows: List[dict]) -> None:
+        # Same transaction as the entries, so a change is published if and only
+        # if it was committed. Executed with a parameter list rather than one
+        # multi-row VALUES, so SQLAlchemy splits a large batch into statements
+        # within asyncpg's 32767 argument limit.
+        await session.execute(insert(LedgerOutbox), rows)
+
+    async def _claim_nonces(
+        self,
+        session: AsyncSession,
+        entries: List[LedgerEntryCreate],
+        created_on: datetime,
+    ) -> Set[Tuple[str, str]]:
+        # Returns the (owner_id, nonce) pairs this transaction now owns. A pair
+        # held by another in-flight transaction blocks here until that one
+        # commits or aborts.
+        stmt = (
+            insert(LedgerNonce)
+            .values(
+                [
+                    {
+                        "owner_id": entry.owner_id,
+                        "nonce": entry.nonce,
+                        "created_on": created_on,
+                    }
+                    for entry in entries
+                ]
+            )
+            .on_conflict_do_nothing(
+                index_elements=[LedgerNonce.owner_id, LedgerNonce.nonce]
+            )
+            .returning(LedgerNonce.owner_id, LedgerNonce.nonce)
+        )
+        result = await session.execute(stmt)
+        return set(result.tuples())
+
+    async def _moved_owners(
+        self, session: AsyncSession, owner_ids: List[str]
+    ) -> Dict[str, str]:
+        # Resharding holds the owner's balance row while it copies the owner
+        # away. Called once the caller has that row locked, in a statement of
+        # its own, so it sees a move that committed while the caller waited.
+        result = await session.execute(
+            select(LedgerOwnerMove.owner_id, LedgerOwnerMove.shard).where(
+                LedgerOwnerMove.owner_id.in_(owner_ids)
+            )
         )
-        session.add(db_entry)
+        return {owner_id: shard for owner_id, shard in result}
+
+    async def _apply_balance_delta(
+        self, session: AsyncSession, owner_id: str, amount: int
+    ) -> VersionedBalance:
+        balances = await self._apply_balance_deltas(session, {owner_id: amount})
+        return balances[owner_id]
+
+    async def _apply_balance_deltas(
+        self, session: AsyncSession, deltas: Dict[str, int]
+    ) -> Dict[str, VersionedBalance]:
+        if not deltas:
+            return {}
+        stmt = insert(LedgerBalance).values(
+            [
+                {"owner_id": owner_id, "balance": amount, "version": 1}
+                for owner_id, amount in deltas.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LedgerBalance.owner_id],
+            set_={
+                "balance": LedgerBalance.balance + stmt.excluded.balance,
+                "version": LedgerBalance.version + 1,
+                "updated_on": func.timezone("utc", func.now()),
+            },
+        ).returning(
+            LedgerBalance.owner_id, LedgerBalance.balance, LedgerBalance.version
+        )
+        result = await session.execute(stmt)
+        return {
+            row.owner_id: VersionedBalance.model_validate(row._mapping)
+            for row in result
+        }
+
+    async def _debit_balance(
+        self, session: AsyncSession, owner_id: str, amount: int
+    ) -> Optional[VersionedBalance]:
+        # The conditional UPDATE takes the owner's row lock, so concurrent debits
+        # for one owner serialize here while other owners proceed in parallel.
+        stmt = (
+            update(LedgerBalance)
+            .where(
+                LedgerBalance.owner_id == owner_id,
+                LedgerBalance.balance + amount >= 0,
+            )
+            .values(
+                balance=LedgerBalance.balance + amount,
+                version=LedgerBalance.version + 1,
+                updated_on=func.timezone("utc", func.now()),
+            )
+            .returning(
+                LedgerBalance.owner_id, LedgerBalance.balance, LedgerBalance.version
+            )
+        )
+        row = (await session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        return VersionedBalance.model_validate(row._mapping)
+
+    async def find_balance_drift(self, session: AsyncSession) -> List[BalanceDrift]:
+        # Recomputed the same way as compute_balance, checkpoint plus the later
+        # entries, which keeps working once old partitions are archived.
+        tail = (
+            select(
+                LedgerEntry.owner_id.label("owner_id"),
+                func.sum(LedgerEntry.amount).label("amount"),
+            )
+            .select_from(LedgerEntry)
+            .outerjoin(
+                LedgerCheckpoint, LedgerCheckpoint.owner_id == LedgerEntry.owner_id
+            )
+            .where(LedgerEntry.txid >= func.coalesce(LedgerCheckpoint.up_to_txid, 0))
+            .group_by(LedgerEntry.owner_id)
+            .subquery()
+        )
+        computed = (
+            select(
+                func.coalesce(LedgerCheckpoint.owner_id, tail.c.owner_id).label(
+                    "owner_id"
+                ),
+                (
+                    func.coalesce(LedgerCheckpoint.balance, 0)
+                    + func.coalesce(tail.c.amount, 0)
+                ).label("balance"),
+            )
+            .select_from(
+                LedgerCheckpoint.__table__.join(
+                    tail, tail.c.owner_id == LedgerCheckpoint.owner_id, full=True
+                )
+            )
+            .subquery()
+        )
+        owner_id = func.coalesce(computed.c.owner_id, LedgerBalance.owner_id)
+        stored_balance = func.coalesce(LedgerBalance.balance, 0)
+        computed_balance = func.coalesce(computed.c.balance, 0)
+        query = (
+            select(
+                owner_id.label("owner_id"),
+                stored_balance.label("stored_balance"),
+                computed_balance.label("computed_balance"),
+            )
+            .select_from(
+                computed.join(
+                    LedgerBalance,
+                    LedgerBalance.owner_id == computed.c.owner_id,
+                    full=True,
+                )
+            )
+            .where(stored_balance != computed_balance)
+            .order_by(owner_id)
+        )
+        result = await session.execute(query)
+        return [BalanceDrift.model_validate(row._mapping) for row in result]
+
+    async def repair_balances(self, session: AsyncSession) -> List[BalanceDrift]:
+        drift = await self.find_balance_drift(session)
+        for item in drift:
+            stmt = insert(LedgerBalance).values(
+                owner_id=item.owner_id, balance=item.computed_balance
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LedgerBalance.owner_id],
+                set_={
+                    "balance": stmt.excluded.balance,
+                    "version": LedgerBalance.version + 1,
+                    "updated_on": func.timezone("utc", func.now()),
+                },
+            )
+            await session.execute(stmt)
         await session.commit()
-        await session.refresh(db_entry)
-        return db_entry
+        return drift
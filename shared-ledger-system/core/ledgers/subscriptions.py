@@ -0,0 +1,186 @@
+# core/ledgers/subscriptions.py
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline, PubSub
+from redis.exceptions import RedisError
+from core.cache.cache import cache
+from core.config import core_settings
+from core.logging.logger import logger
+from core.monitoring.prometheus import metrics
+from .schemas import VersionedBalance
+
+
+class BalanceSubscription:
+    # Balance updates carry the whole balance, so a slow client can skip some:
+    # when the queue is full the oldest update is dropped. None in the queue
+    # means updates may have been lost and the balance has to be read again.
+    def __init__(self, owner_id: str, queue_size: int):
+        self.owner_id = owner_id
+        self.queue: "asyncio.Queue[Optional[VersionedBalance]]" = asyncio.Queue(
+            maxsize=queue_size
+        )
+
+    def push(self, update: Optional[VersionedBalance]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(update)
+
+    async def updates(
+        self,
+        load: Callable[[], Awaitable[VersionedBalance]],
+        keepalive_seconds: float,
+    ) -> AsyncIterator[Optional[VersionedBalance]]:
+        # Yields the current balance, then each newer one. Updates may arrive
+        # out of order, so only a higher version gets through. Yields None after
+        # keepalive_seconds without one, for the caller to ping the client.
+        latest = await load()
+        yield latest
+        while True:
+            try:
+                update = await asyncio.wait_for(self.queue.get(), keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if update is None:
+                update = await load()
+            if update.version > latest.version:
+                latest = update
+                yield latest
+
+
+class BalanceHub:
+    # Writers publish new balances to a Redis channel per owner. Each worker
+    # holds one pub/sub connection and is subscribed to an owner's channel while
+    # at least one of its clients streams that owner, so a write on any worker
+    # reaches subscribers on every worker. The base channel is always
+    # subscribed to keep the connection open when no client is.
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        channel: str,
+        max_subscribers: int = 10000,
+        queue_size: int = 16,
+    ):
+        self.redis = redis
+        self.base_channel = channel
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscriptions: Dict[str, Set[BalanceSubscription]] = {}
+        self._count = 0
+        self._pubsub: Optional[PubSub] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def use_client(self, redis: aioredis.Redis) -> None:
+        self.redis = redis
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    def channel(self, owner_id: str) -> str:
+        return f"{self.base_channel}:{owner_id}"
+
+    async def publish(self, balance: VersionedBalance) -> None:
+        await self.redis.publish(
+            self.channel(balance.owner_id), balance.model_dump_json()
+        )
+
+    async def queue_publish(self, pipe: Pipeline, balance: VersionedBalance) -> None:
+        pipe.publish(self.channel(balance.owner_id), balance.model_dump_json())
+
+    async def subscribe(self, owner_id: str) -> BalanceSubscription:
+        subscription = BalanceSubscription(owner_id, self.queue_size)
+        watchers = self._subscriptions.setdefault(owner_id, set())
+        watchers.add(subscription)
+        self._count += 1
+        metrics.balance_subscribers.inc()
+        if len(watchers) == 1 and self._pubsub is not None:
+            try:
+                await self._pubsub.subscribe(self.channel(owner_id))
+            except RedisError as e:
+                # The listener resubscribes every watched owner on reconnect.
+                logger.logger.warning(f"Balance subscribe failed: {e}")
+            except BaseException:
+                self.unsubscribe(subscription)
+                raise
+        return subscription
+
+    def unsubscribe(self, subscription: BalanceSubscription) -> None:
+        # Synchronous, so it still runs from a cancelled stream's cleanup; the
+        # Redis side is left to a task.
+        watchers = self._subscriptions.get(subscription.owner_id)
+        if watchers is None or subscription not in watchers:
+            return
+        watchers.discard(subscription)
+        self._count -= 1
+        metrics.balance_subscribers.dec()
+        if not watchers:
+            del self._subscriptions[subscription.owner_id]
+            task = asyncio.create_task(self._unsubscribe(subscription.owner_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _unsubscribe(self, owner_id: str) -> None:
+        if owner_id in self._subscriptions or self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(self.channel(owner_id))
+        except RedisError as e:
+            logger.logger.warning(f"Balance unsubscribe failed: {e}")
+
+    def _dispatch(self, data: str) -> None:
+        balance = VersionedBalance.model_validate_json(data)
+        for subscription in self._subscriptions.get(balance.owner_id, ()):
+            subscription.push(balance)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                owner_ids = set(self._subscriptions)
+                await pubsub.subscribe(
+                    self.base_channel,
+                    *(self.channel(owner_id) for owner_id in owner_ids),
+                )
+                self._pubsub = pubsub
+                added = set(self._subscriptions) - owner_ids
+                if added:
+                    await pubsub.subscribe(
+                        *(self.channel(owner_id) for owner_id in added)
+                    )
+                # Anything may have been published while we were not subscribed.
+                for watchers in self._subscriptions.values():
+                    for subscription in watchers:
+                        subscription.push(None)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._dispatch(message["data"])
+            except RedisError as e:
+                logger.logger.warning(f"Balance update listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                self._pubsub = None
+                await pubsub.aclose()
+
+
+balance_hub = BalanceHub(
+    cache.redis,
+    core_settings.ledger.balance_stream_channel,
+    max_subscribers=core_settings.ledger.balance_stream_max_subscribers,
+    queue_size=core_settings.ledger.balance_stream_queue_size,
+)
@@ -0,0 +1,104 @@
+# core/monitoring/health.py
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from redis import asyncio as aioredis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from core.config import core_settings
+
+
+class HealthChecker:
+    # Readiness results are shared for cache_seconds, and only one check runs
+    # at a time, so frequent probes from many sources cost one round trip to
+    # each dependency per window.
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        timeout: float,
+        cache_seconds: float,
+        saturation_threshold: float,
+    ):
+        self.engine = engine
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+        self.saturation_threshold = saturation_threshold
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def readiness(self, redis: aioredis.Redis) -> Dict[str, Any]:
+        if self._is_fresh():
+            return self._result
+        async with self._lock:
+            if not self._is_fresh():
+                self._result = await self._check(redis)
+                self._checked_at = time.monotonic()
+        return self._result
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._result is not None
+            and time.monotonic() - self._checked_at < self.cache_seconds
+        )
+
+    async def _check(self, redis: aioredis.Redis) -> Dict[str, Any]:
+        database, redis_status = await asyncio.gather(
+            self._probe(self._ping_database()),
+            self._probe(redis.ping()),
+        )
+        pools = {
+            "database": self._database_pool_usage(),
+            "redis": self._redis_pool_usage(redis),
+        }
+        saturated = any(
+            pool["saturation"] >= self.saturation_threshold for pool in pools.values()
+        )
+        ready = database == "ok" and redis_status == "ok" and not saturated
+        return {
+            "status": "ready" if ready else "not_ready",
+            "checks": {"database": database, "redis": redis_status},
+            "pools": pools,
+        }
+
+    async def _probe(self, check) -> str:
+        try:
+            await asyncio.wait_for(check, self.timeout)
+            return "ok"
+        except asyncio.TimeoutError:
+            return "timeout"
+        except Exception as e:
+            return f"error: {type(e).__name__}"
+
+    async def _ping_database(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    def _database_pool_usage(self) -> Dict[str, Any]:
+        pool = self.engine.sync_engine.pool
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        in_use = pool.checkedout()
+        return {
+            "in_use": in_use,
+            "capacity": capacity,
+            "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+        }
+
+    def _redis_pool_usage(self, redis: aioredis.Redis) -> Dict[str, Any]:
+        pool = redis.connection_pool
+        in_use = getattr(pool, "connections_in_use", 0)
+        capacity = pool.max_connections
+        return {
+            "in_use": in_use,
+            "capacity": capacity,
+            "saturation": round(in_use / capacity, 3) if capacity else 0.0,
+        }
+
+
+def create_health_checker(engine: AsyncEngine) -> HealthChecker:
+    return HealthChecker(
+        engine,
+        timeout=core_settings.health.check_timeout,
+        cache_seconds=core_settings.health.cache_seconds,
+        saturation_threshold=core_settings.health.pool_saturation_threshold,
+    )
@@ -0,0 +1,89 @@
+# core/monitoring/middleware.py
+import logging
+import random
+import re
+import time
+import uuid
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.logging.logger import logger
+from core.monitoring.prometheus import metrics
+
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+def route_template(scope: Scope) -> str:
+    # The router leaves the matched route in the scope; its path keeps the
+    # placeholders, e.g. /ledger/{owner_id}, so owners do not each get a series.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestLoggingMiddleware:
+    # Plain ASGI rather than @app.middleware("http"), which runs every request
+    # through an extra task and memory streams. Gives each request an id (the
+    # client's X-Request-ID when it is sane), times it into
+    # http_request_duration_seconds by route template, and logs a sample of
+    # requests, always including server errors. The log line is only built
+    # when it is going to be written.
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        header: str = "X-Request-ID",
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.header = header
+        self._header_key = header.lower().encode("latin-1")
+
+    def request_id(self, scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == self._header_key:
+                request_id = value.decode("latin-1")
+                if VALID_REQUEST_ID.match(request_id):
+                    return request_id
+                break
+        return uuid.uuid4().hex
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = self.request_id(scope)
+        scope.setdefault("state", {})["request_id"] = request_id
+        header = (self._header_key, request_id.encode("latin-1"))
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = route_template(scope)
+            metrics.http_request_duration.labels(
+                method=scope["method"], route=route, status=status_code
+            ).observe(elapsed)
+            if logger.logger.isEnabledFor(logging.INFO) and (
+                status_code >= 500
+                or self.sample_rate >= 1
+                or random.random() < self.sample_rate
+            ):
+                client = scope.get("client")
+                logger.logger.info(
+                    "%s %s %s %d %.4fs request_id=%s client=%s",
+                    scope["method"],
+                    scope["path"],
+                    route,
+                    status_code,
+                    elapsed,
+                    request_id,
+                    client[0] if client else "N/A",
+                )
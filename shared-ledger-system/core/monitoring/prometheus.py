@@ -1,5 +1,11 @@
 # core/monitoring/prometheus.py
-from prometheus_client import CollectorRegistry, Counter, Histogram, make_asgi_app
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    make_asgi_app,
+)
 from fastapi import FastAPI
 from core.config import core_settings
 
@@ -45,6 +51,108 @@ class PrometheusMetrics:
                 ["endpoint"],
                 registry=self.registry,
             )
+            self.cache_tier_hit_count = Counter(
+                "cache_tier_hit_total",
+                "Total number of cache hits, by cache tier.",
+                ["tier"],
+                registry=self.registry,
+            )
+            self.cache_tier_miss_count = Counter(
+                "cache_tier_miss_total",
+                "Total number of cache misses, by cache tier.",
+                ["tier"],
+                registry=self.registry,
+            )
+            self.redis_pool_connections_in_use = Gauge(
+                "redis_pool_connections_in_use",
+                "Number of Redis connections currently checked out of the pool.",
+                registry=self.registry,
+            )
+            self.redis_pool_max_connections = Gauge(
+                "redis_pool_max_connections",
+                "Maximum number of connections in the Redis pool.",
+                registry=self.registry,
+            )
+            self.redis_pool_wait_seconds = Histogram(
+                "redis_pool_wait_seconds",
+                "Time spent waiting for a Redis connection from the pool.",
+                buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+                registry=self.registry,
+            )
+            self.db_pool_checkout_seconds = Histogram(
+                "db_pool_checkout_seconds",
+                "Time spent checking out a database connection from the pool.",
+                ["database"],
+                buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+                registry=self.registry,
+            )
+            self.db_pool_connections_in_use = Gauge(
+                "db_pool_connections_in_use",
+                "Number of database connections currently checked out of the pool.",
+                ["database"],
+                registry=self.registry,
+            )
+            self.db_pool_overflow = Gauge(
+                "db_pool_overflow",
+                "Number of overflow database connections open beyond the pool size.",
+                ["database"],
+                registry=self.registry,
+            )
+            self.db_pool_size = Gauge(
+                "db_pool_size",
+                "Configured number of persistent database connections.",
+                ["database"],
+                registry=self.registry,
+            )
+            self.db_replica_lag_seconds = Gauge(
+                "db_replica_lag_seconds",
+                "Replication lag last measured on each read replica.",
+                ["replica"],
+                registry=self.registry,
+            )
+            self.db_read_count = Counter(
+                "db_reads_total",
+                "Read sessions handed out, by whether they went to a replica.",
+                ["target"],
+                registry=self.registry,
+            )
+            self.balance_subscribers = Gauge(
+                "balance_subscribers",
+                "Balance streams currently open on this worker.",
+                registry=self.registry,
+            )
+            self.password_hash_queue_seconds = Histogram(
+                "password_hash_queue_seconds",
+                "Time a password hash or check waited for a free worker.",
+                ["operation"],
+                buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+                registry=self.registry,
+            )
+            self.password_hash_seconds = Histogram(
+                "password_hash_seconds",
+                "Time spent hashing or checking a password on a worker.",
+                ["operation"],
+                buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+                registry=self.registry,
+            )
+            self.password_hash_pending = Gauge(
+                "password_hash_pending",
+                "Password hashes and checks running or waiting for a worker.",
+                registry=self.registry,
+            )
+            self.token_cache_count = Counter(
+                "token_cache_total",
+                "Lookups in the verified-token cache, by hit or miss.",
+                ["result"],
+                registry=self.registry,
+            )
+            self.http_request_duration = Histogram(
+                "http_request_duration_seconds",
+                "Time spent serving HTTP requests, by method, route template and status.",
+                ["method", "route", "status"],
+                buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+                registry=self.registry,
+            )
         else:
             self.ledger_operations_counter = self._dummy_metric()
             self.balance_queries_counter = self._dummy_metric()
@@ -52,6 +160,23 @@ class PrometheusMetrics:
             self.api_error_counter = self._dummy_metric()
             self.cache_hit_count = self._dummy_metric()
             self.cache_miss_count = self._dummy_metric()
+            self.cache_tier_hit_count = self._dummy_metric()
+            self.cache_tier_miss_count = self._dummy_metric()
+            self.redis_pool_connections_in_use = self._dummy_metric()
+            self.redis_pool_max_connections = self._dummy_metric()
+            self.redis_pool_wait_seconds = self._dummy_metric()
+            self.db_pool_checkout_seconds = self._dummy_metric()
+            self.db_pool_connections_in_use = self._dummy_metric()
+            self.db_pool_overflow = self._dummy_metric()
+            self.db_pool_size = self._dummy_metric()
+            self.db_replica_lag_seconds = self._dummy_metric()
+            self.db_read_count = self._dummy_metric()
+            self.balance_subscribers = self._dummy_metric()
+            self.password_hash_queue_seconds = self._dummy_metric()
+            self.password_hash_seconds = self._dummy_metric()
+            self.password_hash_pending = self._dummy_metric()
+            self.token_cache_count = self._dummy_metric()
+            self.http_request_duration = self._dummy_metric()
 
     def _dummy_metric(self):
         class DummyMetric:
@@ -61,6 +186,12 @@ class PrometheusMetrics:
             def inc(self, *args, **kwargs):
                 pass
 
+            def dec(self, *args, **kwargs):
+                pass
+
+            def set(self, *args, **kwargs):
+                pass
+
             def observe(self, *args, **kwargs):
                 pass
 
@@ -88,3 +88,168 @@ async def test_get_balance_api(
     response = await client.get("/ledger/test_user", headers=headers)
     assert response.status_code == 200
     assert "balance" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_create_ledger_entries_batch_api(
+    client: AsyncClient, async_session: AsyncSession, db_test_user: User
+):
+    access_token = await get_access_token_for_test_user(db_test_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    owner_id = f"batch_{uuid.uuid4()}"
+    entries = [
+        {
+            "operation": "DAILY_REWARD",
+            "amount": 1,
+            "owner_id": owner_id,
+            "nonce": str(uuid.uuid4()),
+        }
+        for _ in range(100)
+    ]
+    payload = {"entries": entries, "atomic": False}
+    response = await client.post("/ledger/batch", json=payload, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 100
+    assert body["committed"] is True
+    assert {item["status"] for item in body["results"]} == {"created"}
+
+    response = await client.post(
+        "/ledger/batch", json={"entries": entries[:1]}, headers=headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["committed"] is False
+    assert body["results"][0]["status"] == "duplicate"
+
+    response = await client.get(f"/ledger/{owner_id}", headers=headers)
+    assert response.json()["balance"] == 100
+
+
+@pytest.mark.asyncio
+async def test_create_ledger_entry_writes_balance_through(
+    client: AsyncClient, async_session: AsyncSession, db_test_user: User
+):
+    access_token = await get_access_token_for_test_user(db_test_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    owner_id = f"write_through_{uuid.uuid4()}"
+    for _ in range(2):
+        payload = {
+            "operation": "CREDIT_ADD",
+            "amount": 10,
+            "owner_id": owner_id,
+            "nonce": str(uuid.uuid4()),
+        }
+        response = await client.post("/ledger/", json=payload, headers=headers)
+        assert response.status_code == 200
+
+    redis = client.app.state.redis
+    assert await redis.get(f"balance:{owner_id}") == "20"
+    assert await redis.get(f"balance:{owner_id}:version") == "2"
+
+
+@pytest.mark.asyncio
+async def test_get_balances_api(
+    client: AsyncClient, async_session: AsyncSession, db_test_user: User
+):
+    access_token = await get_access_token_for_test_user(db_test_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    funded = f"bulk_{uuid.uuid4()}"
+    empty = f"bulk_{uuid.uuid4()}"
+    payload = {
+        "operation": "CREDIT_ADD",
+        "amount": 10,
+        "owner_id": funded,
+        "nonce": str(uuid.uuid4()),
+    }
+    response = await client.post("/ledger/", json=payload, headers=headers)
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/ledger/balances",
+        json={"owner_ids": [funded, empty, funded]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"owner_id": funded, "balance": 10},
+        {"owner_id": empty, "balance": 0},
+    ]
+
+    redis = client.app.state.redis
+    assert await redis.get(f"balance:{empty}") == "0"
+
+
+@pytest.mark.asyncio
+async def test_list_ledger_entries_api(
+    client: AsyncClient, async_session: AsyncSession, db_test_user: User
+):
+    access_token = await get_access_token_for_test_user(db_test_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    owner_id = f"history_{uuid.uuid4()}"
+    for _ in range(3):
+        payload = {
+            "operation": "CREDIT_ADD",
+            "amount": 10,
+            "owner_id": owner_id,
+            "nonce": str(uuid.uuid4()),
+        }
+        response = await client.post("/ledger/", json=payload, headers=headers)
+        assert response.status_code == 200
+
+    response = await client.get(
+        f"/ledger/{owner_id}/entries", params={"limit": 2}, headers=headers
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["items"]) == 2
+    assert first_page["next_cursor"]
+
+    response = await client.get(
+        f"/ledger/{owner_id}/entries",
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+        headers=headers,
+    )
+    second_page = response.json()
+    assert len(second_page["items"]) == 1
+    assert second_page["next_cursor"] is None
+
+    response = await client.get(
+        f"/ledger/{owner_id}/entries", params={"cursor": "bogus"}, headers=headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_ledger_entries_api(client: AsyncClient, db_test_user: User):
+    access_token = await get_access_token_for_test_user(db_test_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    owner_id = f"export_{uuid.uuid4()}"
+    for _ in range(2):
+        payload = {
+            "operation": "CREDIT_ADD",
+            "amount": 10,
+            "owner_id": owner_id,
+            "nonce": str(uuid.uuid4()),
+        }
+        response = await client.post("/ledger/", json=payload, headers=headers)
+        assert response.status_code == 200
+
+    response = await client.get(
+        "/ledger/export", params={"owner_id": owner_id}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(response.text.splitlines()) == 2
+
+    response = await client.get(
+        "/ledger/export",
+        params={"owner_id": owner_id, "format": "csv"},
+        headers=headers,
+    )
+    assert (
+        response.text.splitlines()[0] == "id,operation,amount,owner_id,nonce,created_on"
+    )
+
+    response = await client.get("/ledger/export", headers=headers)
+    assert response.status_code == 400
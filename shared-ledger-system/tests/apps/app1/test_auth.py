@@ -55,3 +55,14 @@ async def test_auth_register_endpoint(client: AsyncClient):
     assert response.status_code == 201
     assert response.json()["username"] == "newuser"
     assert "id" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_auth_logout_revokes_token(client: AsyncClient, db_test_user: User):
+    access_token = await get_access_token_for_test_user(db_test_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = await client.post("/auth/logout", headers=headers)
+    assert response.status_code == 204
+
+    response = await client.get("/auth/me", headers=headers)
+    assert response.status_code == 401
@@ -0,0 +1,46 @@
+# tests/apps/app1/test_health.py
+import pytest
+from httpx import AsyncClient
+from core.monitoring.health import HealthChecker
+
+
+@pytest.mark.asyncio
+async def test_liveness(client: AsyncClient):
+    response = await client.get("/healthz")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_checks_and_pools(client: AsyncClient, async_engine):
+    from apps.app1.src.main import get_health_checker
+
+    checker = HealthChecker(
+        async_engine, timeout=1.0, cache_seconds=60, saturation_threshold=0.9
+    )
+    client.app.dependency_overrides[get_health_checker] = lambda: checker
+
+    response = await client.get("/readyz")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["checks"] == {"database": "ok", "redis": "ok"}
+    assert body["pools"]["database"]["capacity"] > 0
+
+    # Cached: the second probe returns the very same result object.
+    first = await checker.readiness(client.app.state.redis)
+    assert await checker.readiness(client.app.state.redis) is first
+
+
+@pytest.mark.asyncio
+async def test_readiness_fails_when_pool_saturated(client: AsyncClient, async_engine):
+    from apps.app1.src.main import get_health_checker
+
+    checker = HealthChecker(
+        async_engine, timeout=1.0, cache_seconds=0, saturation_threshold=0.0
+    )
+    client.app.dependency_overrides[get_health_checker] = lambda: checker
+
+    response = await client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
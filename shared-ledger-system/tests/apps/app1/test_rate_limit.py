@@ -6,6 +6,7 @@ from tests.apps.app1.test_auth import get_access_token_for_test_user
 import uuid
 from core.auth.models import User
 from redis import asyncio as aioredis
+from core.config import core_settings
 
 
 @pytest.mark.asyncio
@@ -46,3 +47,36 @@ async def test_rate_limiting(client: AsyncClient, db_test_user: User):
         headers=headers,
     )
     assert response_after_reset.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_headers(client: AsyncClient, db_test_user: User):
+    access_token = await get_access_token_for_test_user(db_test_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    first = await client.get(f"/ledger/{uuid.uuid4()}", headers=headers)
+    second = await client.get(f"/ledger/{uuid.uuid4()}", headers=headers)
+    assert first.status_code == 200
+    limit = core_settings.rate_limit.requests_per_minute
+    assert first.headers["X-RateLimit-Limit"] == str(limit)
+    # Both owners count against the same /ledger/{owner_id} bucket.
+    assert int(second.headers["X-RateLimit-Remaining"]) == (
+        int(first.headers["X-RateLimit-Remaining"]) - 1
+    )
+    assert "X-RateLimit-Reset" in second.headers
+
+
+@pytest.mark.asyncio
+async def test_request_takes_one_rate_limit_token(
+    client: AsyncClient, db_test_user: User
+):
+    access_token = await get_access_token_for_test_user(db_test_user)
+    headers = {"Authorization": f"Bearer {access_token}"}
+    owner_id = f"owner_{uuid.uuid4()}"
+    remaining = []
+    for _ in range(3):
+        response = await client.get(f"/ledger/{owner_id}/entries", headers=headers)
+        assert response.status_code == 200
+        remaining.append(int(response.headers["X-RateLimit-Remaining"]))
+    assert remaining[0] - remaining[1] == 1
+    assert remaining[1] - remaining[2] == 1
@@ -0,0 +1,42 @@
+# tests/apps/app1/test_request_context.py
+from functools import partial
+import pytest
+import pytest_asyncio
+from redis import asyncio as aioredis
+from apps.app1.src.api.core.ledgers.dependencies import RequestContext
+from core.auth.models import User
+from core.config import core_settings
+
+
+@pytest_asyncio.fixture
+async def redis():
+    redis = aioredis.from_url(core_settings.redis.redis_url, decode_responses=True)
+    yield redis
+    await redis.delete("context:a", "context:b")
+    await redis.aclose()
+
+
+async def set_key(pipe, key: str, value: str) -> None:
+    pipe.set(key, value)
+
+
+@pytest.mark.asyncio
+async def test_queued_writes_go_out_in_one_pipeline(redis: aioredis.Redis):
+    ctx = RequestContext(User(id=1, username="user"), "request-1", redis)
+    ctx.queue(partial(set_key, key="context:a", value="1"))
+    ctx.queue(partial(set_key, key="context:b", value="2"))
+    assert await redis.get("context:a") is None
+
+    executed = []
+    original = redis.pipeline
+
+    def pipeline(*args, **kwargs):
+        pipe = original(*args, **kwargs)
+        executed.append(pipe)
+        return pipe
+
+    redis.pipeline = pipeline
+    await ctx.flush()
+    await ctx.flush()
+    assert len(executed) == 1
+    assert await redis.mget("context:a", "context:b") == ["1", "2"]
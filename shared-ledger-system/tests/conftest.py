@@ -23,7 +23,7 @@ from core.config import core_settings
 from core.auth.models import User
 from core.auth.service import get_password_hash
 from core.db.base import Base
-
+from core.db.shards import DEFAULT_SHARD, ShardRouter
 
 DB_HOST = os.getenv("DB_HOST", "db")
 DB_PORT = os.getenv("DB_PORT", "5432")
@@ -33,6 +33,7 @@ TEST_DB_NAME = os.getenv("TEST_DB_NAME", "test_db")
 TEST_DATABASE_URL = (
     f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{TEST_DB_NAME}"
 )
+SHARD_NAMES = ("shard_a", "shard_b", "shard_c")
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -54,7 +55,7 @@ async def test_database():
     await drop_test_database()
 
 
-async def create_test_database():
+async def create_test_database(name: str = TEST_DB_NAME):
     conn = await asyncpg.connect(
         user=DB_USER,
         password=DB_PASSWORD,
@@ -64,15 +65,15 @@ async def create_test_database():
     )
     try:
         exists = await conn.fetchval(
-            f"SELECT 1 FROM pg_database WHERE datname = '{TEST_DB_NAME}'"
+            f"SELECT 1 FROM pg_database WHERE datname = '{name}'"
         )
         if not exists:
-            await conn.execute(f'CREATE DATABASE "{TEST_DB_NAME}"')
+            await conn.execute(f'CREATE DATABASE "{name}"')
     finally:
         await conn.close()
 
 
-async def drop_test_database():
+async def drop_test_database(name: str = TEST_DB_NAME):
     conn = await asyncpg.connect(
         user=DB_USER,
         password=DB_PASSWORD,
@@ -81,15 +82,13 @@ async def drop_test_database():
         database="postgres",
     )
     try:
-        await conn.execute(
-            f"""
+        await conn.execute(f"""
             SELECT pg_terminate_backend(pid)
             FROM pg_stat_activity
-            WHERE datname = '{TEST_DB_NAME}' AND pid <> pg_backend_pid();
-        """
-        )
+            WHERE datname = '{name}' AND pid <> pg_backend_pid();
+        """)
         await asyncio.sleep(1)
-        await conn.execute(f'DROP DATABASE IF EXISTS "{TEST_DB_NAME}"')
+        await conn.execute(f'DROP DATABASE IF EXISTS "{name}"')
     finally:
         await conn.close()
 
@@ -113,13 +112,11 @@ async def initialize_test_database(async_engine):
         database="postgres",
     )
     try:
-        await conn.execute(
-            f"""
+        await conn.execute(f"""
             SELECT pg_terminate_backend(pid)
             FROM pg_stat_activity
             WHERE datname = '{TEST_DB_NAME}' AND pid <> pg_backend_pid();
-        """
-        )
+        """)
     finally:
         await conn.close()
 
@@ -160,10 +157,43 @@ async def async_session(async_engine):
             await session.close()
 
 
+@pytest_asyncio.fixture(scope="session")
+async def shard_engines():
+    # One extra local database per ledger shard.
+    engines = {}
+    for shard in SHARD_NAMES:
+        name = f"{TEST_DB_NAME}_{shard}"
+        await create_test_database(name)
+        engines[shard] = create_async_engine(
+            f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{name}",
+            pool_size=5,
+            max_overflow=0,
+        )
+    yield engines
+    for shard, engine in engines.items():
+        await engine.dispose()
+        await drop_test_database(f"{TEST_DB_NAME}_{shard}")
+
+
+@pytest_asyncio.fixture
+async def shard_router(shard_engines):
+    session_factories = {}
+    for shard, engine in shard_engines.items():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        session_factories[shard] = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+    return ShardRouter(session_factories)
+
+
 @pytest_asyncio.fixture
 async def client(async_engine):
     from apps.app1.src.main import app
     from core.db.base import get_session
+    from core.db.replicas import get_read_session
+    from core.db.shards import get_shard_router
     from httpx import AsyncClient
     from httpx._transports.asgi import ASGITransport
     from core.config import core_settings
@@ -176,6 +206,14 @@ async def client(async_engine):
             yield session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    app.dependency_overrides[get_shard_router] = lambda: ShardRouter(
+        {
+            DEFAULT_SHARD: sessionmaker(
+                async_engine, expire_on_commit=False, class_=AsyncSession
+            )
+        }
+    )
 
     redis_instance = aioredis.from_url(
         core_settings.redis.redis_url, decode_responses=True
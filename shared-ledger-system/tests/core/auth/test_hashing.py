@@ -0,0 +1,54 @@
+# tests/core/auth/test_hashing.py
+import asyncio
+import pytest
+from core.auth.hashing import PasswordHasher, PasswordHasherBusyError
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_on_pool():
+    hasher = PasswordHasher(rounds=4, workers=2)
+    try:
+        hashed = await hasher.hash("secret")
+        assert hashed.startswith("$2b$04$")
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+    finally:
+        hasher.close()
+
+
+@pytest.mark.asyncio
+async def test_verify_and_update_rehashes_when_rounds_change():
+    old, new = PasswordHasher(rounds=4), PasswordHasher(rounds=5)
+    try:
+        hashed = await old.hash("secret")
+        assert await old.verify_and_update("secret", hashed) == (True, None)
+
+        verified, rehashed = await new.verify_and_update("secret", hashed)
+        assert verified and rehashed.startswith("$2b$05$")
+        assert await new.verify_and_update("secret", rehashed) == (True, None)
+        assert await new.verify_and_update("wrong", hashed) == (False, None)
+    finally:
+        old.close()
+        new.close()
+
+
+@pytest.mark.asyncio
+async def test_rejects_work_beyond_queue_limit():
+    hasher = PasswordHasher(rounds=10, workers=1, max_queue=1)
+    try:
+        results = await asyncio.gather(
+            *(hasher.hash("secret") for _ in range(3)), return_exceptions=True
+        )
+        assert sum(isinstance(r, PasswordHasherBusyError) for r in results) == 1
+        assert sum(isinstance(r, str) for r in results) == 2
+    finally:
+        hasher.close()
+
+
+@pytest.mark.asyncio
+async def test_process_pool():
+    hasher = PasswordHasher(rounds=4, executor="process", workers=1)
+    try:
+        assert await hasher.verify("secret", await hasher.hash("secret"))
+    finally:
+        hasher.close()
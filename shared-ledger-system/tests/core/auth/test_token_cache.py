@@ -0,0 +1,111 @@
+# tests/core/auth/test_token_cache.py
+import asyncio
+import time
+from unittest.mock import AsyncMock
+import pytest
+import pytest_asyncio
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.auth import service
+from core.auth.models import User
+from core.auth.token_cache import TokenCache, token_cache
+from core.config import core_settings
+
+CHANNEL = "test:auth:revoked"
+
+
+@pytest_asyncio.fixture
+async def redis():
+    redis = aioredis.from_url(core_settings.redis.redis_url, decode_responses=True)
+    yield redis
+    await redis.aclose()
+
+
+@pytest_asyncio.fixture
+async def caches(redis: aioredis.Redis):
+    # Two caches stand in for two workers sharing Redis.
+    caches = [TokenCache(redis, 100, 600, CHANNEL) for _ in range(2)]
+    for cache in caches:
+        await cache.start()
+    await asyncio.sleep(0.1)
+    yield caches
+    for cache in caches:
+        await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_entries_live_until_token_expiry(caches):
+    cache = caches[0]
+    user = User(id=1, username="user")
+    cache.set("live", user, time.time() + 60)
+    cache.set("short", user, time.time() + 0.05)
+    cache.set("expired", user, time.time() - 1)
+    await asyncio.sleep(0.1)
+    assert cache.get("live") is user
+    assert cache.get("short") is None
+    assert cache.get("expired") is None
+
+
+@pytest.mark.asyncio
+async def test_revocation_reaches_every_worker(caches):
+    first, second = caches
+    user = User(id=1, username="user")
+    expires_at = time.time() + 60
+    for cache in caches:
+        cache.set("token", user, expires_at)
+
+    await first.revoke("token", expires_at)
+    await asyncio.sleep(0.1)
+    assert first.get("token") is None
+    assert second.get("token") is None
+    assert await second.is_revoked("token")
+    await first.redis.delete(f"{CHANNEL}:token")
+
+
+@pytest.mark.asyncio
+async def test_revocation_during_lookup_keeps_token_out(caches):
+    first, second = caches
+    user = User(id=1, username="user")
+    expires_at = time.time() + 60
+    # second checked Redis before the revocation, then looked the user up.
+    generation = second.generation
+    await first.revoke("token", expires_at)
+    await asyncio.sleep(0.1)
+    second.set("token", user, expires_at, generation)
+    assert second.get("token") is None
+
+    second.set("token", user, expires_at, second.generation)
+    assert second.get("token") is user
+    await first.redis.delete(f"{CHANNEL}:token")
+
+
+@pytest.mark.asyncio
+async def test_unused_without_listener(redis: aioredis.Redis):
+    cache = TokenCache(redis, 100, 600, CHANNEL)
+    cache.set("token", User(id=1, username="user"), time.time() + 60)
+    assert cache.get("token") is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_skips_lookup_for_cached_token(
+    db_test_user: User, async_session: AsyncSession
+):
+    await token_cache.start()
+    await asyncio.sleep(0.1)
+    try:
+        token = service.create_access_token(
+            {"sub": db_test_user.username, "user_id": db_test_user.id}
+        )
+        assert (await service.get_current_user(token, async_session)).id == (
+            db_test_user.id
+        )
+
+        unused_session = AsyncMock(AsyncSession)
+        user = await service.get_current_user(token, unused_session)
+        assert user.id == db_test_user.id
+        unused_session.execute.assert_not_called()
+
+        await service.revoke_token(token)
+        assert await service.get_user_for_token(token, async_session) is None
+    finally:
+        await token_cache.close()
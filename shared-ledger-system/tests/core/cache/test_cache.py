@@ -87,3 +87,111 @@ async def test_cache_invalidate_dict(test_cache_fixture: cache):
     assert await test_cache_fixture.get_dict(key) == value
     await test_cache_fixture.invalidate_key(key)
     assert await test_cache_fixture.get_dict(key) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_set_value_if_newer(test_cache_fixture: cache):
+    key = "versioned_key"
+    assert await test_cache_fixture.set_value_if_newer(key, "10", 2)
+    assert not await test_cache_fixture.set_value_if_newer(key, "5", 1)
+    assert await test_cache_fixture.get_value(key) == "10"
+    assert await test_cache_fixture.set_value_if_newer(key, "10", 2)
+    assert await test_cache_fixture.set_value_if_newer(key, "12", 3)
+    assert await test_cache_fixture.get_value(key) == "12"
+
+
+@pytest.mark.asyncio
+async def test_cache_get_set_values(test_cache_fixture: cache):
+    await test_cache_fixture.set_values_if_newer(
+        {"bulk_a": ("1", 1), "bulk_b": ("2", 1)}
+    )
+    assert not await test_cache_fixture.set_value_if_newer("bulk_a", "0", 0)
+    assert await test_cache_fixture.get_values(["bulk_a", "missing", "bulk_b"]) == [
+        "1",
+        None,
+        "2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cache_get_or_compute_single_flight(test_cache_fixture: cache):
+    key = "single_flight_key"
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        await test_cache_fixture.set_value(key, "computed")
+        return "computed"
+
+    misses = 0
+
+    def count_miss():
+        nonlocal misses
+        misses += 1
+
+    results = await asyncio.gather(
+        *(
+            test_cache_fixture.get_or_compute(key, compute, on_miss=count_miss)
+            for _ in range(50)
+        )
+    )
+    assert results == ["computed"] * 50
+    assert calls == 1
+    # Callers that joined the load in flight were not served from the cache.
+    assert misses == 50
+
+    assert (
+        await test_cache_fixture.get_or_compute(key, compute, on_miss=count_miss)
+        == "computed"
+    )
+    assert calls == 1
+    assert misses == 50
+
+
+@pytest.mark.asyncio
+async def test_cache_get_or_compute_distributed_lock(test_cache_fixture: cache):
+    from core.cache.cache import Cache
+
+    other_process_cache = Cache(core_settings.redis.redis_url)
+    key = "locked_key"
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        await test_cache_fixture.set_value(key, "computed")
+        return "computed"
+
+    try:
+        results = await asyncio.gather(
+            test_cache_fixture.get_or_compute(key, compute, distributed_lock=True),
+            other_process_cache.get_or_compute(key, compute, distributed_lock=True),
+        )
+    finally:
+        await other_process_cache.redis.aclose()
+
+    assert results == ["computed", "computed"]
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_get_or_compute_refreshes_hot_keys_early(
+    test_cache_fixture: cache, monkeypatch
+):
+    key = "early_refresh_key"
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await test_cache_fixture.set_value(key, str(calls), ttl=60)
+        return str(calls)
+
+    assert await test_cache_fixture.get_or_compute(key, compute) == "1"
+    assert await test_cache_fixture.get_or_compute(key, compute) == "1"
+
+    monkeypatch.setattr(core_settings.cache, "early_refresh_beta", 1e9)
+    assert await test_cache_fixture.get_or_compute(key, compute) == "2"
@@ -0,0 +1,30 @@
+# tests/core/cache/test_pool.py
+import asyncio
+import pytest
+from core.cache.pool import InstrumentedConnectionPool, create_redis_client
+from core.config import core_settings
+
+
+@pytest.mark.asyncio
+async def test_redis_client_uses_bounded_pool():
+    redis = create_redis_client()
+    try:
+        pool = redis.connection_pool
+        assert isinstance(pool, InstrumentedConnectionPool)
+        assert pool.max_connections == core_settings.redis.max_connections
+        assert await redis.ping()
+    finally:
+        await redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_redis_pool_waits_for_free_connection(monkeypatch):
+    monkeypatch.setattr(core_settings.redis, "max_connections", 2)
+    redis = create_redis_client()
+    try:
+        results = await asyncio.gather(*(redis.ping() for _ in range(20)))
+        assert all(results)
+        pool = redis.connection_pool
+        assert len(pool._available_connections) + len(pool._in_use_connections) <= 2
+    finally:
+        await redis.aclose()
@@ -0,0 +1,41 @@
+# tests/core/cache/test_rate_limit.py
+import asyncio
+import pytest
+import pytest_asyncio
+from redis import asyncio as aioredis
+from core.cache.rate_limit import RateLimiter
+from core.config import core_settings
+
+
+@pytest_asyncio.fixture(scope="function")
+async def limiter():
+    redis = aioredis.from_url(core_settings.redis.redis_url, decode_responses=True)
+    await redis.flushdb()
+    yield RateLimiter(redis)
+    await redis.flushdb()
+    await redis.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst_then_rejects(limiter: RateLimiter):
+    results = [await limiter.acquire("ratelimit:test", 3, 60) for _ in range(4)]
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results] == [2, 1, 0, 0]
+    assert results[-1].retry_after_ms > 0
+    assert results[-1].reset_ms <= 60000
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_is_atomic_under_concurrency(limiter: RateLimiter):
+    results = await asyncio.gather(
+        *(limiter.acquire("ratelimit:burst", 5, 60) for _ in range(50))
+    )
+    assert sum(result.allowed for result in results) == 5
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_refills(limiter: RateLimiter):
+    assert (await limiter.acquire("ratelimit:refill", 1, 1)).allowed
+    assert not (await limiter.acquire("ratelimit:refill", 1, 1)).allowed
+    await asyncio.sleep(1.1)
+    assert (await limiter.acquire("ratelimit:refill", 1, 1)).allowed
@@ -0,0 +1,90 @@
+# tests/core/cache/test_tiered_cache.py
+import asyncio
+import uuid
+import pytest
+import pytest_asyncio
+from core.cache.cache import Cache
+from core.cache.tiered import LocalCache, TieredCache
+from core.config import core_settings
+
+
+@pytest_asyncio.fixture(scope="function")
+async def backend():
+    test_cache = Cache(core_settings.redis.redis_url)
+    await test_cache.redis.flushdb()
+    yield test_cache
+    await test_cache.redis.flushdb()
+    await test_cache.redis.aclose()
+
+
+def make_tiered_cache(backend: Cache, channel: str, ttl: float = 30) -> TieredCache:
+    return TieredCache(backend, max_size=100, local_ttl=ttl, channel=channel)
+
+
+def test_local_cache_evicts_least_recently_used():
+    local = LocalCache(max_size=2, ttl=30)
+    local.set("a", "1")
+    local.set("b", "2")
+    assert local.get("a") == "1"
+    local.set("c", "3")
+    assert local.get("b") is None
+    assert local.get("a") == "1"
+    assert local.get("c") == "3"
+    assert len(local) == 2
+
+
+@pytest.mark.asyncio
+async def test_local_cache_expires_entries():
+    local = LocalCache(max_size=10, ttl=0.1)
+    local.set("a", "1")
+    assert local.get("a") == "1"
+    await asyncio.sleep(0.2)
+    assert local.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_serves_from_local_tier(backend: Cache):
+    tiered = make_tiered_cache(backend, f"test:{uuid.uuid4()}")
+    await tiered.set_value("key", "value")
+    await backend.redis.delete("key")
+    assert await tiered.get_value("key") == "value"
+
+    await backend.set_value("other", "from_redis")
+    assert await tiered.get_value("other") == "from_redis"
+    assert tiered.local.get("other") == "from_redis"
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_invalidation_reaches_other_workers(backend: Cache):
+    channel = f"test:{uuid.uuid4()}"
+    writer = make_tiered_cache(backend, channel)
+    reader = make_tiered_cache(backend, channel)
+    await reader.start()
+    try:
+        await asyncio.sleep(0.1)
+        await writer.set_value("balance:owner", "10")
+        assert await reader.get_value("balance:owner") == "10"
+
+        await writer.invalidate_key("balance:owner")
+        await asyncio.sleep(0.1)
+        assert reader.local.get("balance:owner") is None
+        assert await reader.get_value("balance:owner") is None
+    finally:
+        await reader.close()
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_keeps_a_rejected_value_out_of_local_tier(
+    backend: Cache,
+):
+    tiered = make_tiered_cache(backend, f"test:{uuid.uuid4()}")
+
+    async def compute():
+        # A newer version lands in Redis while this one was being loaded.
+        await backend.set_value_if_newer("balance", "new", 2)
+        await tiered.set_value_if_newer("balance", "old", 1)
+        return "old"
+
+    assert await tiered.get_or_compute("balance", compute) == "old"
+    assert tiered.local.get("balance") is None
+    assert await tiered.get_value("balance") == "new"
@@ -0,0 +1,51 @@
+# tests/core/db/test_db_pool.py
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from core.db.pool import InstrumentedAsyncQueuePool, instrument_pool, warm_up_pool
+from core.monitoring.prometheus import metrics
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_opens_connections():
+    engine = create_async_engine(
+        TEST_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, pool_size=3
+    )
+    instrument_pool(engine, "warm_up")
+    try:
+        pool = engine.sync_engine.pool
+        assert pool.checkedin() == 0
+        await warm_up_pool(engine, 3)
+        assert pool.checkedin() == 3
+        assert pool.checkedout() == 0
+
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+            assert pool.checkedout() == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_follow_the_pool_after_dispose():
+    engine = create_async_engine(
+        TEST_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, pool_size=2
+    )
+    instrument_pool(engine, "disposed")
+
+    def in_use() -> float:
+        return metrics.registry.get_sample_value(
+            "db_pool_connections_in_use", {"database": "disposed"}
+        )
+
+    try:
+        await warm_up_pool(engine, 2)
+        await engine.dispose()
+        assert engine.sync_engine.pool.database == "disposed"
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert in_use() == 1
+        assert in_use() == 0
+    finally:
+        await engine.dispose()
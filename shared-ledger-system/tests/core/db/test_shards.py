@@ -0,0 +1,183 @@
+# tests/core/db/test_shards.py
+import uuid
+import pytest
+from sqlalchemy import func, select
+from core.db.shards import HashRing, ShardRouter
+from core.ledgers.exceptions import CrossShardBatchError
+from core.ledgers.models import LedgerEntry
+from core.ledgers.schemas import LedgerEntryCreate
+from core.ledgers.service import LedgerService
+
+
+@pytest.fixture
+def ledger_service():
+    return LedgerService({"CREDIT_ADD": 10, "CREDIT_SPEND": -1})
+
+
+def test_hash_ring_is_stable_and_balanced():
+    keys = [f"owner_{i}" for i in range(3000)]
+    ring = HashRing(["shard_a", "shard_b", "shard_c"])
+    placement = {key: ring.node_for(key) for key in keys}
+    assert placement == {
+        key: HashRing(["shard_c", "shard_a", "shard_b"]).node_for(key) for key in keys
+    }
+    for shard in ("shard_a", "shard_b", "shard_c"):
+        assert 600 < list(placement.values()).count(shard) < 1400
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    keys = [f"owner_{i}" for i in range(3000)]
+    before = HashRing(["shard_a", "shard_b", "shard_c"])
+    after = HashRing(["shard_a", "shard_b", "shard_c", "shard_d"])
+    moved = [key for key in keys if before.node_for(key) != after.node_for(key)]
+    assert all(after.node_for(key) == "shard_d" for key in moved)
+    assert len(moved) < len(keys) / 2
+
+
+def test_hash_ring_needs_a_node():
+    with pytest.raises(ValueError):
+        HashRing([])
+
+
+@pytest.mark.asyncio
+async def test_entries_and_balances_are_routed_by_owner(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    owners = [f"owner_{uuid.uuid4()}" for _ in range(12)]
+    results = await ledger_service.create_entries_on_shards(
+        shard_router,
+        [
+            LedgerEntryCreate(
+                operation="CREDIT_ADD",
+                amount=0,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+            )
+            for owner_id in owners
+        ],
+        atomic=False,
+    )
+    assert [result.owner_id for result in results] == owners
+    assert all(result.status == "created" for result in results)
+
+    for shard, shard_owners in shard_router.group_by_shard(owners).items():
+        async with shard_router.session_factories[shard]() as session:
+            stored = await session.execute(select(LedgerEntry.owner_id).distinct())
+            assert set(stored.scalars()) == set(shard_owners)
+
+    balances = await ledger_service.get_versioned_balances_on_shards(
+        shard_router, owners + ["unknown"]
+    )
+    assert {owner_id: item.balance for owner_id, item in balances.items()} == {
+        **{owner_id: 10 for owner_id in owners},
+        "unknown": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_atomic_batch_must_stay_on_one_shard(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    groups = shard_router.group_by_shard(f"owner_{i}" for i in range(50))
+    one_shard = next(iter(groups.values()))[:2]
+    spread = [owners[0] for owners in groups.values()]
+
+    def entries(owner_ids):
+        return [
+            LedgerEntryCreate(
+                operation="CREDIT_ADD",
+                amount=0,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+            )
+            for owner_id in owner_ids
+        ]
+
+    results = await ledger_service.create_entries_on_shards(
+        shard_router, entries(one_shard), atomic=True
+    )
+    assert all(result.status == "created" for result in results)
+
+    with pytest.raises(CrossShardBatchError):
+        await ledger_service.create_entries_on_shards(
+            shard_router, entries(spread), atomic=True
+        )
+    stored = 0
+    for session_factory in shard_router.session_factories.values():
+        async with session_factory() as session:
+            stored += await session.scalar(
+                select(func.count())
+                .select_from(LedgerEntry)
+                .where(LedgerEntry.owner_id.in_(spread))
+            )
+    # Only the owner shared with the first, single-shard batch has an entry.
+    assert stored == 1
+
+
+@pytest.mark.asyncio
+async def test_nonce_is_scoped_to_owner(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    groups = shard_router.group_by_shard(f"owner_{uuid.uuid4()}" for _ in range(50))
+    first, second = [owners[0] for owners in list(groups.values())[:2]]
+    nonce = str(uuid.uuid4())
+    batch = [
+        LedgerEntryCreate(
+            operation="CREDIT_ADD", amount=0, owner_id=owner_id, nonce=nonce
+        )
+        for owner_id in (first, second, first)
+    ]
+    results = await ledger_service.create_entries_on_shards(
+        shard_router, batch, atomic=False
+    )
+    assert [result.status for result in results] == [
+        "created",
+        "created",
+        "duplicate",
+    ]
+    # A retry lands on the owner's shard, where its nonce is already claimed.
+    results = await ledger_service.create_entries_on_shards(
+        shard_router, batch[:2], atomic=False
+    )
+    assert [result.status for result in results] == ["duplicate", "duplicate"]
+
+
+@pytest.mark.asyncio
+async def test_atomic_batch_with_repeated_nonce_applies_nothing(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    nonce = str(uuid.uuid4())
+    results = await ledger_service.create_entries_on_shards(
+        shard_router,
+        [
+            LedgerEntryCreate(
+                operation="CREDIT_ADD", amount=0, owner_id=owner_id, nonce=nonce
+            ),
+            LedgerEntryCreate(
+                operation="CREDIT_ADD",
+                amount=0,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+            ),
+            LedgerEntryCreate(
+                operation="CREDIT_ADD", amount=0, owner_id=owner_id, nonce=nonce
+            ),
+        ],
+        atomic=True,
+    )
+    assert [result.status for result in results] == [
+        "not_applied",
+        "not_applied",
+        "duplicate",
+    ]
+    async with shard_router.session(owner_id) as session:
+        assert await ledger_service.get_balance(session, owner_id) == 0
+        assert (
+            await session.scalar(
+                select(func.count())
+                .select_from(LedgerEntry)
+                .where(LedgerEntry.owner_id == owner_id)
+            )
+            == 0
+        )
@@ -0,0 +1,81 @@
+# tests/core/ledgers/test_checkpoints.py
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from core.ledgers.checkpoints import CheckpointCompactor
+from core.ledgers.models import LedgerCheckpoint, LedgerEntry
+from core.ledgers.service import LedgerService
+
+
+@pytest.mark.asyncio
+async def test_compactor_catches_up_in_chunks(
+    async_engine, async_session: AsyncSession
+):
+    owners = [f"owner_{uuid.uuid4()}" for _ in range(3)]
+    settled = datetime.utcnow() - timedelta(hours=1)
+    async_session.add_all(
+        [
+            LedgerEntry(
+                operation="DAILY_REWARD",
+                amount=1,
+                owner_id=owners[i % 3],
+                nonce=str(uuid.uuid4()),
+                created_on=settled,
+            )
+            for i in range(30)
+        ]
+    )
+    await async_session.commit()
+
+    session_factory = sessionmaker(
+        async_engine, expire_on_commit=False, class_=AsyncSession
+    )
+    compactor = CheckpointCompactor(
+        LedgerService({"DAILY_REWARD": 1}), session_factory, max_entries=7
+    )
+    assert await compactor.run_once() == 30
+    assert await compactor.run_once() == 0
+
+    for owner_id in owners:
+        checkpoint = await async_session.get(LedgerCheckpoint, owner_id)
+        assert checkpoint.balance == 10
+
+
+@pytest.mark.asyncio
+async def test_compactor_moves_past_rolled_back_writes(
+    async_engine, async_session: AsyncSession
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    session_factory = sessionmaker(
+        async_engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+    def reward() -> LedgerEntry:
+        return LedgerEntry(
+            operation="DAILY_REWARD",
+            amount=1,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+            created_on=datetime.utcnow(),
+        )
+
+    # Rolled-back transactions leave gaps in both ids and transaction ids.
+    for commit in (True, False, False, True, False, True):
+        async with session_factory() as session:
+            session.add_all([reward() for _ in range(3)])
+            await session.flush()
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+
+    compactor = CheckpointCompactor(
+        LedgerService({"DAILY_REWARD": 1}), session_factory, max_entries=2
+    )
+    assert await asyncio.wait_for(compactor.run_once(), 10) == 9
+    assert await asyncio.wait_for(compactor.run_once(), 10) == 0
+    checkpoint = await async_session.get(LedgerCheckpoint, owner_id)
+    assert checkpoint.balance == 9
@@ -0,0 +1,70 @@
+# tests/core/ledgers/test_export.py
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.ledgers.export import EXPORT_FIELDS, export_entries, to_csv, to_ndjson
+from core.ledgers.models import LedgerEntry
+
+ROW = (7, "CREDIT_ADD", 10, "owner,1", "nonce-7", datetime(2026, 1, 2, 3, 4, 5))
+
+
+def test_to_ndjson():
+    assert json.loads(to_ndjson([ROW])) == {
+        "id": 7,
+        "operation": "CREDIT_ADD",
+        "amount": 10,
+        "owner_id": "owner,1",
+        "nonce": "nonce-7",
+        "created_on": "2026-01-02T03:04:05",
+    }
+
+
+def test_to_csv_quotes_fields():
+    rows = list(csv.reader(io.StringIO(to_csv([ROW], header=True))))
+    assert rows == [
+        list(EXPORT_FIELDS),
+        ["7", "CREDIT_ADD", "10", "owner,1", "nonce-7", "2026-01-02T03:04:05"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_entries_streams_in_batches(async_session: AsyncSession):
+    owner_id = f"export_{uuid.uuid4()}"
+    async_session.add_all(
+        [
+            LedgerEntry(
+                operation="CREDIT_ADD",
+                amount=10,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+                created_on=datetime(2026, 1, 1 + i % 2, 12),
+            )
+            for i in range(25)
+        ]
+    )
+    await async_session.commit()
+
+    chunks = [
+        chunk
+        async for chunk in export_entries(
+            async_session, "ndjson", owner_id=owner_id, batch_size=10
+        )
+    ]
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert len(lines) == 25
+    ids = [json.loads(line)["id"] for line in lines]
+    assert ids == sorted(ids)
+
+    day_chunks = [
+        chunk
+        async for chunk in export_entries(
+            async_session, "csv", owner_id=owner_id, day=date(2026, 1, 2)
+        )
+    ]
+    # Header plus the 12 entries created on the second day.
+    assert len("".join(day_chunks).splitlines()) == 13
@@ -0,0 +1,113 @@
+# tests/core/ledgers/test_group_commit.py
+import asyncio
+import uuid
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from core.ledgers.group_commit import GroupCommitWriter
+from core.ledgers.service import LedgerService
+from core.ledgers.schemas import LedgerEntryCreate
+from core.ledgers.exceptions import InsufficientBalanceError, DuplicateTransactionError
+
+
+@pytest.fixture
+def ledger_service():
+    config = {
+        "DAILY_REWARD": 1,
+        "SIGNUP_CREDIT": 3,
+        "CREDIT_SPEND": -1,
+        "CREDIT_ADD": 10,
+    }
+    return LedgerService(config)
+
+
+@pytest_asyncio.fixture
+async def writer(
+    ledger_service: LedgerService, async_session: AsyncSession, async_engine
+):
+    Session = sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+    group_writer = GroupCommitWriter(
+        ledger_service, Session, max_batch_size=50, max_delay_ms=5
+    )
+    yield group_writer
+    await group_writer.close()
+
+
+@pytest.mark.asyncio
+async def test_group_commit_returns_per_caller_results(
+    writer: GroupCommitWriter,
+    ledger_service: LedgerService,
+    async_session: AsyncSession,
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    duplicate_nonce = str(uuid.uuid4())
+    entries = [
+        LedgerEntryCreate(
+            operation="SIGNUP_CREDIT",
+            amount=3,
+            owner_id=owner_id,
+            nonce=duplicate_nonce,
+        ),
+        LedgerEntryCreate(
+            operation="SIGNUP_CREDIT",
+            amount=3,
+            owner_id=owner_id,
+            nonce=duplicate_nonce,
+        ),
+    ] + [
+        LedgerEntryCreate(
+            operation="CREDIT_SPEND",
+            amount=-1,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+        )
+        for _ in range(5)
+    ]
+
+    results = await asyncio.gather(
+        *(writer.submit(entry) for entry in entries), return_exceptions=True
+    )
+
+    assert results[0].status == "created"
+    assert isinstance(results[1], DuplicateTransactionError)
+    assert [result.status for result in results[2:5]] == ["created"] * 3
+    assert all(isinstance(result, InsufficientBalanceError) for result in results[5:])
+    assert await ledger_service.get_balance(async_session, owner_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_group_commit_coalesces_into_batches(
+    writer: GroupCommitWriter,
+    ledger_service: LedgerService,
+    async_session: AsyncSession,
+    monkeypatch,
+):
+    batch_sizes = []
+    create_entries = ledger_service.create_entries
+
+    async def recording_create_entries(session, entries, atomic=True):
+        batch_sizes.append(len(entries))
+        return await create_entries(session, entries, atomic=atomic)
+
+    monkeypatch.setattr(ledger_service, "create_entries", recording_create_entries)
+    owner_id = f"owner_{uuid.uuid4()}"
+
+    await asyncio.gather(
+        *(
+            writer.submit(
+                LedgerEntryCreate(
+                    operation="DAILY_REWARD",
+                    amount=1,
+                    owner_id=owner_id,
+                    nonce=str(uuid.uuid4()),
+                )
+            )
+            for _ in range(120)
+        )
+    )
+
+    assert sum(batch_sizes) == 120
+    assert len(batch_sizes) < 120
+    assert max(batch_sizes) <= 50
+    assert await ledger_service.get_balance(async_session, owner_id) == 120
@@ -0,0 +1,163 @@
+# tests/core/ledgers/test_outbox.py
+import uuid
+import pytest
+import pytest_asyncio
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from core.config import core_settings
+from core.ledgers.exceptions import InvalidOffsetError
+from core.ledgers.models import LedgerOutbox
+from core.ledgers.outbox import START_OFFSET, ChangeFeed, OutboxRelay
+from core.ledgers.schemas import LedgerEntryCreate
+from core.ledgers.service import LedgerService
+
+STREAM = "test:ledger:changes"
+
+
+@pytest.fixture
+def ledger_service():
+    return LedgerService({"CREDIT_ADD": 10, "CREDIT_SPEND": -1})
+
+
+@pytest_asyncio.fixture
+async def redis():
+    redis = aioredis.from_url(core_settings.redis.redis_url, decode_responses=True)
+    await redis.delete(STREAM)
+    yield redis
+    await redis.delete(STREAM)
+    await redis.aclose()
+
+
+@pytest.fixture
+def relay(async_session: AsyncSession, redis: aioredis.Redis):
+    session_factory = sessionmaker(
+        async_session.bind, expire_on_commit=False, class_=AsyncSession
+    )
+    return OutboxRelay(session_factory, redis, STREAM, batch_size=2)
+
+
+async def add_entries(
+    ledger_service: LedgerService, session: AsyncSession, owner_id: str, count: int
+):
+    for _ in range(count):
+        await ledger_service.create_entry(
+            session,
+            LedgerEntryCreate(
+                operation="CREDIT_ADD",
+                amount=0,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_entries_are_written_to_outbox(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    await add_entries(ledger_service, async_session, "owner", 2)
+    rows = (
+        await async_session.execute(select(LedgerOutbox).order_by(LedgerOutbox.id))
+    ).scalars()
+    assert [(row.owner_id, row.balance) for row in rows] == [
+        ("owner", 10),
+        ("owner", 20),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_largest_batch_is_written_to_outbox(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    size = core_settings.ledger.batch_max_size
+    results = await ledger_service.create_entries(
+        async_session,
+        [
+            LedgerEntryCreate(
+                operation="CREDIT_ADD",
+                amount=0,
+                owner_id=f"owner_{i % 50}",
+                nonce=str(uuid.uuid4()),
+            )
+            for i in range(size)
+        ],
+        atomic=True,
+    )
+    assert {result.status for result in results} == {"created"}
+    assert await async_session.scalar(select(func.count(LedgerOutbox.id))) == size
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_in_commit_order(
+    ledger_service: LedgerService,
+    async_session: AsyncSession,
+    redis: aioredis.Redis,
+    relay: OutboxRelay,
+):
+    await add_entries(ledger_service, async_session, "owner_a", 3)
+    await add_entries(ledger_service, async_session, "owner_b", 2)
+
+    assert await relay.run_once() == 5
+    assert await async_session.scalar(select(func.count(LedgerOutbox.id))) == 0
+
+    feed = ChangeFeed(redis, STREAM)
+    changes, offset = await feed.read(START_OFFSET, 100)
+    assert [(change.owner_id, change.balance) for change in changes] == [
+        ("owner_a", 10),
+        ("owner_a", 20),
+        ("owner_a", 30),
+        ("owner_b", 10),
+        ("owner_b", 20),
+    ]
+    assert await feed.read(offset, 100) == ([], offset)
+
+    owned, _ = await feed.read(START_OFFSET, 100, owner_id="owner_b")
+    assert [change.balance for change in owned] == [10, 20]
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_rows_when_publish_fails(
+    ledger_service: LedgerService,
+    async_session: AsyncSession,
+    relay: OutboxRelay,
+):
+    await add_entries(ledger_service, async_session, "owner", 1)
+    broken = aioredis.from_url("redis://localhost:1/0")
+    relay.use_client(broken)
+    with pytest.raises(RedisError):
+        await relay.run_once()
+    await broken.aclose()
+    assert await async_session.scalar(select(func.count(LedgerOutbox.id))) == 1
+
+
+@pytest.mark.asyncio
+async def test_change_feed_offsets(redis: aioredis.Redis):
+    feed = ChangeFeed(redis, STREAM)
+    await redis.delete("changes:offset:consumer")
+    assert await feed.committed_offset("consumer") == START_OFFSET
+    await feed.commit_offset("consumer", "1700000000000-3")
+    assert await feed.committed_offset("consumer") == "1700000000000-3"
+    await redis.delete("changes:offset:consumer")
+
+    with pytest.raises(InvalidOffsetError):
+        await feed.commit_offset("consumer", "$")
+    with pytest.raises(InvalidOffsetError):
+        await feed.read("not-an-offset", 10)
+
+
+@pytest.mark.asyncio
+async def test_change_feed_blocks_on_its_own_client(redis: aioredis.Redis):
+    broken = aioredis.from_url("redis://localhost:1/0")
+    feed = ChangeFeed(broken, STREAM)
+    feed.use_blocking_client(redis)
+    await redis.xadd(STREAM, {"owner_id": "owner"})
+    changes, next_offset = await feed.read(
+        START_OFFSET, 10, block_ms=50, owner_id="other"
+    )
+    assert changes == [] and next_offset != START_OFFSET
+    with pytest.raises(RedisError):
+        await feed.read(START_OFFSET, 10)
+    await broken.aclose()
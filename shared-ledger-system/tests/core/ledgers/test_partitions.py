@@ -0,0 +1,164 @@
+# tests/core/ledgers/test_partitions.py
+import uuid
+from datetime import date, datetime
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from core.ledgers.exceptions import DuplicateTransactionError
+from core.ledgers.models import LedgerEntry, LedgerNonce
+from core.ledgers.partitions import (
+    add_months,
+    detach_partitions,
+    ensure_partitions,
+    list_partitions,
+    month_start,
+    partition_name,
+)
+from core.ledgers.schemas import LedgerEntryCreate
+from core.ledgers.service import LedgerService
+
+
+@pytest.fixture
+def ledger_service():
+    return LedgerService({"CREDIT_ADD": 10, "CREDIT_SPEND": -1})
+
+
+def test_add_months():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_routes_new_entries(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    created = await ensure_partitions(async_session, months_ahead=2)
+    current = month_start(datetime.utcnow().date())
+    assert created == [partition_name(add_months(current, i)) for i in range(3)]
+    assert await ensure_partitions(async_session, months_ahead=2) == []
+
+    entry = await ledger_service.create_entry(
+        async_session,
+        LedgerEntryCreate(
+            operation="CREDIT_ADD", amount=0, owner_id="owner", nonce=str(uuid.uuid4())
+        ),
+    )
+    partition = await async_session.scalar(
+        text("SELECT tableoid::regclass::text FROM ledger_entries WHERE id = :id"),
+        {"id": entry.id},
+    )
+    assert partition == partition_name(current)
+
+
+@pytest.mark.asyncio
+async def test_nonce_is_unique_across_partitions(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    nonce = str(uuid.uuid4())
+    async_session.add(
+        LedgerNonce(owner_id="owner", nonce=nonce, created_on=datetime(2020, 1, 1))
+    )
+    await async_session.commit()
+
+    with pytest.raises(DuplicateTransactionError):
+        await ledger_service.create_entry(
+            async_session,
+            LedgerEntryCreate(
+                operation="CREDIT_ADD", amount=0, owner_id="owner", nonce=nonce
+            ),
+        )
+
+
+async def drop_detached_partitions(session: AsyncSession) -> None:
+    leftovers = await session.scalars(
+        text(
+            "SELECT tablename FROM pg_tables "
+            "WHERE tablename LIKE 'ledger_entries_20%' "
+            "AND tablename NOT IN (SELECT inhrelid::regclass::text FROM pg_inherits)"
+        )
+    )
+    for table in leftovers.all():
+        await session.execute(text(f"DROP TABLE {table}"))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_detach_partitions_waits_for_checkpoints(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    old_month = date(2025, 1, 1)
+    await ensure_partitions(async_session, months_ahead=0, since=old_month)
+    owner_id = f"owner_{uuid.uuid4()}"
+    async_session.add_all(
+        [
+            LedgerEntry(
+                operation="CREDIT_ADD",
+                amount=10,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+                created_on=datetime(2025, 1, 15),
+            )
+            for _ in range(3)
+        ]
+    )
+    await async_session.commit()
+
+    try:
+        # Empty old months go right away, but January still holds entries that
+        # are not folded into a checkpoint.
+        assert partition_name(old_month) not in await detach_partitions(
+            async_session, retain_months=1
+        )
+        assert old_month in await list_partitions(async_session)
+
+        await ledger_service.compact_checkpoints(async_session, max_entries=1000)
+        assert partition_name(old_month) in await detach_partitions(
+            async_session, retain_months=1
+        )
+        assert await ledger_service.compute_balance(async_session, owner_id) == 30
+    finally:
+        await drop_detached_partitions(async_session)
+
+
+@pytest.mark.asyncio
+async def test_detach_partitions_waits_for_late_commits(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    old_month = date(2025, 1, 1)
+    await ensure_partitions(async_session, months_ahead=0, since=old_month)
+    owner_id = f"owner_{uuid.uuid4()}"
+
+    def entry() -> LedgerEntry:
+        return LedgerEntry(
+            operation="CREDIT_ADD",
+            amount=10,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+            created_on=datetime(2025, 1, 15),
+        )
+
+    Session = sessionmaker(
+        async_session.bind, expire_on_commit=False, class_=AsyncSession
+    )
+    try:
+        async with Session() as late:
+            late.add(entry())
+            await late.flush()
+            async_session.add(entry())
+            await async_session.commit()
+            await ledger_service.compact_checkpoints(async_session, max_entries=1000)
+            await late.commit()
+
+        # Both entries are visible now, but compaction has not reached them.
+        assert partition_name(old_month) not in await detach_partitions(
+            async_session, retain_months=1
+        )
+
+        await ledger_service.compact_checkpoints(async_session, max_entries=1000)
+        assert partition_name(old_month) in await detach_partitions(
+            async_session, retain_months=1
+        )
+        assert await ledger_service.compute_balance(async_session, owner_id) == 20
+    finally:
+        await drop_detached_partitions(async_session)
@@ -0,0 +1,178 @@
+# tests/core/ledgers/test_resharding.py
+import uuid
+from datetime import datetime
+import pytest
+from sqlalchemy import func, select, update
+from core.db.shards import ShardRouter
+from core.ledgers.exceptions import OwnerMovedError
+from core.ledgers.models import (
+    LedgerBalance,
+    LedgerCheckpoint,
+    LedgerEntry,
+    LedgerNonce,
+)
+from core.ledgers.resharding import CARRY_OPERATION, move_owner, reshard
+from core.ledgers.schemas import LedgerEntryCreate
+from core.ledgers.service import LedgerService
+
+
+@pytest.fixture
+def ledger_service():
+    return LedgerService({"CREDIT_ADD": 10, "CREDIT_SPEND": -1})
+
+
+async def count_rows(session_factory, owner_id: str):
+    async with session_factory() as session:
+        entries = await session.scalar(
+            select(func.count())
+            .select_from(LedgerEntry)
+            .where(LedgerEntry.owner_id == owner_id)
+        )
+        nonces = await session.scalar(
+            select(func.count())
+            .select_from(LedgerNonce)
+            .where(LedgerNonce.owner_id == owner_id)
+        )
+        return entries, nonces
+
+
+async def write(ledger_service, session_factory, owner_id: str, count: int):
+    async with session_factory() as session:
+        for _ in range(count):
+            await ledger_service.create_entry(
+                session,
+                LedgerEntryCreate(
+                    operation="CREDIT_ADD",
+                    amount=0,
+                    owner_id=owner_id,
+                    nonce=f"{owner_id}:{uuid.uuid4()}",
+                ),
+            )
+
+
+@pytest.mark.asyncio
+async def test_move_owner_copies_then_deletes(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    source = shard_router.session_factories["shard_a"]
+    target = shard_router.session_factories["shard_b"]
+    await write(ledger_service, source, owner_id, 5)
+
+    assert await move_owner(owner_id, source, target, "shard_b", batch_size=2) == 5
+
+    assert await count_rows(source, owner_id) == (0, 0)
+    assert await count_rows(target, owner_id) == (5, 5)
+    async with target() as session:
+        balance = await ledger_service.get_versioned_balance(session, owner_id)
+        assert (balance.balance, balance.version) == (50, 6)
+        assert await ledger_service.compute_balance(session, owner_id) == 50
+    async with source() as session:
+        assert await ledger_service.get_balance(session, owner_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_moved_owner_is_fenced_on_source(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    source = shard_router.session_factories["shard_a"]
+    target = shard_router.session_factories["shard_b"]
+    await write(ledger_service, source, owner_id, 1)
+    await move_owner(owner_id, source, target, "shard_b")
+
+    entry = LedgerEntryCreate(
+        operation="CREDIT_ADD", amount=0, owner_id=owner_id, nonce=str(uuid.uuid4())
+    )
+    async with source() as session:
+        with pytest.raises(OwnerMovedError):
+            await ledger_service.create_entry(session, entry)
+        results = await ledger_service.create_entries(session, [entry], atomic=False)
+        assert [result.status for result in results] == ["moved"]
+    assert await count_rows(source, owner_id) == (0, 0)
+    assert await move_owner(owner_id, source, target, "shard_b") == 0
+
+
+@pytest.mark.asyncio
+async def test_interrupted_move_can_be_rerun(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    source = shard_router.session_factories["shard_a"]
+    target = shard_router.session_factories["shard_b"]
+    await write(ledger_service, source, owner_id, 3)
+    # As if a move had committed on the target and died before the source,
+    # which then took more writes.
+    await write(ledger_service, target, owner_id, 3)
+    await write(ledger_service, source, owner_id, 2)
+
+    assert await move_owner(owner_id, source, target, "shard_b") == 5
+
+    assert await count_rows(source, owner_id) == (0, 0)
+    assert await count_rows(target, owner_id) == (5, 5)
+    async with target() as session:
+        assert await ledger_service.get_balance(session, owner_id) == 50
+        assert await ledger_service.compute_balance(session, owner_id) == 50
+
+
+@pytest.mark.asyncio
+async def test_move_owner_carries_archived_checkpoint(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    source = shard_router.session_factories["shard_a"]
+    target = shard_router.session_factories["shard_b"]
+    await write(ledger_service, source, owner_id, 2)
+    async with source() as session:
+        # As if 3 older entries had been checkpointed and then archived.
+        up_to_txid = await session.scalar(
+            select(func.max(LedgerEntry.txid)).where(LedgerEntry.owner_id == owner_id)
+        )
+        session.add(
+            LedgerCheckpoint(
+                owner_id=owner_id,
+                up_to_txid=up_to_txid,
+                balance=40,
+                updated_on=datetime.utcnow(),
+            )
+        )
+        await session.execute(
+            update(LedgerBalance)
+            .where(LedgerBalance.owner_id == owner_id)
+            .values(balance=50)
+        )
+        await session.commit()
+
+    await move_owner(owner_id, source, target, "shard_b")
+
+    async with target() as session:
+        assert await ledger_service.compute_balance(session, owner_id) == 50
+        carry = await session.scalar(
+            select(LedgerEntry.amount).where(
+                LedgerEntry.owner_id == owner_id,
+                LedgerEntry.operation == CARRY_OPERATION,
+            )
+        )
+        assert carry == 30
+        assert await ledger_service.find_balance_drift(session) == []
+
+
+@pytest.mark.asyncio
+async def test_reshard_moves_owners_to_a_new_shard(
+    ledger_service: LedgerService, shard_router: ShardRouter
+):
+    factories = shard_router.session_factories
+    current = ShardRouter({shard: factories[shard] for shard in ("shard_a", "shard_b")})
+    owners = [f"owner_{i}" for i in range(30)]
+    for owner_id in owners:
+        await write(ledger_service, current.session_factory(owner_id), owner_id, 1)
+
+    assert await reshard(current, shard_router, dry_run=True)
+    moves = await reshard(current, shard_router)
+    assert set(moves) == {
+        owner_id for owner_id in owners if shard_router.shard_for(owner_id) == "shard_c"
+    }
+    for owner_id in owners:
+        async with shard_router.session(owner_id) as session:
+            assert await ledger_service.get_balance(session, owner_id) == 10
+    assert await reshard(current, shard_router) == {}
@@ -3,10 +3,24 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from core.ledgers.service import LedgerService
 from core.ledgers.schemas import LedgerEntryCreate
-from core.ledgers.exceptions import InsufficientBalanceError, DuplicateTransactionError
-from core.ledgers.models import LedgerEntry
+from core.ledgers.exceptions import (
+    InsufficientBalanceError,
+    DuplicateTransactionError,
+    InvalidCursorError,
+    OwnerMovedError,
+)
+from core.ledgers.models import (
+    LedgerEntry,
+    LedgerBalance,
+    LedgerCheckpoint,
+    LedgerCheckpointWatermark,
+    LedgerOwnerMove,
+)
 import uuid
+import asyncio
+from datetime import datetime, timedelta
 from sqlalchemy import delete
+from sqlalchemy.orm import sessionmaker
 
 
 @pytest.fixture
@@ -23,6 +37,7 @@ def ledger_service():
 @pytest.mark.asyncio
 async def test_get_balance(ledger_service: LedgerService, async_session: AsyncSession):
     await async_session.execute(delete(LedgerEntry))
+    await async_session.execute(delete(LedgerBalance))
     await async_session.commit()
     entry1 = LedgerEntryCreate(
         operation="CREDIT_ADD", owner_id="test_user", nonce=str(uuid.uuid4()), amount=10
@@ -46,6 +61,7 @@ async def test_insufficient_balance(
     ledger_service: LedgerService, async_session: AsyncSession
 ):
     await async_session.execute(delete(LedgerEntry))
+    await async_session.execute(delete(LedgerBalance))
     await async_session.commit()
     entry = LedgerEntryCreate(
         operation="CREDIT_SPEND",
@@ -89,3 +105,397 @@ async def test_invalid_operation(
     )
     with pytest.raises(ValueError):
         await ledger_service.create_entry(async_session, entry)
+
+
+@pytest.mark.asyncio
+async def test_create_entry_updates_balance_table(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    for operation in ("CREDIT_ADD", "SIGNUP_CREDIT", "CREDIT_SPEND"):
+        await ledger_service.create_entry(
+            async_session,
+            LedgerEntryCreate(
+                operation=operation,
+                amount=0,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+            ),
+        )
+
+    stored = await async_session.get(LedgerBalance, owner_id)
+    assert stored.balance == 12
+    assert await ledger_service.get_balance(async_session, owner_id) == 12
+    assert await ledger_service.compute_balance(async_session, owner_id) == 12
+    assert await ledger_service.get_balance(async_session, "unknown_owner") == 0
+
+
+@pytest.mark.asyncio
+async def test_find_and_repair_balance_drift(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    await ledger_service.create_entry(
+        async_session,
+        LedgerEntryCreate(
+            operation="CREDIT_ADD",
+            amount=10,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+        ),
+    )
+    assert await ledger_service.find_balance_drift(async_session) == []
+
+    stored = await async_session.get(LedgerBalance, owner_id)
+    stored.balance = 3
+    await async_session.commit()
+
+    drift = await ledger_service.find_balance_drift(async_session)
+    assert len(drift) == 1
+    assert drift[0].owner_id == owner_id
+    assert drift[0].stored_balance == 3
+    assert drift[0].computed_balance == 10
+
+    await ledger_service.repair_balances(async_session)
+    assert await ledger_service.find_balance_drift(async_session) == []
+    assert await ledger_service.get_balance(async_session, owner_id) == 10
+
+
+@pytest.mark.asyncio
+async def test_concurrent_spends_never_go_negative(
+    ledger_service: LedgerService, async_session: AsyncSession, async_engine
+):
+    Session = sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+    owners = [f"owner_{uuid.uuid4()}" for _ in range(2)]
+    for owner_id in owners:
+        for _ in range(5):
+            await ledger_service.create_entry(
+                async_session,
+                LedgerEntryCreate(
+                    operation="CREDIT_ADD",
+                    amount=10,
+                    owner_id=owner_id,
+                    nonce=str(uuid.uuid4()),
+                ),
+            )
+
+    async def spend(owner_id: str) -> bool:
+        async with Session() as session:
+            try:
+                await ledger_service.create_entry(
+                    session,
+                    LedgerEntryCreate(
+                        operation="CREDIT_SPEND",
+                        amount=-1,
+                        owner_id=owner_id,
+                        nonce=str(uuid.uuid4()),
+                    ),
+                )
+                return True
+            except InsufficientBalanceError:
+                return False
+
+    results = await asyncio.gather(*(spend(owners[i % 2]) for i in range(300)))
+
+    assert sum(results) == 100
+    for owner_id in owners:
+        assert await ledger_service.get_balance(async_session, owner_id) == 0
+        assert await ledger_service.compute_balance(async_session, owner_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_nonce(
+    ledger_service: LedgerService, async_session: AsyncSession, async_engine
+):
+    Session = sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+    owner_id = f"owner_{uuid.uuid4()}"
+    nonce = str(uuid.uuid4())
+
+    async def credit() -> bool:
+        async with Session() as session:
+            try:
+                await ledger_service.create_entry(
+                    session,
+                    LedgerEntryCreate(
+                        operation="CREDIT_ADD",
+                        amount=10,
+                        owner_id=owner_id,
+                        nonce=nonce,
+                    ),
+                )
+                return True
+            except DuplicateTransactionError:
+                return False
+
+    results = await asyncio.gather(*(credit() for _ in range(10)))
+
+    assert sum(results) == 1
+    assert await ledger_service.get_balance(async_session, owner_id) == 10
+
+
+@pytest.mark.asyncio
+async def test_create_entries_best_effort(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    existing_nonce = str(uuid.uuid4())
+    await ledger_service.create_entry(
+        async_session,
+        LedgerEntryCreate(
+            operation="SIGNUP_CREDIT", amount=3, owner_id=owner_id, nonce=existing_nonce
+        ),
+    )
+    repeated_nonce = str(uuid.uuid4())
+    entries = [
+        LedgerEntryCreate(
+            operation="CREDIT_SPEND", amount=-1, owner_id=owner_id, nonce=nonce
+        )
+        for nonce in (str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4()))
+    ] + [
+        LedgerEntryCreate(
+            operation="CREDIT_SPEND",
+            amount=-1,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+        ),
+        LedgerEntryCreate(
+            operation="CREDIT_ADD", amount=10, owner_id=owner_id, nonce=existing_nonce
+        ),
+        LedgerEntryCreate(
+            operation="CREDIT_ADD", amount=10, owner_id=owner_id, nonce=repeated_nonce
+        ),
+        LedgerEntryCreate(
+            operation="CREDIT_ADD", amount=10, owner_id=owner_id, nonce=repeated_nonce
+        ),
+        LedgerEntryCreate(
+            operation="INVALID_OPERATION",
+            amount=10,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+        ),
+    ]
+
+    results = await ledger_service.create_entries(async_session, entries, atomic=False)
+
+    assert [result.status for result in results] == [
+        "created",
+        "created",
+        "created",
+        "insufficient_balance",
+        "duplicate",
+        "created",
+        "duplicate",
+        "invalid_operation",
+    ]
+    assert await ledger_service.get_balance(async_session, owner_id) == 10
+    assert await ledger_service.compute_balance(async_session, owner_id) == 10
+
+
+@pytest.mark.asyncio
+async def test_create_entries_atomic_rolls_back_on_failure(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    entries = [
+        LedgerEntryCreate(
+            operation="CREDIT_ADD",
+            amount=10,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+        ),
+        LedgerEntryCreate(
+            operation="INVALID_OPERATION",
+            amount=10,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+        ),
+    ]
+
+    results = await ledger_service.create_entries(async_session, entries, atomic=True)
+
+    assert [result.status for result in results] == [
+        "not_applied",
+        "invalid_operation",
+    ]
+    assert await ledger_service.get_balance(async_session, owner_id) == 0
+    assert await ledger_service.compute_balance(async_session, owner_id) == 0
+
+    results = await ledger_service.create_entries(
+        async_session, entries[:1], atomic=True
+    )
+    assert [result.status for result in results] == ["created"]
+    assert await ledger_service.get_balance(async_session, owner_id) == 10
+
+
+@pytest.mark.asyncio
+async def test_writes_are_refused_for_moved_owners(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    staying = f"owner_{uuid.uuid4()}"
+    moved = f"owner_{uuid.uuid4()}"
+
+    def entry(owner_id: str) -> LedgerEntryCreate:
+        return LedgerEntryCreate(
+            operation="CREDIT_ADD",
+            amount=10,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+        )
+
+    # No move recorded: both write paths go through.
+    await ledger_service.create_entry(async_session, entry(staying))
+    results = await ledger_service.create_entries(
+        async_session, [entry(staying), entry(moved)], atomic=False
+    )
+    assert [result.status for result in results] == ["created", "created"]
+
+    async_session.add(LedgerOwnerMove(owner_id=moved, shard="shard_b"))
+    await async_session.commit()
+
+    with pytest.raises(OwnerMovedError):
+        await ledger_service.create_entry(async_session, entry(moved))
+    results = await ledger_service.create_entries(
+        async_session, [entry(staying), entry(moved)], atomic=False
+    )
+    assert [result.status for result in results] == ["created", "moved"]
+    assert await ledger_service.get_balance(async_session, staying) == 40
+    assert await ledger_service.get_balance(async_session, moved) == 10
+
+
+@pytest.mark.asyncio
+async def test_create_entry_with_balance_bumps_version(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    versions = []
+    for operation in ("CREDIT_ADD", "CREDIT_SPEND"):
+        _, new_balance = await ledger_service.create_entry_with_balance(
+            async_session,
+            LedgerEntryCreate(
+                operation=operation,
+                amount=0,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+            ),
+        )
+        versions.append((new_balance.balance, new_balance.version))
+
+    assert versions == [(10, 1), (9, 2)]
+    current = await ledger_service.get_versioned_balance(async_session, owner_id)
+    assert (current.balance, current.version) == (9, 2)
+
+
+@pytest.mark.asyncio
+async def test_list_entries_keyset_pagination(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+    base = datetime(2026, 1, 1)
+    # Pairs of entries share a timestamp, so pages must break ties on id.
+    async_session.add_all(
+        [
+            LedgerEntry(
+                operation="CREDIT_ADD" if i % 3 else "DAILY_REWARD",
+                amount=10 if i % 3 else 1,
+                owner_id=owner_id,
+                nonce=str(uuid.uuid4()),
+                created_on=base + timedelta(minutes=i // 2),
+            )
+            for i in range(9)
+        ]
+    )
+    await async_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        page = await ledger_service.list_entries(
+            async_session, owner_id, limit=2, cursor=cursor
+        )
+        seen.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert len(seen) == 9
+    keys = [(entry.created_on, entry.id) for entry in seen]
+    assert keys == sorted(keys, reverse=True)
+
+    rewards = await ledger_service.list_entries(
+        async_session, owner_id, limit=10, operation="DAILY_REWARD"
+    )
+    assert [entry.amount for entry in rewards.items] == [1, 1, 1]
+    assert rewards.next_cursor is None
+
+    window = await ledger_service.list_entries(
+        async_session,
+        owner_id,
+        limit=10,
+        created_from=base + timedelta(minutes=1),
+        created_to=base + timedelta(minutes=3),
+    )
+    assert len(window.items) == 4
+
+
+@pytest.mark.asyncio
+async def test_list_entries_rejects_bad_cursor(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    with pytest.raises(InvalidCursorError):
+        await ledger_service.list_entries(
+            async_session, "owner", limit=10, cursor="not-a-cursor"
+        )
+
+
+@pytest.mark.asyncio
+async def test_compute_balance_uses_checkpoint(
+    ledger_service: LedgerService, async_session: AsyncSession
+):
+    owner_id = f"owner_{uuid.uuid4()}"
+
+    def credit(amount: int) -> LedgerEntry:
+        return LedgerEntry(
+            operation="CREDIT_ADD",
+            amount=amount,
+            owner_id=owner_id,
+            nonce=str(uuid.uuid4()),
+            created_on=datetime.utcnow(),
+        )
+
+    async_session.add_all([credit(10) for _ in range(5)])
+    await async_session.commit()
+
+    assert (
+        await ledger_service.compact_checkpoints(async_session, max_entries=1000) == 5
+    )
+    checkpoint = await async_session.get(LedgerCheckpoint, owner_id)
+    assert checkpoint.balance == 50
+    watermark = await async_session.get(LedgerCheckpointWatermark, 1)
+    assert watermark.up_to_txid == checkpoint.up_to_txid
+
+    # An entry whose transaction is still open holds compaction back, however
+    # old its created_on, and so does every entry committed after it.
+    Session = sessionmaker(
+        async_session.bind, expire_on_commit=False, class_=AsyncSession
+    )
+    async with Session() as late:
+        entry = credit(1)
+        entry.created_on = datetime.utcnow() - timedelta(hours=1)
+        late.add(entry)
+        await late.flush()
+
+        async_session.add(credit(100))
+        await async_session.commit()
+        assert (
+            await ledger_service.compact_checkpoints(async_session, max_entries=1000)
+            == 0
+        )
+        assert await ledger_service.compute_balance(async_session, owner_id) == 150
+        await late.commit()
+
+    assert await ledger_service.compute_balance(async_session, owner_id) == 151
+    assert (
+        await ledger_service.compact_checkpoints(async_session, max_entries=1000) == 2
+    )
+    await async_session.refresh(checkpoint)
+    assert checkpoint.balance == 151
+    assert await ledger_service.compute_balance(async_session, owner_id) == 151
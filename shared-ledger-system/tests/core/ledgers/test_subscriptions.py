@@ -0,0 +1,99 @@
+# tests/core/ledgers/test_subscriptions.py
+import asyncio
+import pytest
+import pytest_asyncio
+from redis import asyncio as aioredis
+from core.config import core_settings
+from core.ledgers.schemas import VersionedBalance
+from core.ledgers.subscriptions import BalanceHub, BalanceSubscription
+
+CHANNEL = "test:balance:updates"
+
+
+def balance(version: int, owner_id: str = "owner") -> VersionedBalance:
+    return VersionedBalance(owner_id=owner_id, balance=version * 10, version=version)
+
+
+@pytest_asyncio.fixture
+async def redis():
+    redis = aioredis.from_url(core_settings.redis.redis_url, decode_responses=True)
+    yield redis
+    await redis.aclose()
+
+
+@pytest_asyncio.fixture
+async def hubs(redis: aioredis.Redis):
+    # Two hubs stand in for two workers sharing Redis.
+    hubs = [BalanceHub(redis, CHANNEL), BalanceHub(redis, CHANNEL)]
+    for hub in hubs:
+        await hub.start()
+    await asyncio.sleep(0.1)
+    yield hubs
+    for hub in hubs:
+        await hub.close()
+
+
+async def next_update(updates):
+    return await asyncio.wait_for(updates.__anext__(), 2)
+
+
+@pytest.mark.asyncio
+async def test_update_reaches_subscribers_on_every_hub(hubs):
+    first, second = hubs
+    subscriptions = [await first.subscribe("owner"), await second.subscribe("owner")]
+    other = await second.subscribe("other")
+    await asyncio.sleep(0.1)
+
+    async def load():
+        return balance(0)
+
+    streams = [s.updates(load, keepalive_seconds=5) for s in subscriptions]
+    for updates in streams:
+        assert await next_update(updates) == balance(0)
+
+    await first.publish(balance(1))
+    for updates in streams:
+        assert await next_update(updates) == balance(1)
+    assert other.queue.empty()
+
+    for subscription in subscriptions + [other]:
+        first.unsubscribe(subscription)
+        second.unsubscribe(subscription)
+    assert not first.full and first._count == 0 and second._count == 0
+
+
+@pytest.mark.asyncio
+async def test_updates_skip_stale_versions_and_reload_on_resync():
+    subscription = BalanceSubscription("owner", queue_size=2)
+    loads = [balance(1), balance(5)]
+
+    async def load():
+        return loads.pop(0)
+
+    updates = subscription.updates(load, keepalive_seconds=0.05)
+    assert await next_update(updates) == balance(1)
+
+    subscription.push(balance(1))
+    subscription.push(balance(3))
+    assert await next_update(updates) == balance(3)
+
+    subscription.push(None)
+    assert await next_update(updates) == balance(5)
+    assert await next_update(updates) is None
+
+
+def test_full_queue_drops_oldest_update():
+    subscription = BalanceSubscription("owner", queue_size=2)
+    for version in range(1, 4):
+        subscription.push(balance(version))
+    assert [subscription.queue.get_nowait().version for _ in range(2)] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_subscriber_limit(redis: aioredis.Redis):
+    hub = BalanceHub(redis, CHANNEL, max_subscribers=1)
+    subscription = await hub.subscribe("owner")
+    assert hub.full
+    hub.unsubscribe(subscription)
+    hub.unsubscribe(subscription)
+    assert not hub.full
@@ -0,0 +1,75 @@
+# tests/core/monitoring/test_middleware.py
+import logging
+import pytest
+from httpx import AsyncClient
+from httpx._transports.asgi import ASGITransport
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from core.logging.logger import logger
+from core.monitoring.middleware import RequestLoggingMiddleware
+from core.monitoring.prometheus import metrics
+
+
+async def item(request: Request):
+    return JSONResponse({"request_id": request.state.request_id})
+
+
+async def fail(request: Request):
+    raise RuntimeError("boom")
+
+
+def make_client(sample_rate: float = 1.0) -> AsyncClient:
+    app = Starlette(
+        routes=[Route("/items/{item_id}", item), Route("/fail", fail)],
+    )
+    app = RequestLoggingMiddleware(app, sample_rate=sample_rate)
+    return AsyncClient(
+        transport=ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://test",
+    )
+
+
+def duration_count(route: str, status: str) -> float:
+    value = metrics.registry.get_sample_value(
+        "http_request_duration_seconds_count",
+        {"method": "GET", "route": route, "status": status},
+    )
+    return value or 0
+
+
+@pytest.mark.asyncio
+async def test_times_requests_by_route_template():
+    before = duration_count("/items/{item_id}", "200")
+    async with make_client() as client:
+        for item_id in ("a", "b", "c"):
+            assert (await client.get(f"/items/{item_id}")).status_code == 200
+        assert (await client.get("/missing")).status_code == 404
+    assert duration_count("/items/{item_id}", "200") == before + 3
+    assert duration_count("unmatched", "404") >= 1
+
+
+@pytest.mark.asyncio
+async def test_request_id_passed_through_or_generated():
+    async with make_client() as client:
+        response = await client.get("/items/a", headers={"X-Request-ID": "abc-123"})
+        assert response.headers["X-Request-ID"] == "abc-123"
+        assert response.json()["request_id"] == "abc-123"
+
+        response = await client.get("/items/a", headers={"X-Request-ID": "bad id\n"})
+        assert response.headers["X-Request-ID"] != "bad id\n"
+        assert response.json()["request_id"] == response.headers["X-Request-ID"]
+
+
+@pytest.mark.asyncio
+async def test_samples_logs_but_always_logs_errors(caplog):
+    caplog.set_level(logging.INFO, logger=logger.logger.name)
+    before = duration_count("/fail", "500")
+    async with make_client(sample_rate=0) as client:
+        await client.get("/items/a")
+        assert (await client.get("/fail")).status_code == 500
+    messages = [r.getMessage() for r in caplog.records if r.name == logger.logger.name]
+    assert not any("/items/a" in message for message in messages)
+    assert any("/fail" in message and " 500 " in message for message in messages)
+    assert duration_count("/fail", "500") == before + 1